@@ -0,0 +1,200 @@
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from src.game_session import GameSession, choose_opponent_moves, create_opponent
+from src.hint import HintProvider
+from src.move_cache import MoveCache
+from src.speculation import Speculator
+
+SESSION_TIMEOUT = 60 * 60
+
+
+class AsyncGameServer:
+    # Serves the same /new-game, /move-piece, /start-game and /hint API as app.py, but
+    # keeps one GameSession per player in memory and only uses a worker process
+    # while the computer is choosing its moves. Work done ahead of time (the
+    # speculator's searches, hints for a new turn) should be given an executor of
+    # its own, so the computer's real moves never wait behind it
+    def __init__(self, executor, speculator: Speculator = None, move_cache: MoveCache = None,
+                 background_executor=None):
+        self.executor = executor
+        self.speculator = speculator
+        self.move_cache = move_cache
+        self.hints = HintProvider(executor=background_executor if background_executor is not None else executor)
+        self.sessions = {}
+        self.__locks = {}
+        self.__last_used = {}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if 'content-length' in headers:
+                    await reader.readexactly(int(headers['content-length']))
+
+                status, body, session_id = await self.route(method, target, headers)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                writer.write(self.__format_response(status, body, session_id, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, target, headers):
+        url = urlsplit(target)
+        args = {name: values[0] for name, values in parse_qs(url.query).items()}
+        session_id = args.get('session') or self.__session_from_cookie(headers.get('cookie', ''))
+
+        if method == 'OPTIONS':
+            return HTTPStatus.NO_CONTENT, None, None
+        if url.path == '/new-game':
+            try:
+                opponent_strategy = create_opponent(args.get('difficulty', 'hard'), self.move_cache)
+            except Exception as e:
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}, None
+            session_id = session_id if session_id else uuid.uuid4().hex
+            session = GameSession(opponent_strategy, speculator=self.speculator, hints=self.hints)
+            self.sessions[session_id] = session
+            self.__locks[session_id] = asyncio.Lock()
+            async with self.__locks[session_id]:
+                state = await self.respond(session, session.start(), args)
+        elif url.path == '/hint':
+            if session_id not in self.sessions:
+                return HTTPStatus.OK, {'plays': [], 'complete': True, 'dice_roll': []}, None
+            async with self.__locks[session_id]:
+                # A hint not ranked yet is waited for off the event loop
+                state = await asyncio.get_running_loop().run_in_executor(
+                    None, self.sessions[session_id].get_hint, self.__int_arg(args, 'count', 3))
+        elif url.path in ('/start-game', '/move-piece'):
+            if session_id not in self.sessions:
+                return HTTPStatus.OK, GameSession.get_empty_state(), None
+            session = self.sessions[session_id]
+            async with self.__locks[session_id]:
+                if url.path == '/start-game':
+                    state = session.get_state({}, *self.__delta_args(args))
+                elif args.get('end-turn', '') == 'true':
+                    state = await self.respond(session, session.end_turn(), args)
+                else:
+                    state = await self.respond(session, session.move_piece(
+                        self.__int_arg(args, 'location'), self.__int_arg(args, 'die-roll')), args)
+        else:
+            return HTTPStatus.NOT_FOUND, {'error': 'not found'}, None
+
+        self.__last_used[session_id] = time.monotonic()
+        state['session'] = session_id
+        return HTTPStatus.OK, state, session_id
+
+    async def respond(self, session, response, args={}):
+        if response is None:
+            request = session.get_opponent_request()
+            speculated_reply = session.take_speculated_reply()
+            if speculated_reply is not None:
+                moves = await asyncio.wrap_future(speculated_reply)
+            else:
+                loop = asyncio.get_running_loop()
+                moves = await loop.run_in_executor(self.executor, choose_opponent_moves, *request)
+            response = session.apply_opponent_moves(moves)
+        return session.get_state(response, *self.__delta_args(args))
+
+    async def expire_sessions(self):
+        while True:
+            await asyncio.sleep(60)
+            now = time.monotonic()
+            for session_id, last_used in list(self.__last_used.items()):
+                if now - last_used > SESSION_TIMEOUT and not self.__locks[session_id].locked():
+                    del self.sessions[session_id]
+                    del self.__locks[session_id]
+                    del self.__last_used[session_id]
+
+    @staticmethod
+    def __delta_args(args):
+        # protocol=delta&version=<the last version the client has> asks for only the points that changed
+        version = args.get('version')
+        return args.get('protocol') == 'delta', int(version) if version and version.lstrip('-').isdigit() else None
+
+    @staticmethod
+    def __int_arg(args, name, default=1):
+        try:
+            return int(args.get(name, default))
+        except ValueError:
+            return default
+
+    @staticmethod
+    def __session_from_cookie(cookie):
+        for part in cookie.split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == 'session':
+                return value
+        return None
+
+    @staticmethod
+    def __format_response(status, body, session_id, keep_alive):
+        payload = b'' if body is None else json.dumps(body).encode('utf-8')
+        lines = [
+            'HTTP/1.1 %d %s' % (status.value, status.phrase),
+            'Content-Type: application/json',
+            'Content-Length: %d' % len(payload),
+            'Access-Control-Allow-Origin: *',
+            'Access-Control-Allow-Headers: Content-Type',
+            'Connection: %s' % ('keep-alive' if keep_alive else 'close'),
+        ]
+        if session_id:
+            lines.append('Set-Cookie: session=%s; Path=/' % session_id)
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload
+
+
+async def serve(host, port, workers, speculate, move_cache_path=None, background_workers=2):
+    # Workers are started lazily, once clients are connected; forked from this
+    # process they would inherit the clients' sockets and keep them open after
+    # the server has closed them, so they are started from a clean process
+    context = mp.get_context('forkserver')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor, \
+            ProcessPoolExecutor(max_workers=background_workers, mp_context=context) as background_executor:
+        game_server = AsyncGameServer(executor, Speculator(background_executor) if speculate else None,
+                                      MoveCache(move_cache_path) if move_cache_path else None, background_executor)
+        server = await asyncio.start_server(game_server.handle_connection, host, port)
+        expiry = asyncio.create_task(game_server.expire_sessions())
+        print('[API]: Serving on http://%s:%d with %d AI workers' % (host, port, workers))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Asyncio backgammon game server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=mp.cpu_count())
+    parser.add_argument('--background-workers', type=int, default=2,
+                        help="processes for the speculative searches and hints, apart from the computer's moves")
+    parser.add_argument('--no-speculation', action='store_true',
+                        help="do not search the computer's replies while the human is moving")
+    parser.add_argument('--move-cache', help="file in which the computer's moves are cached, shared by all workers")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, not args.no_speculation, args.move_cache,
+                          args.background_workers))
+    except KeyboardInterrupt:
+        print('[API]: Stopped')
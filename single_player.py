@@ -9,13 +9,13 @@ if __name__ == '__main__':
     name = input('What is your name?\n')
 
     print("Available Strategies:")
-    strategies = [x for x in StrategyFactory.get_all() if x.__name__ != HumanStrategy.__name__]
+    strategies = [x for x in StrategyFactory.get_all() if x.name != HumanStrategy.__name__]
     for i, strategy in enumerate(strategies):
-        print("[%d] %s (%s)" % (i, strategy.__name__, strategy.get_difficulty()))
+        print("[%d] %s (%s)" % (i, strategy.name, strategy.difficulty))
 
     strategy_index = int(input('Pick a strategy: (pick 1 for sake of ali editing)\n'))
 
-    chosen_strategy = StrategyFactory.create_by_name(strategies[strategy_index].__name__)
+    chosen_strategy = strategies[strategy_index].create()
 
     game = Game(
         white_strategy=HumanStrategy(name),
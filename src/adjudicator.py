@@ -0,0 +1,111 @@
+import itertools
+import math
+
+from src.position import Position
+from src.race_evaluator import RaceEvaluator, bear_off_plays, AVERAGE_PIPS_PER_ROLL
+
+ROLLS = [((first, second), 1 if first == second else 2)
+         for first, second in itertools.combinations_with_replacement(range(1, 7), 2)]
+# Variance of the pips moved by one roll; over a long race the number of rolls
+# needed to move p pips has variance p * PIPS_VARIANCE / AVERAGE_PIPS_PER_ROLL ** 3
+PIPS_VARIANCE = sum(weight * (4 * first if first == second else first + second) ** 2
+                    for (first, second), weight in ROLLS) / 36 - AVERAGE_PIPS_PER_ROLL ** 2
+# Tolerance for treating a probability summed from the exact tables as certain
+CERTAIN = 1e-9
+
+
+class Adjudicator:
+    # Ends a game once there is no contact and the side to move is (nearly)
+    # sure to win or to lose the race. Rolls needed to bear off are exact for
+    # home boards in the bear-off table (the same play as the table chooses)
+    # and a normal approximation around the effective pip count for the rest.
+    # With a threshold of 1 the approximation is not used: the game only ends
+    # when both home boards are in the table, or when the side to move cannot
+    # need more rolls than its opponent needs at the least. Only single games are adjudicated, so once the loser has borne a checker
+    # off. With verify the game is still played out, to measure what
+    # adjudicating would have saved and how often it would have been wrong
+    __distributions = {}
+
+    def __init__(self, threshold: float = 1.0, verify: bool = False, race_evaluator: RaceEvaluator = None):
+        self.threshold = threshold
+        self.verify = verify
+        self.race_evaluator = race_evaluator if race_evaluator is not None else RaceEvaluator()
+
+    def adjudicate(self, board, colour):
+        # The winner, with colour to roll, or None if the game has to go on
+        if not board.is_race():
+            return None
+        position = Position.from_board(board, colour)
+        if self.threshold >= 1:
+            probability = self.certain_win_probability(position)
+            if probability is None:
+                return None
+        else:
+            probability = self.win_probability(position)
+        if probability >= self.threshold - CERTAIN:
+            winner = colour
+        elif probability <= 1 - self.threshold + CERTAIN:
+            winner = colour.other()
+        else:
+            return None
+        if sum(board.get_counts(winner.other())) == 15:
+            return None
+        return winner
+
+    def win_probability(self, position):
+        # The side to move wins if it needs no more rolls than its opponent
+        rolls = self.rolls_distribution(position)
+        opponent_rolls = self.rolls_distribution(position.flip())
+        opponent_at_least = [sum(opponent_rolls[count:]) for count in range(len(rolls))]
+        return min(1.0, sum(probability * opponent_at_least[count] for count, probability in enumerate(rolls)))
+
+    def certain_win_probability(self, position):
+        # The win probability when it is known without approximating, otherwise None
+        if self.__is_exact(position) and self.__is_exact(position.flip()):
+            return self.win_probability(position)
+        # Every die moves a checker at least one pip in a race (or bears one
+        # off), and no roll moves more than 24 pips
+        opponent_pips = position.opponent_pip_count()
+        if math.ceil(position.pip_count() / 2) <= math.ceil(opponent_pips / 24):
+            return 1.0
+        if math.ceil(opponent_pips / 2) < math.ceil(position.pip_count() / 24):
+            return 0.0
+        return None
+
+    def rolls_distribution(self, position):
+        # Probability of the side to move needing exactly n rolls to bear off, by n
+        if self.__is_exact(position):
+            return self.__bear_off_distribution(self.__home(position))
+        mean = self.race_evaluator.effective_pip_count(position) / AVERAGE_PIPS_PER_ROLL
+        deviation = math.sqrt(mean * PIPS_VARIANCE / AVERAGE_PIPS_PER_ROLL ** 2)
+        below = [0.5 * (1 + math.erf((count + 0.5 - mean) / (deviation * math.sqrt(2))))
+                 for count in range(int(mean + 6 * deviation) + 2)]
+        return [below[0]] + [below[count] - below[count - 1] for count in range(1, len(below))]
+
+    def __is_exact(self, position):
+        return self.__home(position) in self.race_evaluator.bear_off and not any(
+            count > 0 for count in position.points[7:])
+
+    @staticmethod
+    def __home(position):
+        return tuple(count if count > 0 else 0 for count in position.points[1:7])
+
+    def __bear_off_distribution(self, home):
+        distributions = Adjudicator.__distributions
+        if home not in distributions:
+            if not any(home):
+                distributions[home] = [1.0]
+            else:
+                table = self.race_evaluator.bear_off
+                distribution = [0.0]
+                for (first, second), weight in ROLLS:
+                    if first == second:
+                        plays = bear_off_plays(home, [first] * 4)
+                    else:
+                        plays = bear_off_plays(home, [first, second]) | bear_off_plays(home, [second, first])
+                    after = self.__bear_off_distribution(min(plays, key=lambda play: table[play]))
+                    distribution.extend([0.0] * (len(after) + 1 - len(distribution)))
+                    for count, probability in enumerate(after):
+                        distribution[count + 1] += weight * probability / 36
+                distributions[home] = distribution
+        return distributions[home]
@@ -0,0 +1,96 @@
+import unittest
+
+from src.adjudicator import Adjudicator
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.experiment import Experiment
+from src.position import Position
+
+
+class TestAdjudicator(unittest.TestCase):
+
+    def setUp(self):
+        self.adjudicator = Adjudicator()
+        self.board = Board()
+
+    def test_bear_off_probabilities_are_exact(self):
+        self.board.add_many_pieces(2, Colour.WHITE, 19)
+        self.board.add_many_pieces(1, Colour.BLACK, 1)
+
+        # Both checkers come off the 6 point with 3-3, 4-4, 5-5 or 6-6
+        self.assertAlmostEqual(self.adjudicator.win_probability(Position.from_board(self.board, Colour.WHITE)), 4 / 36)
+        self.assertAlmostEqual(self.adjudicator.win_probability(Position.from_board(self.board, Colour.BLACK)), 1)
+
+    def test_certain_race_is_adjudicated(self):
+        self.board.add_many_pieces(2, Colour.WHITE, 24)
+        self.board.add_many_pieces(5, Colour.BLACK, 6)
+
+        self.assertEqual(self.adjudicator.adjudicate(self.board, Colour.WHITE), Colour.WHITE)
+        # Black cannot bear five checkers off in one roll either
+        self.assertEqual(self.adjudicator.adjudicate(self.board, Colour.BLACK), Colour.WHITE)
+
+    def test_no_adjudication_while_a_gammon_is_possible(self):
+        self.board.add_many_pieces(2, Colour.WHITE, 24)
+        self.board.add_many_pieces(15, Colour.BLACK, 6)
+
+        self.assertIsNone(self.adjudicator.adjudicate(self.board, Colour.WHITE))
+
+    def test_no_adjudication_with_contact(self):
+        self.board.add_many_pieces(2, Colour.WHITE, 24)
+        self.board.add_many_pieces(1, Colour.WHITE, 3)
+        self.board.add_many_pieces(5, Colour.BLACK, 6)
+
+        self.assertIsNone(self.adjudicator.adjudicate(self.board, Colour.WHITE))
+
+    def test_long_races_are_estimated(self):
+        self.board.add_many_pieces(15, Colour.WHITE, 14)
+        self.board.add_many_pieces(15, Colour.BLACK, 11)
+        position = Position.from_board(self.board, Colour.WHITE)
+
+        self.assertGreater(self.adjudicator.win_probability(position), 0.5)
+        self.assertLess(self.adjudicator.win_probability(position), 0.7)
+        self.assertIsNone(Adjudicator(0.99).adjudicate(self.board, Colour.WHITE))
+
+    def test_only_exact_results_are_certain(self):
+        self.board.add_many_pieces(2, Colour.WHITE, 18)
+        self.board.add_many_pieces(14, Colour.BLACK, 10)
+        position = Position.from_board(self.board, Colour.WHITE)
+
+        # Black can bear off with six rolls of 6-6, and White's 14 pips are only
+        # sure to be gone in seven rolls
+        self.assertGreater(self.adjudicator.win_probability(position), 1 - 1e-9)
+        self.assertIsNone(self.adjudicator.adjudicate(self.board, Colour.WHITE))
+        self.assertEqual(Adjudicator(0.99).adjudicate(self.board, Colour.WHITE), Colour.WHITE)
+
+        # With 168 pips Black needs seven rolls at the least
+        board = Board()
+        board.add_many_pieces(2, Colour.WHITE, 18)
+        board.add_many_pieces(14, Colour.BLACK, 12)
+        self.assertEqual(self.adjudicator.adjudicate(board, Colour.WHITE), Colour.WHITE)
+        # Unless Black rolls first
+        self.assertIsNone(self.adjudicator.adjudicate(board, Colour.BLACK))
+
+    def test_certain_results_never_flip(self):
+        experiment = Experiment(10, CompareAllMovesSimple(), CompareAllMovesSimple(), parallelise=False, seed=1,
+                                adjudicator=Adjudicator(verify=True))
+        experiment.run()
+        counters = experiment.get_statistics().counters
+
+        self.assertGreater(counters['adjudicated_games'], 0)
+        self.assertEqual(counters['adjudication_flips'], 0)
+
+    def test_adjudicated_games_end_early(self):
+        played_out = Experiment(10, CompareAllMovesSimple(), CompareAllMovesSimple(), parallelise=False, seed=1)
+        adjudicated = Experiment(10, CompareAllMovesSimple(), CompareAllMovesSimple(), parallelise=False, seed=1,
+                                 adjudicator=Adjudicator())
+        played_out.run()
+        adjudicated.run()
+
+        self.assertEqual(adjudicated.get_white_wins(), played_out.get_white_wins())
+        self.assertLess(adjudicated.get_statistics().metrics['turns'].mean,
+                        played_out.get_statistics().metrics['turns'].mean)
+
+
+if __name__ == '__main__':
+    unittest.main()
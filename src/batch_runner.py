@@ -0,0 +1,125 @@
+import random
+import time
+
+from src.board import Board
+from src.colour import Colour
+from src.game import roll_dice
+from src.game_statistics import GameStatistics
+from src.move_not_possible_exception import MoveNotPossibleException
+from src.position import OPPONENTS_BAR, Position
+from src.strategies import Strategy
+
+
+class BatchGame:
+    # A game played on a Position, always seen by the side to move
+    def __init__(self, game_index, seed):
+        # Each game rolls its own dice, so how the games are batched does not
+        # change them
+        self.rng = random.Random("%s:batch:%d" % (seed, game_index))
+        self.first_player = Colour(self.rng.randint(0, 1))
+        self.colour = self.first_player
+        self.position = Position.from_board(Board.create_starting_board(), self.colour)
+        self.dice_roll = None
+        self.turns = 0
+        self.hits = {Colour.WHITE: 0, Colour.BLACK: 0}
+        self.doubles = {Colour.WHITE: 0, Colour.BLACK: 0}
+        self.time_taken = {Colour.WHITE: 0.0, Colour.BLACK: 0.0}
+
+    def roll(self):
+        self.dice_roll = roll_dice(no_doubles=self.turns == 0, rng=self.rng)
+        self.turns += 1
+        if len(self.dice_roll) == 4:
+            self.doubles[self.colour] += 1
+
+    def play(self, play):
+        position = self.position
+        dice_left = list(self.dice_roll)
+        for point, die_roll in play:
+            if die_roll not in dice_left or point not in position.movable_points(die_roll):
+                raise MoveNotPossibleException("You cannot move that piece %d" % die_roll)
+            dice_left.remove(die_roll)
+            new_position = position.apply_move(point, die_roll)
+            if new_position.points[OPPONENTS_BAR] < position.points[OPPONENTS_BAR]:
+                self.hits[self.colour] += 1
+            position = new_position
+        self.position = position
+
+    def has_ended(self):
+        return self.position.has_game_ended()
+
+    def next_turn(self):
+        self.position = self.position.flip()
+        self.colour = self.colour.other()
+
+    def get_statistics(self):
+        # Called once the side that just played has borne off, before next_turn
+        points = self.position.points
+        if sum(points) > -15:
+            win_type = 1
+        else:
+            win_type = 3 if any(count < 0 for count in points[:7]) else 2
+        return {
+            'who_started': self.first_player,
+            'who_won': self.colour,
+            'win_type': win_type,
+            'turns': self.turns,
+            'loser_pip_count': self.position.opponent_pip_count(),
+            'white_hits': self.hits[Colour.WHITE],
+            'black_hits': self.hits[Colour.BLACK],
+            'white_doubles': self.doubles[Colour.WHITE],
+            'black_doubles': self.doubles[Colour.BLACK],
+            'white_time': self.time_taken[Colour.WHITE],
+            'black_time': self.time_taken[Colour.BLACK],
+        }
+
+
+class BatchGamePlayer:
+    # Plays games batch_size at a time in one process. Each round every
+    # unfinished game rolls and then each strategy chooses the plays for all the
+    # games it is to move in with a single choose_plays call, so an evaluator
+    # that scores many positions at once sees them all together. The time of a
+    # call is shared equally between its games. The dice are seeded by game
+    # index like GamePlayer's, but from their own generator, so the games are not
+    # the ones GamePlayer plays for the same seed
+    def __init__(self, white_strategy: Strategy, black_strategy: Strategy, seed=0, batch_size: int = 64):
+        self.__strategies = {Colour.WHITE: white_strategy, Colour.BLACK: black_strategy}
+        self.__seed = seed
+        self.__batch_size = batch_size
+
+    def play_games(self, game_indexes):
+        statistics = GameStatistics()
+        statistics.add_games(dict(self.play_games_individually(game_indexes)))
+        return statistics
+
+    def play_games_individually(self, game_indexes):
+        game_indexes = list(game_indexes)
+        results = []
+        for start in range(0, len(game_indexes), self.__batch_size):
+            results.extend(self.play_batch(game_indexes[start:start + self.__batch_size]).items())
+        return results
+
+    def play_batch(self, game_indexes):
+        games = {game_index: BatchGame(game_index, self.__seed) for game_index in game_indexes}
+        results = {}
+        while games:
+            for game in games.values():
+                game.roll()
+            for colour, strategy in self.__strategies.items():
+                to_move = [game for game in games.values() if game.colour == colour]
+                if not to_move:
+                    continue
+                start_time = time.perf_counter()
+                plays = strategy.choose_plays([game.position for game in to_move],
+                                              [game.dice_roll for game in to_move])
+                time_taken = (time.perf_counter() - start_time) / len(to_move)
+                for game, play in zip(to_move, plays):
+                    game.time_taken[colour] += time_taken
+                    game.play(play)
+            for game_index, game in list(games.items()):
+                if game.has_ended():
+                    results[game_index] = game.get_statistics()
+                    del games[game_index]
+                else:
+                    game.next_turn()
+        print(".", end="", flush=True)
+        return results
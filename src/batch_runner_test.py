@@ -0,0 +1,45 @@
+import unittest
+
+from src.batch_runner import BatchGamePlayer
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.experiment import Experiment
+from src.position import Position
+from src.strategies import MoveFurthestBackStrategy, MoveRandomPiece
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def test_choosing_plays_leaves_the_positions_alone(self):
+        position = Position.from_board(Board.create_starting_board(), Colour.WHITE)
+
+        plays = MoveFurthestBackStrategy().choose_plays([position, position], [[6, 5], [2, 2, 2, 2]])
+
+        self.assertEqual(len(plays[0]), 2)
+        self.assertEqual(len(plays[1]), 4)
+        self.assertEqual(position, Position.from_board(Board.create_starting_board(), Colour.WHITE))
+
+    def test_games_do_not_depend_on_the_batch_size(self):
+        one_at_a_time = BatchGamePlayer(CompareAllMovesSimple(), MoveFurthestBackStrategy(), 'test', batch_size=1)
+        batched = BatchGamePlayer(CompareAllMovesSimple(), MoveFurthestBackStrategy(), 'test', batch_size=8)
+
+        expected = dict(one_at_a_time.play_games_individually(range(8)))
+        actual = dict(batched.play_games_individually(range(8)))
+
+        self.assertEqual([actual[index]['turns'] for index in range(8)],
+                         [expected[index]['turns'] for index in range(8)])
+        self.assertEqual([actual[index]['who_won'] for index in range(8)],
+                         [expected[index]['who_won'] for index in range(8)])
+
+    def test_batched_experiment(self):
+        experiment = Experiment(20, CompareAllMovesSimple(), MoveRandomPiece(), parallelise=False, batch_size=10)
+        experiment.run()
+        counters = experiment.get_statistics().counters
+
+        self.assertEqual(counters['games'], 20)
+        self.assertGreater(counters['white_wins'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import argparse
+import random
+import time
+
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.game import Game
+from src.game_observer import GameObserver
+from src.position import Position
+
+
+class DecisionSampler(GameObserver):
+    # Records the position and dice of every decision of a game, seen by the side to move
+    def __init__(self):
+        self.decisions = []
+
+    def on_dice_rolled(self, game, colour, dice_roll):
+        self.decisions.append((Position.from_board(game.board, colour), dice_roll.copy()))
+
+
+def sample_decisions(strategy_class, games, seed):
+    random.seed(seed)
+    sampler = DecisionSampler()
+    for game_index in range(games):
+        game = Game(strategy_class(), strategy_class(), Colour(game_index % 2))
+        game.add_observer(sampler)
+        game.run_game(verbose=False)
+    return sampler.decisions
+
+
+def play_decision(strategy, position, dice_roll):
+    board = position.to_board(Colour.WHITE)
+    start_time = time.perf_counter()
+    strategy.move(board, Colour.WHITE, dice_roll.copy(), board.get_move_lambda(), {})
+    return Position.from_board(board, Colour.WHITE), time.perf_counter() - start_time
+
+
+def compare(strategy_class, decisions, beam_widths):
+    exhaustive = strategy_class()
+    best_plays = [play_decision(exhaustive, position, dice_roll) for position, dice_roll in decisions]
+    results = {None: summarise(exhaustive, decisions, best_plays, best_plays)}
+    for beam_width in beam_widths:
+        plays = [play_decision(strategy_class(beam_width), position, dice_roll) for position, dice_roll in decisions]
+        results[beam_width] = summarise(exhaustive, decisions, best_plays, plays)
+    return results
+
+
+def summarise(exhaustive, decisions, best_plays, plays):
+    same = 0
+    value_lost = 0
+    times = []
+    doubles_times = []
+    for (position, dice_roll), (best_position, _), (played_position, time_taken) in zip(decisions, best_plays, plays):
+        same += played_position == best_position
+        value_lost += exhaustive.evaluate_position(played_position) - exhaustive.evaluate_position(best_position)
+        times.append(time_taken)
+        if len(dice_roll) == 4:
+            doubles_times.append(time_taken)
+    return {
+        'found_best': same / len(decisions),
+        'mean_value_lost': value_lost / len(decisions),
+        'mean_time': sum(times) / len(times),
+        'worst_time': max(times),
+        'worst_doubles_time': max(doubles_times, default=0),
+    }
+
+
+def print_results(results):
+    print("%-12s %10s %12s %12s %12s %14s" %
+          ('beam width', 'found best', 'value lost', 'mean ms', 'worst ms', 'worst dbl ms'))
+    for beam_width, result in results.items():
+        print("%-12s %9.1f%% %12.3f %12.3f %12.3f %14.3f" % (
+            'exhaustive' if beam_width is None else beam_width,
+            100 * result['found_best'],
+            result['mean_value_lost'],
+            1000 * result['mean_time'],
+            1000 * result['worst_time'],
+            1000 * result['worst_doubles_time']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare beam search against the exhaustive move search')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('beam_widths', type=int, nargs='*', default=[1, 2, 3, 5, 8])
+    args = parser.parse_args()
+
+    strategy_class = CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+    decisions = sample_decisions(strategy_class, args.games, args.seed)
+    print("%d decisions from %d games" % (len(decisions), args.games))
+    print_results(compare(strategy_class, decisions, args.beam_widths))
@@ -5,10 +5,16 @@ import json
 from src.colour import Colour
 from src.piece import Piece
 
+WHITE_OUTSIDE_HOME = (1 << 19) - 1
+BLACK_OUTSIDE_HOME = ~((1 << 7) - 1)
+
 
 class Board:
     def __init__(self):
         self.__pieces = []
+        self.__counts = [[0] * 26, [0] * 26]
+        self.__occupied = [0, 0]
+        self.__blocked = [0, 0]
 
     @classmethod
     def create_starting_board(cls):
@@ -23,36 +29,53 @@ class Board:
         board.add_many_pieces(2, Colour.BLACK, 24)
         return board
 
+    @classmethod
+    def from_json(cls, text):
+        board = Board()
+        for location, point in json.loads(text).items():
+            board.add_many_pieces(point['count'], Colour.load(point['colour']), int(location))
+        return board
+
     def add_many_pieces(self, number_of_pieces, colour, location):
         for _ in range(number_of_pieces):
             self.__pieces.append(Piece(colour, location))
+            self.__update_count(colour, location, 1)
 
     def is_move_possible(self, piece, die_roll):
-        if len(self.pieces_at(self.__taken_location(piece.colour))) > 0:
-            if piece.location != self.__taken_location(piece.colour):
-                return False
-        if piece.colour == Colour.BLACK:
-            die_roll = -die_roll
-        new_location = piece.location + die_roll
-        if new_location <= 0 or new_location >= 25:
-            if not self.can_move_off(piece.colour):
-                return False
-            if new_location != 0 and new_location != 25:
-                return not any(x.spaces_to_home() >= abs(die_roll) for x in self.get_pieces(piece.colour))
-            return True
-        pieces_at_new_location = self.pieces_at(new_location)
-        if len(pieces_at_new_location) == 0 or len(pieces_at_new_location) == 1:
-            return True
-        return self.pieces_at(new_location)[0].colour == piece.colour
+        return self.get_movable_mask(piece.colour, die_roll) >> piece.location & 1 == 1
+
+    def get_movable_mask(self, colour, die_roll):
+        # Bit n is set when the piece at location n can be moved by die_roll
+        own = self.__occupied[colour.value]
+        blocked = self.__blocked[colour.other().value]
+        bar = 1 << self.__taken_location(colour)
+        sources = bar if own & bar else own
+        if colour == Colour.WHITE:
+            movable = sources & ((1 << (25 - die_roll)) - 1) & ~(blocked >> die_roll)
+            if own & WHITE_OUTSIDE_HOME == 0:
+                movable |= own & (1 << (25 - die_roll))
+                if own & ((1 << (26 - die_roll)) - 1) == 0:
+                    movable |= own
+        else:
+            movable = sources & ~((1 << (die_roll + 1)) - 1) & ~(blocked << die_roll)
+            if own & BLACK_OUTSIDE_HOME == 0:
+                movable |= own & (1 << die_roll)
+                if own >> die_roll == 0:
+                    movable |= own
+        return movable
+
+    def get_occupied_mask(self, colour):
+        return self.__occupied[colour.value]
+
+    def get_blocked_mask(self, colour):
+        return self.__blocked[colour.value]
 
     def no_moves_possible(self, colour, dice_roll):
-        piece_locations = list(set(x.location for x in self.get_pieces(colour)))
-        dice_roll = list(set(dice_roll))
-        pieces = [self.get_piece_at(loc) for loc in piece_locations]
-        return not any(self.is_move_possible(piece, die) for die in dice_roll for piece in pieces)
+        return not any(self.get_movable_mask(colour, die) for die in set(dice_roll))
 
     def can_move_off(self, colour):
-        return all(x.spaces_to_home() <= 6 for x in self.get_pieces(colour))
+        outside_home = WHITE_OUTSIDE_HOME if colour == Colour.WHITE else BLACK_OUTSIDE_HOME
+        return self.__occupied[colour.value] & outside_home == 0
 
     def move_piece(self, piece, die_roll):
         if piece not in self.__pieces:
@@ -66,10 +89,10 @@ class Board:
         if new_location <= 0 or new_location >= 25:
             self.__remove_piece(piece)
         else:
-            pieces_at_new_location = self.pieces_at(new_location)
-            if len(pieces_at_new_location) == 1 and pieces_at_new_location[0].colour != piece.colour:
-                pieces_at_new_location[0].location = self.__taken_location(pieces_at_new_location[0].colour)
-            piece.location = new_location
+            if self.__counts[piece.colour.other().value][new_location] == 1:
+                taken_piece = self.get_piece_at(new_location)
+                self.__move_to(taken_piece, self.__taken_location(taken_piece.colour))
+            self.__move_to(piece, new_location)
 
         return new_location
 
@@ -81,19 +104,15 @@ class Board:
         return piece.location + die_roll
 
     def can_land_on(self, colour, location):
-        pieces = self.pieces_at(location)
-        if len(pieces) == 0:
-            return True
-        if len(pieces) == 1 and pieces[0].colour != colour:
-            return True
-        return pieces[0].colour == colour
+        return self.__counts[colour.other().value][location] < 2
 
     def pieces_at(self, location):
         return [x for x in self.__pieces if x.location == location]
 
     def get_piece_at(self, location):
-        pieces = self.pieces_at(location)
-        return pieces[0] if pieces else None
+        if not (self.__occupied[0] | self.__occupied[1]) >> location & 1:
+            return None
+        return next(x for x in self.__pieces if x.location == location)
 
     def get_pieces(self, colour):
         pieces = [x for x in self.__pieces if x.colour == colour]
@@ -104,12 +123,39 @@ class Board:
         return self.pieces_at(self.__taken_location(colour))
 
     def has_game_ended(self):
-        return len(self.get_pieces(Colour.WHITE)) == 0 or len(self.get_pieces(Colour.BLACK)) == 0
+        return self.__occupied[Colour.WHITE.value] == 0 or self.__occupied[Colour.BLACK.value] == 0
+
+    def is_race(self):
+        # No contact is left once every white piece is past every black piece
+        white = self.__occupied[Colour.WHITE.value]
+        black = self.__occupied[Colour.BLACK.value]
+        return white != 0 and black != 0 and (white & -white).bit_length() > black.bit_length()
 
     def who_won(self):
         if not self.has_game_ended():
             raise Exception('The game has not finished yet!')
-        return Colour.WHITE if len(self.get_pieces(Colour.WHITE)) == 0 else Colour.BLACK
+        return Colour.WHITE if self.__occupied[Colour.WHITE.value] == 0 else Colour.BLACK
+
+    def get_win_type(self):
+        # 1 for a single game, 2 for a gammon, 3 for a backgammon
+        loser = self.who_won().other()
+        counts = self.__counts[loser.value]
+        if sum(counts) < 15:
+            return 1
+        winners_home = counts[19:] if loser == Colour.BLACK else counts[:7]
+        return 3 if any(winners_home) else 2
+
+    def pip_count(self, colour):
+        counts = self.__counts[colour.value]
+        if colour == Colour.WHITE:
+            return sum((25 - location) * count for location, count in enumerate(counts))
+        return sum(location * count for location, count in enumerate(counts))
+
+    def get_counts(self, colour):
+        return tuple(self.__counts[colour.value])
+
+    def position_key(self):
+        return tuple(self.__counts[0]), tuple(self.__counts[1])
 
     def create_copy(self):
         return copy.deepcopy(self)
@@ -144,11 +190,20 @@ class Board:
     def to_json(self):
         data = {}
         for location in range(26):
-            pieces = self.pieces_at(location)
-            if pieces:
-                data[location] = {'colour': pieces[0].colour.__str__(), 'count': len(pieces)}
+            point = self.point_to_json(location)
+            if point is not None:
+                data[location] = point
         return json.dumps(data)
 
+    def point_to_json(self, location):
+        # The entry to_json has for this location, or None if it is empty
+        point = None
+        for colour in Colour:
+            count = self.__counts[colour.value][location]
+            if count:
+                point = {'colour': colour.__str__(), 'count': count}
+        return point
+
     def __taken_location(self, colour):
         return 0 if colour == Colour.WHITE else 25
 
@@ -160,3 +215,23 @@ class Board:
 
     def __remove_piece(self, piece):
         self.__pieces.remove(piece)
+        self.__update_count(piece.colour, piece.location, -1)
+
+    def __move_to(self, piece, location):
+        self.__update_count(piece.colour, piece.location, -1)
+        piece.location = location
+        self.__update_count(piece.colour, location, 1)
+
+    def __update_count(self, colour, location, change):
+        counts = self.__counts[colour.value]
+        counts[location] += change
+        bit = 1 << location
+        if counts[location] > 0:
+            self.__occupied[colour.value] |= bit
+        else:
+            self.__occupied[colour.value] &= ~bit
+        if counts[location] > 1 and 0 < location < 25:
+            self.__blocked[colour.value] |= bit
+        else:
+            self.__blocked[colour.value] &= ~bit
+
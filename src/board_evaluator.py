@@ -0,0 +1,130 @@
+from src.position import Position
+
+
+class BoardEvaluator:
+    SIMPLE = {
+        'sum_distances': 1,
+        'number_of_singles': 2,
+        'number_occupied_spaces': -1,
+        'opponents_taken_pieces': -1,
+    }
+    WEIGHTING_DISTANCE = {
+        'sum_distances': 1,
+        'sum_distances_opponent': -1 / 3,
+        'number_of_singles': 2,
+        'number_occupied_spaces': -1,
+        'opponents_taken_pieces': -1,
+    }
+    WEIGHTING_DISTANCE_AND_SINGLES = {
+        'sum_distances': 1,
+        'sum_distances_opponent': -1 / 3,
+        'sum_single_distance_away_from_home': 1 / 6,
+        'number_occupied_spaces': -1,
+        'opponents_taken_pieces': -1,
+    }
+    WEIGHTING_DISTANCE_AND_SINGLES_WITH_END_GAME = {
+        'sum_distances': 1,
+        'sum_distances_opponent': -1 / 3,
+        'sum_single_distance_away_from_home': 1 / 6,
+        'number_occupied_spaces': -1,
+        'opponents_taken_pieces': -1,
+        'pieces_on_board': 3,
+    }
+    WEIGHTING_DISTANCE_AND_SINGLES_WITH_END_GAME_2 = {
+        'sum_distances': 1,
+        'sum_distances_opponent': -1 / 3,
+        'sum_single_distance_away_from_home': 1 / 6,
+        'number_occupied_spaces': -1,
+        'opponents_taken_pieces': -1,
+        'pieces_on_board': 3,
+        'sum_distances_to_endzone': 1 / 6,
+    }
+
+    FEATURES = (
+        'number_occupied_spaces',
+        'opponents_taken_pieces',
+        'sum_distances',
+        'sum_distances_opponent',
+        'number_of_singles',
+        'sum_single_distance_away_from_home',
+        'pieces_on_board',
+        'sum_distances_to_endzone',
+    )
+
+    def __init__(self, weights):
+        for feature in weights:
+            if feature not in BoardEvaluator.FEATURES:
+                raise Exception("%s is not a board feature" % feature)
+        self.weights = dict(weights)
+        self.__move_weights = tuple(self.weights.get(feature, 0) for feature in BoardEvaluator.FEATURES)
+
+    def evaluate_board(self, myboard, colour):
+        return self.evaluate_position(Position.from_board(myboard, colour))
+
+    def evaluate_position(self, position):
+        features = self.assess_position(position, self.weights)
+        return sum(weight * features[feature] for feature, weight in self.weights.items())
+
+    def evaluate_positions(self, positions):
+        # A whole batch in one call, for src.strategies.Strategy.choose_plays
+        return [self.evaluate_position(position) for position in positions]
+
+    def evaluate_move(self, position, point, die_roll):
+        # How much position.apply_move(point, die_roll) changes evaluate_position. Only
+        # the two points involved (and the opponent's bar on a hit) change, so this is
+        # far cheaper than evaluating the new position
+        points = position.points
+        target = point - die_roll
+        change = self.__point_value(point, points[point] - 1) - self.__point_value(point, points[point])
+        if target >= 1:
+            own = points[target]
+            if own == -1:
+                _, taken, _, opponent_distances = self.__move_weights[:4]
+                change += taken + opponent_distances * target
+                own = 0
+            change += self.__point_value(target, own + 1) - self.__point_value(target, own)
+        return change
+
+    def evaluate_moves(self, position, points, die_roll):
+        # evaluate_move for every point in one call, for the beam of CompareAllMoves
+        return [self.evaluate_move(position, point, die_roll) for point in points]
+
+    def __point_value(self, point, count):
+        occupied, _, distances, _, singles, single_distances, pieces, endzone = self.__move_weights
+        value = (distances * point + pieces) * count
+        if point > 6:
+            value += endzone * (point - 6) * count
+        if 1 <= point <= 24:
+            if count == 1:
+                value += singles + single_distances * (25 - point)
+            elif count > 1:
+                value += occupied
+        return value
+
+    def assess_board(self, colour, myboard, features=FEATURES):
+        return self.assess_position(Position.from_board(myboard, colour), features)
+
+    def assess_position(self, position, features=FEATURES):
+        # Both sides' pieces are counted by how far each is from its own home
+        # (25 being the bar), so every feature can be read off the two lists
+        own = [count if count > 0 else 0 for count in position.points]
+        opponent = [-count if count < 0 else 0 for count in reversed(position.points)]
+
+        stats = {}
+        if 'pieces_on_board' in features:
+            stats['pieces_on_board'] = sum(own)
+        if 'sum_distances' in features:
+            stats['sum_distances'] = sum(distance * count for distance, count in enumerate(own))
+        if 'sum_distances_to_endzone' in features:
+            stats['sum_distances_to_endzone'] = sum((distance - 6) * own[distance] for distance in range(7, 26))
+        if 'number_of_singles' in features or 'sum_single_distance_away_from_home' in features:
+            singles = [distance for distance in range(1, 25) if own[distance] == 1]
+            stats['number_of_singles'] = len(singles)
+            stats['sum_single_distance_away_from_home'] = sum(25 - distance for distance in singles)
+        if 'number_occupied_spaces' in features:
+            stats['number_occupied_spaces'] = sum(1 for distance in range(1, 25) if own[distance] > 1)
+        if 'opponents_taken_pieces' in features:
+            stats['opponents_taken_pieces'] = opponent[25]
+        if 'sum_distances_opponent' in features:
+            stats['sum_distances_opponent'] = sum(distance * count for distance, count in enumerate(opponent))
+        return stats
@@ -0,0 +1,80 @@
+import unittest
+
+from src.board import Board
+from src.board_evaluator import BoardEvaluator
+from src.colour import Colour
+from src.position import Position
+from src.test_board_base import TestBoardBase
+
+
+class TestBoardEvaluator(TestBoardBase):
+
+    def test_assess_starting_board(self):
+        self.board = Board.create_starting_board()
+
+        stats = BoardEvaluator(BoardEvaluator.SIMPLE).assess_board(Colour.WHITE, self.board)
+
+        self.assertEqual(stats, {
+            'number_occupied_spaces': 4,
+            'opponents_taken_pieces': 0,
+            'sum_distances': 167,
+            'sum_distances_opponent': 167,
+            'number_of_singles': 0,
+            'sum_single_distance_away_from_home': 0,
+            'pieces_on_board': 15,
+            'sum_distances_to_endzone': 77,
+        })
+
+    def test_assess_singles_and_taken_pieces(self):
+        self.add_many_pieces(1, Colour.BLACK, 20)
+        self.add_many_pieces(2, Colour.BLACK, 3)
+        self.add_many_pieces(1, Colour.WHITE, 0)
+
+        stats = BoardEvaluator(BoardEvaluator.SIMPLE).assess_board(Colour.BLACK, self.board)
+
+        self.assertEqual(stats['number_of_singles'], 1)
+        self.assertEqual(stats['sum_single_distance_away_from_home'], 5)
+        self.assertEqual(stats['number_occupied_spaces'], 1)
+        self.assertEqual(stats['opponents_taken_pieces'], 1)
+        self.assertEqual(stats['sum_distances_opponent'], 25)
+
+    def test_only_weighted_features_are_computed(self):
+        self.board = Board.create_starting_board()
+
+        stats = BoardEvaluator(BoardEvaluator.SIMPLE).assess_board(
+            Colour.WHITE, self.board, BoardEvaluator.SIMPLE)
+
+        self.assertNotIn('sum_distances_opponent', stats)
+        self.assertNotIn('sum_distances_to_endzone', stats)
+
+    def test_evaluate_board_applies_weights(self):
+        self.board = Board.create_starting_board()
+
+        value = BoardEvaluator(BoardEvaluator.WEIGHTING_DISTANCE_AND_SINGLES_WITH_END_GAME_2) \
+            .evaluate_board(self.board, Colour.BLACK)
+
+        self.assertAlmostEqual(value, 167 - 167 / 3 - 4 + 3 * 15 + 77 / 6)
+
+    def test_evaluate_move_matches_full_evaluation(self):
+        self.add_many_pieces(2, Colour.WHITE, 1)
+        self.add_many_pieces(1, Colour.WHITE, 12)
+        self.add_many_pieces(1, Colour.BLACK, 16)
+        self.add_many_pieces(3, Colour.WHITE, 20)
+        self.add_many_pieces(1, Colour.BLACK, 22)
+        position = Position.from_board(self.board, Colour.WHITE)
+        evaluator = BoardEvaluator(BoardEvaluator.WEIGHTING_DISTANCE_AND_SINGLES_WITH_END_GAME_2)
+
+        for die_roll in range(1, 7):
+            for point in position.movable_points(die_roll):
+                self.assertAlmostEqual(
+                    evaluator.evaluate_move(position, point, die_roll),
+                    evaluator.evaluate_position(position.apply_move(point, die_roll)) -
+                    evaluator.evaluate_position(position))
+
+    def test_unknown_feature_is_rejected(self):
+        with self.assertRaises(Exception):
+            BoardEvaluator({'number_of_doubles': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+from src.board import Board
 from src.colour import Colour
 from src.test_board_base import TestBoardBase, Contains, Die, Can, Cannot
 
@@ -111,5 +112,74 @@ class TestBoardMovePiece(TestBoardBase):
         self.assertEqual(len(black_pieces), 0)
 
 
+class TestBoardMasks(TestBoardBase):
+
+    def test_blocked_mask_needs_two_pieces(self):
+        self.add_many_pieces(1, Colour.WHITE, 5)
+        self.add_many_pieces(2, Colour.WHITE, 8)
+
+        self.assertEqual(self.board.get_occupied_mask(Colour.WHITE), (1 << 5) | (1 << 8))
+        self.assertEqual(self.board.get_blocked_mask(Colour.WHITE), 1 << 8)
+
+    def test_masks_follow_taken_piece(self):
+        self.add_piece(Colour.WHITE, 12)
+        self.add_piece(Colour.BLACK, 15)
+
+        self.move_piece_at(12, Die.roll_of(3))
+
+        self.assertEqual(self.board.get_occupied_mask(Colour.WHITE), 1 << 15)
+        self.assertEqual(self.board.get_occupied_mask(Colour.BLACK), 1 << 25)
+
+    def test_race_once_the_sides_have_passed(self):
+        self.add_many_pieces(2, Colour.WHITE, 14)
+        self.add_many_pieces(2, Colour.BLACK, 13)
+        self.assertTrue(self.board.is_race())
+
+        self.add_piece(Colour.BLACK, 20)
+        self.assertFalse(self.board.is_race())
+
+    def test_no_race_without_opponent(self):
+        self.add_many_pieces(2, Colour.WHITE, 14)
+
+        self.assertFalse(self.board.is_race())
+
+    def test_movable_mask_covers_all_pieces(self):
+        self.add_many_pieces(1, Colour.WHITE, 3)
+        self.add_many_pieces(1, Colour.WHITE, 6)
+        self.add_many_pieces(2, Colour.BLACK, 9)
+
+        self.assertEqual(self.board.get_movable_mask(Colour.WHITE, 3), 1 << 3)
+        self.assertEqual(self.board.get_movable_mask(Colour.WHITE, 4), (1 << 3) | (1 << 6))
+
+    def test_movable_mask_only_taken_piece(self):
+        self.add_many_pieces(1, Colour.BLACK, 25)
+        self.add_many_pieces(1, Colour.BLACK, 10)
+        self.add_many_pieces(2, Colour.WHITE, 22)
+
+        self.assertEqual(self.board.get_movable_mask(Colour.BLACK, 2), 1 << 25)
+        self.assertEqual(self.board.get_movable_mask(Colour.BLACK, 3), 0)
+
+    def test_no_moves_possible_when_all_blocked(self):
+        self.add_many_pieces(1, Colour.WHITE, 0)
+        for location in range(1, 7):
+            self.add_many_pieces(2, Colour.BLACK, location)
+
+        self.assertTrue(self.board.no_moves_possible(Colour.WHITE, [3, 5]))
+        self.assertFalse(self.board.no_moves_possible(Colour.BLACK, [3, 5]))
+
+
+class TestBoardJson(TestBoardBase):
+
+    def test_board_is_read_back_from_json(self):
+        self.add_many_pieces(2, Colour.WHITE, 0)
+        self.add_many_pieces(3, Colour.BLACK, 13)
+        self.add_piece(Colour.WHITE, 24)
+
+        board = Board.from_json(self.board.to_json())
+
+        self.assertEqual(board.get_counts(Colour.WHITE), self.board.get_counts(Colour.WHITE))
+        self.assertEqual(board.get_counts(Colour.BLACK), self.board.get_counts(Colour.BLACK))
+
+
 if __name__ == '__main__':
     unittest.main()
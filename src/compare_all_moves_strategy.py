@@ -1,164 +1,206 @@
+from src.board_evaluator import BoardEvaluator
+from src.play_generator import generate_plays
+from src.position import Position
+from src.race_evaluator import RaceEvaluator
 from src.strategies import Strategy
-from src.piece import Piece
 
 
 class CompareAllMoves(Strategy):
+    evaluator = BoardEvaluator(BoardEvaluator.SIMPLE)
+    race_evaluator = RaceEvaluator()
+    position_only = True
+
+    def __init__(self, beam_width: int = None):
+        # With a beam width only that many of the best moves for each die are
+        # searched further; by default every move is
+        self.beam_width = beam_width
 
     @staticmethod
     def get_difficulty():
         return "Hard"
 
     def assess_board(self, colour, myboard):
-        pieces = myboard.get_pieces(colour)
-        pieces_on_board = len(pieces)
-        sum_distances = 0
-        number_of_singles = 0
-        number_occupied_spaces = 0
-        sum_single_distance_away_from_home = 0
-        sum_distances_to_endzone = 0
-        for piece in pieces:
-            sum_distances = sum_distances + piece.spaces_to_home()
-            if piece.spaces_to_home() > 6:
-                sum_distances_to_endzone += piece.spaces_to_home() - 6
-        for location in range(1, 25):
-            pieces = myboard.pieces_at(location)
-            if len(pieces) != 0 and pieces[0].colour == colour:
-                if len(pieces) == 1:
-                    number_of_singles = number_of_singles + 1
-                    sum_single_distance_away_from_home += 25 - pieces[0].spaces_to_home()
-                elif len(pieces) > 1:
-                    number_occupied_spaces = number_occupied_spaces + 1
-        opponents_taken_pieces = len(myboard.get_taken_pieces(colour.other()))
-        opponent_pieces = myboard.get_pieces(colour.other())
-        sum_distances_opponent = 0
-        for piece in opponent_pieces:
-            sum_distances_opponent = sum_distances_opponent + piece.spaces_to_home()
-        return {
-            'number_occupied_spaces': number_occupied_spaces,
-            'opponents_taken_pieces': opponents_taken_pieces,
-            'sum_distances': sum_distances,
-            'sum_distances_opponent': sum_distances_opponent,
-            'number_of_singles': number_of_singles,
-            'sum_single_distance_away_from_home': sum_single_distance_away_from_home,
-            'pieces_on_board': pieces_on_board,
-            'sum_distances_to_endzone': sum_distances_to_endzone,
-        }
+        return self.evaluator.assess_board(colour, myboard)
+
+    def evaluate_board(self, myboard, colour):
+        return self.evaluator.evaluate_board(myboard, colour)
+
+    def evaluate_position(self, position):
+        return self.evaluator.evaluate_position(position)
+
+    def evaluator_for(self, position):
+        # Once the sides have passed each other only the race matters, and
+        # every position the search reaches from there is a race too
+        if self.race_evaluator is not None and position.is_race():
+            return self.race_evaluator
+        return self.evaluator
+
+    def rank_moves(self, board, colour, dice_roll):
+        evaluator = self.evaluator_for(Position.from_board(board, colour))
+        ranked = []
+        for play in generate_plays(board, colour, dice_roll):
+            play['value'] = evaluator.evaluate_position(play['position'])
+            ranked.append(play)
+        ranked.sort(key=lambda play: play['value'])
+        return ranked
 
     def move(self, board, colour, dice_roll, make_move, opponents_activity):
+        position = Position.from_board(board, colour)
+        evaluator = self.evaluator_for(position)
+
+        results = [self.move_recursively(position, dice_rolls, evaluator) for dice_rolls in self.dice_orders(dice_roll)]
+        self.make_best_moves(self.best_of_orders(results), colour, make_move)
+
+    def choose_plays(self, positions, dice):
+        # The same searches as move, run twice: the first pass only collects
+        # the positions they reach, which are scored together with one call per
+        # evaluator, and the second picks the plays with those scores. Which
+        # positions a search reaches does not depend on their scores, so the
+        # plays chosen are the ones move would make
+        evaluators = [self.evaluator_for(position) for position in positions]
+        batches = {}
+        for position, dice_roll, evaluator in zip(positions, dice, evaluators):
+            batch = batches.setdefault(id(evaluator), BatchEvaluator(evaluator))
+            for dice_rolls in self.dice_orders(list(dice_roll)):
+                self.move_recursively(position, dice_rolls, batch)
+        for batch in batches.values():
+            batch.score()
+
+        plays = []
+        for position, dice_roll, evaluator in zip(positions, dice, evaluators):
+            batch = batches[id(evaluator)]
+            result = self.best_of_orders([self.move_recursively(position, dice_rolls, batch)
+                                          for dice_rolls in self.dice_orders(list(dice_roll))])
+            plays.append([(move['piece_at'], move['die_roll']) for move in result['best_moves']])
+        return plays
+
+    @staticmethod
+    def dice_orders(dice_roll):
+        if len(dice_roll) == 2:
+            return [dice_roll, list(reversed(dice_roll))]
+        return [dice_roll]
 
-        result = self.move_recursively(board, colour, dice_roll)
-        not_a_double = len(dice_roll) == 2
-        if not_a_double:
-            new_dice_roll = dice_roll.copy()
-            new_dice_roll.reverse()
-            result_swapped = self.move_recursively(board, colour,
-                                                   dice_rolls=new_dice_roll)
+    @staticmethod
+    def best_of_orders(results):
+        # Playing the dice the other way round only wins if it is better and plays as many dice
+        result = results[0]
+        for result_swapped in results[1:]:
             if result_swapped['best_value'] < result['best_value'] and \
                     len(result_swapped['best_moves']) >= len(result['best_moves']):
                 result = result_swapped
+        return result
 
-        if len(result['best_moves']) != 0:
-            for move in result['best_moves']:
-                make_move(move['piece_at'], move['die_roll'])
-
-    def move_recursively(self, board, colour, dice_rolls):
-        best_board_value = float('inf')
-        best_pieces_to_move = []
-
-        pieces_to_try = [x.location for x in board.get_pieces(colour)]
-        pieces_to_try = list(set(pieces_to_try))
+    @staticmethod
+    def make_best_moves(result, colour, make_move):
+        for move in result['best_moves']:
+            make_move(Position.to_location(move['piece_at'], colour), move['die_roll'])
 
-        valid_pieces = []
-        for piece_location in pieces_to_try:
-            valid_pieces.append(board.get_piece_at(piece_location))
-        valid_pieces.sort(key=Piece.spaces_to_home, reverse=True)
+    def move_recursively(self, position, dice_rolls, evaluator=None):
+        # Moves are found and returned as points of the Position, furthest back first
+        if evaluator is None:
+            evaluator = self.evaluator
+        result = {'best_value': float('inf'), 'best_moves': []}
 
         dice_rolls_left = dice_rolls.copy()
         die_roll = dice_rolls_left.pop(0)
 
-        for piece in valid_pieces:
-            if board.is_move_possible(piece, die_roll):
-                board_copy = board.create_copy()
-                new_piece = board_copy.get_piece_at(piece.location)
-                board_copy.move_piece(new_piece, die_roll)
-                if len(dice_rolls_left) > 0:
-                    result = self.move_recursively(board_copy, colour, dice_rolls_left)
-                    if len(result['best_moves']) == 0:
-                        # we have done the best we can do
-                        board_value = self.evaluate_board(board_copy, colour)
-                        if board_value < best_board_value and len(best_pieces_to_move) < 2:
-                            best_board_value = board_value
-                            best_pieces_to_move = [{'die_roll': die_roll, 'piece_at': piece.location}]
-                    elif result['best_value'] < best_board_value:
-                        new_best_moves_length = len(result['best_moves']) + 1
-                        if new_best_moves_length >= len(best_pieces_to_move):
-                            best_board_value = result['best_value']
-                            move = {'die_roll': die_roll, 'piece_at': piece.location}
-                            best_pieces_to_move = [move] + result['best_moves']
-                else:
-                    board_value = self.evaluate_board(board_copy, colour)
-                    if board_value < best_board_value and len(best_pieces_to_move) < 2:
-                        best_board_value = board_value
-                        best_pieces_to_move = [{'die_roll': die_roll, 'piece_at': piece.location}]
-
-        return {'best_value': best_board_value,
-                'best_moves': best_pieces_to_move}
+        for point in self.candidate_points(position, die_roll, dice_rolls_left, evaluator):
+            move_result = self.search_after_move(position.apply_move(point, die_roll), dice_rolls_left, evaluator)
+            result = self.add_move(result, point, die_roll, move_result)
+        return result
+
+    def candidate_points(self, position, die_roll, dice_rolls_left, evaluator):
+        points = position.movable_points(die_roll)
+        if self.beam_width is not None and len(dice_rolls_left) > 0 and len(points) > self.beam_width:
+            # Only moves that still let as many dice as possible be played may be
+            # kept, or the beam could leave only plays that waste a die
+            dice_played = {point: self.most_dice_played(position.apply_move(point, die_roll), dice_rolls_left)
+                           for point in points}
+            most_dice = max(dice_played.values())
+            points = [point for point in points if dice_played[point] == most_dice]
+            values = dict(zip(points, evaluator.evaluate_moves(position, points, die_roll)))
+            points = sorted(points, key=values.get)[:self.beam_width]
+        return points
 
+    @staticmethod
+    def most_dice_played(position, dice_rolls):
+        # How many of dice_rolls, in that order, can be played from position
+        most_dice = 0
+        if dice_rolls:
+            for point in position.movable_points(dice_rolls[0]):
+                most_dice = max(most_dice, 1 + CompareAllMoves.most_dice_played(
+                    position.apply_move(point, dice_rolls[0]), dice_rolls[1:]))
+                if most_dice == len(dice_rolls):
+                    break
+        return most_dice
+
+    def search_after_move(self, new_position, dice_rolls_left, evaluator):
+        if len(dice_rolls_left) > 0:
+            result = self.move_recursively(new_position, dice_rolls_left, evaluator)
+            if len(result['best_moves']) != 0:
+                return result
+        # we have done the best we can do
+        return {'best_value': evaluator.evaluate_position(new_position), 'best_moves': []}
 
-class CompareAllMovesSimple(CompareAllMoves):
+    @staticmethod
+    def add_move(result, point, die_roll, move_result):
+        # The better of the best play so far and moving from point followed by
+        # move_result; plays using more dice win ties in length
+        if len(move_result['best_moves']) == 0:
+            if move_result['best_value'] < result['best_value'] and len(result['best_moves']) < 2:
+                return {'best_value': move_result['best_value'],
+                        'best_moves': [{'die_roll': die_roll, 'piece_at': point}]}
+        elif move_result['best_value'] < result['best_value'] and \
+                len(move_result['best_moves']) + 1 >= len(result['best_moves']):
+            return {'best_value': move_result['best_value'],
+                    'best_moves': [{'die_roll': die_roll, 'piece_at': point}] + move_result['best_moves']}
+        return result
+
+
+class BatchEvaluator:
+    # Stands in for an evaluator in CompareAllMoves.choose_plays: until score is
+    # called it only records the positions it is asked about, then it answers
+    # from the scores of the whole batch. The moves a beam keeps have to be known
+    # in the first pass, so they are scored straight away, all of a beam's
+    # together, and kept for the second
+    def __init__(self, evaluator):
+        self.evaluator = evaluator
+        self.positions = set()
+        self.scores = None
+        self.moves = {}
+
+    def evaluate_position(self, position):
+        if self.scores is None:
+            self.positions.add(position)
+            return 0
+        return self.scores[position]
+
+    def evaluate_moves(self, position, points, die_roll):
+        key = (position, tuple(points), die_roll)
+        if key not in self.moves:
+            self.moves[key] = self.evaluator.evaluate_moves(position, points, die_roll)
+        return self.moves[key]
+
+    def score(self):
+        positions = list(self.positions)
+        self.scores = dict(zip(positions, self.evaluator.evaluate_positions(positions)))
 
-    def evaluate_board(self, myboard, colour):
-        board_stats = self.assess_board(colour, myboard)
 
-        board_value = board_stats['sum_distances'] + 2 * board_stats['number_of_singles'] - \
-                      board_stats['number_occupied_spaces'] - board_stats['opponents_taken_pieces']
-        return board_value
+class CompareAllMovesSimple(CompareAllMoves):
+    evaluator = BoardEvaluator(BoardEvaluator.SIMPLE)
 
 
 class CompareAllMovesWeightingDistance(CompareAllMoves):
-
-    def evaluate_board(self, myboard, colour):
-        board_stats = self.assess_board(colour, myboard)
-
-        board_value = board_stats['sum_distances'] - float(board_stats['sum_distances_opponent'])/3 + \
-                      2 * board_stats['number_of_singles'] - \
-                      board_stats['number_occupied_spaces'] - board_stats['opponents_taken_pieces']
-        return board_value
+    evaluator = BoardEvaluator(BoardEvaluator.WEIGHTING_DISTANCE)
 
 
 class CompareAllMovesWeightingDistanceAndSingles(CompareAllMoves):
-
-    def evaluate_board(self, myboard, colour):
-        board_stats = self.assess_board(colour, myboard)
-
-        board_value = board_stats['sum_distances'] - float(board_stats['sum_distances_opponent'])/3 + \
-                      float(board_stats['sum_single_distance_away_from_home'])/6 - \
-                      board_stats['number_occupied_spaces'] - board_stats['opponents_taken_pieces']
-        return board_value
+    evaluator = BoardEvaluator(BoardEvaluator.WEIGHTING_DISTANCE_AND_SINGLES)
 
 
 class CompareAllMovesWeightingDistanceAndSinglesWithEndGame(CompareAllMoves):
-
-    def evaluate_board(self, myboard, colour):
-        board_stats = self.assess_board(colour, myboard)
-
-        board_value = board_stats['sum_distances'] - float(board_stats['sum_distances_opponent']) / 3 + \
-                      float(board_stats['sum_single_distance_away_from_home']) / 6 - \
-                      board_stats['number_occupied_spaces'] - board_stats['opponents_taken_pieces'] + \
-                      3 * board_stats['pieces_on_board']
-
-        return board_value
+    evaluator = BoardEvaluator(BoardEvaluator.WEIGHTING_DISTANCE_AND_SINGLES_WITH_END_GAME)
 
 
 class CompareAllMovesWeightingDistanceAndSinglesWithEndGame2(CompareAllMoves):
-
-    def evaluate_board(self, myboard, colour):
-        board_stats = self.assess_board(colour, myboard)
-
-        board_value = board_stats['sum_distances'] - float(board_stats['sum_distances_opponent']) / 3 + \
-                      float(board_stats['sum_single_distance_away_from_home']) / 6 - \
-                      board_stats['number_occupied_spaces'] - board_stats['opponents_taken_pieces'] + \
-                      3 * board_stats['pieces_on_board'] + float(board_stats['sum_distances_to_endzone']) / 6
-
-        return board_value
-
+    evaluator = BoardEvaluator(BoardEvaluator.WEIGHTING_DISTANCE_AND_SINGLES_WITH_END_GAME_2)
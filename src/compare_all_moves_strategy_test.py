@@ -1,7 +1,14 @@
+import random
 import unittest
 
+from src.board import Board
+from src.board_evaluator import BoardEvaluator
 from src.colour import Colour
-from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.compare_all_moves_strategy import CompareAllMovesSimple, CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.game import roll_dice
+from src.play_generator import generate_plays
+from src.position import Position
+from src.strategies import MoveRandomPiece, Strategy
 from src.test_board_base import TestBoardBase, Contains
 
 
@@ -109,6 +116,91 @@ class TestCompareAllMovesValidity(TestBoardBase):
 
         self.assert_location(25, Contains(1).pieces())
 
+    def test_wide_beam_plays_like_exhaustive_search(self):
+        self.board = Board.create_starting_board()
+        exhaustive_board = self.board.create_copy()
+
+        CompareAllMovesSimple().move(exhaustive_board, Colour.WHITE, [3, 3, 3, 3],
+                                     exhaustive_board.get_move_lambda(), {})
+        CompareAllMovesSimple(beam_width=15).move(self.board, Colour.WHITE, [3, 3, 3, 3],
+                                                  self.board.get_move_lambda(), {})
+
+        self.assertEqual(self.board.get_counts(Colour.WHITE), exhaustive_board.get_counts(Colour.WHITE))
+
+    def test_narrow_beam_still_uses_all_dice(self):
+        self.board = Board.create_starting_board()
+
+        CompareAllMovesSimple(beam_width=1).move(self.board, Colour.WHITE, [5, 5, 5, 5],
+                                                 self.board.get_move_lambda(), {})
+
+        pips = sum((25 - location) * count for location, count in enumerate(self.board.get_counts(Colour.WHITE)))
+        self.assertEqual(pips, 167 - 20)
+
+    def test_beam_never_plays_fewer_dice_than_allowed(self):
+        # Narrow beams used to keep only moves that left the 6 unplayable here
+        position = Position.from_key('fqgegdffdfffdcgfffegfffcef')
+        moves_allowed = len(generate_plays(position.to_board(Colour.WHITE), Colour.WHITE, [2, 6])[0]['moves'])
+
+        for beam_width in (1, 2):
+            self.assertEqual(len(CompareAllMovesSimple(beam_width).choose_plays([position], [[2, 6]])[0]),
+                             moves_allowed)
+
+    def test_beam_plays_as_many_dice_as_allowed_in_a_game(self):
+        rng = random.Random(2)
+        random.seed(2)
+        position = Position.from_board(Board.create_starting_board(), Colour.WHITE)
+        while not position.has_game_ended():
+            dice_roll = roll_dice(rng=rng)
+            moves_allowed = len(generate_plays(position.to_board(Colour.WHITE), Colour.WHITE, dice_roll)[0]['moves'])
+            for beam_width in (1, 2):
+                play = CompareAllMovesSimple(beam_width).choose_plays([position], [dice_roll])[0]
+                self.assertEqual(len(play), moves_allowed)
+            for point, die_roll in MoveRandomPiece().choose_plays([position], [dice_roll])[0]:
+                position = position.apply_move(point, die_roll)
+            position = position.flip()
+
+    def test_batched_plays_are_the_ones_move_makes(self):
+        # Every position of a random game, races and bearing off included
+        rng = random.Random(1)
+        random.seed(1)
+        positions, dice = [], []
+        position = Position.from_board(Board.create_starting_board(), Colour.WHITE)
+        while not position.has_game_ended():
+            dice_roll = roll_dice(rng=rng)
+            positions.append(position)
+            dice.append(dice_roll)
+            for point, die_roll in MoveRandomPiece().choose_plays([position], [dice_roll])[0]:
+                position = position.apply_move(point, die_roll)
+            position = position.flip()
+
+        strategy = CompareAllMovesWeightingDistanceAndSinglesWithEndGame2(beam_width=4)
+        self.assertTrue(any(position.is_race() for position in positions))
+        self.assertEqual(strategy.choose_plays(positions, dice), Strategy.choose_plays(strategy, positions, dice))
+
+    def test_batched_beam_scores_each_beam_once(self):
+        evaluator = CountingEvaluator(BoardEvaluator.SIMPLE)
+        strategy = CompareAllMovesSimple(beam_width=2)
+        strategy.evaluator = evaluator
+        board = Board.create_starting_board()
+
+        strategy.move(board, Colour.WHITE, [3, 3, 3, 3], board.get_move_lambda(), {})
+        beams = evaluator.calls
+        evaluator.calls = 0
+        strategy.choose_plays([Position.from_board(Board.create_starting_board(), Colour.WHITE)], [[3, 3, 3, 3]])
+
+        self.assertGreater(beams, 0)
+        self.assertEqual(evaluator.calls, beams)
+
+
+class CountingEvaluator(BoardEvaluator):
+    def __init__(self, weights):
+        super().__init__(weights)
+        self.calls = 0
+
+    def evaluate_moves(self, position, points, die_roll):
+        self.calls += 1
+        return super().evaluate_moves(position, points, die_roll)
+
 
 if __name__ == '__main__':
     unittest.main()
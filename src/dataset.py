@@ -0,0 +1,158 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+
+import numpy as np
+
+from src.colour import Colour
+from src.game import Game
+from src.game_observer import GameObserver
+from src.position import Position
+
+MAX_MOVES = 4
+# One row per decision: the position seen by the side to move, its dice, the
+# moves it chose as (point, die) padded with zeros, and the game's result for
+# it (the points won, negative when it lost)
+COLUMNS = {
+    'positions': (np.int8, (26,)),
+    'dice': (np.int8, (2,)),
+    'plays': (np.int8, (MAX_MOVES, 2)),
+    'outcomes': (np.int8, ()),
+}
+# Per game: the first row it wrote and how many (-1 for games not played)
+INDEX = 'games'
+METADATA = 'dataset.json'
+
+_writer = None
+
+
+class DecisionRecorder(GameObserver):
+    def __init__(self):
+        self.decisions = []
+        self.winner = None
+        self.points = 0
+
+    def on_dice_rolled(self, game, colour, dice_roll):
+        self.decisions.append((colour, Position.from_board(game.board, colour).points, dice_roll[:2], []))
+
+    def on_move(self, game, colour, move):
+        self.decisions[-1][3].append((Position.to_point(move['start_location'], colour), move['die_roll']))
+
+    def on_game_over(self, game, winner):
+        self.winner = winner
+        self.points = game.board.get_win_type()
+
+
+class DatasetWriter:
+    # Plays games in a worker process and writes each one straight into the
+    # memory-mapped arrays, at rows reserved from the shared counter
+    def __init__(self, directory, white_strategy, black_strategy, seed, rows):
+        self.white_strategy = white_strategy
+        self.black_strategy = black_strategy
+        self.seed = seed
+        self.rows = rows
+        self.columns = {name: np.load(column_path(directory, name), mmap_mode='r+') for name in COLUMNS}
+        self.index = np.load(column_path(directory, INDEX), mmap_mode='r+')
+
+    def __call__(self, game_index):
+        # Seeded like Experiment, so the same index plays the same game
+        random.seed("%s:%d" % (self.seed, game_index))
+        recorder = DecisionRecorder()
+        game = Game(self.white_strategy, self.black_strategy, first_player=Colour(random.randint(0, 1)))
+        game.add_observer(recorder)
+        game.run_game(verbose=False)
+
+        decisions = recorder.decisions
+        with self.rows.get_lock():
+            start = self.rows.value
+            self.rows.value += len(decisions)
+        capacity = len(self.columns['outcomes'])
+        if start + len(decisions) > capacity:
+            raise Exception('The dataset is full after %d rows, create it with a larger capacity' % capacity)
+
+        for row, (colour, points, dice_roll, moves) in enumerate(decisions, start):
+            self.columns['positions'][row] = points
+            self.columns['dice'][row] = dice_roll
+            self.columns['plays'][row] = moves + [(0, 0)] * (MAX_MOVES - len(moves))
+            self.columns['outcomes'][row] = recorder.points if colour == recorder.winner else -recorder.points
+        self.index[game_index] = (start, len(decisions))
+        return len(decisions)
+
+    def play_games(self, game_indexes):
+        return sum(self(game_index) for game_index in game_indexes)
+
+
+def column_path(directory, name):
+    return os.path.join(directory, name + '.npy')
+
+
+def _start_worker(directory, white_strategy, black_strategy, seed, rows):
+    global _writer
+    _writer = DatasetWriter(directory, white_strategy, black_strategy, seed, rows)
+
+
+def _play_games(game_indexes):
+    return _writer.play_games(game_indexes)
+
+
+def generate_dataset(directory, white_strategy, black_strategy, games, seed=0, capacity=None, processes=None):
+    # The arrays are allocated up front (capacity rows, by default 100 a game,
+    # which is about twice what games between the built in strategies need) and
+    # filled in place, so memory use does not grow with the size of the dataset
+    capacity = capacity if capacity is not None else games * 100
+    os.makedirs(directory, exist_ok=True)
+    for name, (dtype, shape) in COLUMNS.items():
+        np.lib.format.open_memmap(column_path(directory, name), mode='w+', dtype=dtype, shape=(capacity,) + shape).flush()
+    index = np.lib.format.open_memmap(column_path(directory, INDEX), mode='w+', dtype=np.int64, shape=(games, 2))
+    index[:] = -1
+    index.flush()
+    del index
+
+    rows = mp.Value('q', 0)
+    initargs = (directory, white_strategy, black_strategy, seed, rows)
+    chunks = [range(start, min(start + 100, games)) for start in range(0, games, 100)]
+    if processes == 1:
+        _start_worker(*initargs)
+        for chunk in chunks:
+            _play_games(chunk)
+    else:
+        with mp.Pool(processes, initializer=_start_worker, initargs=initargs) as pool:
+            for _ in pool.imap_unordered(_play_games, chunks):
+                print(".", end="", flush=True)
+            print("")
+
+    with open(os.path.join(directory, METADATA), 'w') as metadata_file:
+        json.dump({'white_strategy': type(white_strategy).__name__, 'black_strategy': type(black_strategy).__name__,
+                   'seed': seed, 'games': games, 'capacity': capacity, 'rows': rows.value}, metadata_file, indent=2)
+    return rows.value
+
+
+def load_dataset(directory):
+    # Every array is a read only memory map of the files, so nothing is copied
+    # until it is used
+    with open(os.path.join(directory, METADATA)) as metadata_file:
+        rows = json.load(metadata_file)['rows']
+    dataset = {name: np.load(column_path(directory, name), mmap_mode='r')[:rows] for name in COLUMNS}
+    dataset[INDEX] = np.load(column_path(directory, INDEX), mmap_mode='r')
+    return dataset
+
+
+if __name__ == '__main__':
+    from src.strategy_factory import StrategyFactory
+
+    parser = argparse.ArgumentParser(description='Record the decisions of many games as training data')
+    parser.add_argument('white_strategy')
+    parser.add_argument('black_strategy')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', default='0')
+    parser.add_argument('--output', default='dataset')
+    parser.add_argument('--capacity', type=int, help='rows to allocate (default 100 a game)')
+    parser.add_argument('--processes', type=int, default=mp.cpu_count())
+    args = parser.parse_args()
+
+    row_count = generate_dataset(args.output, StrategyFactory.create_by_name(args.white_strategy),
+                                 StrategyFactory.create_by_name(args.black_strategy), args.games, args.seed,
+                                 args.capacity, args.processes)
+    print("Wrote %d positions from %d games to %s" % (row_count, args.games, args.output))
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.strategies import MoveRandomPiece
+
+try:
+    import numpy as np
+    from src.dataset import generate_dataset, load_dataset
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_every_decision_of_every_game_is_written(self):
+        rows = generate_dataset(self.directory.name, CompareAllMovesSimple(), MoveRandomPiece(), 3, seed=1,
+                                processes=1)
+        dataset = load_dataset(self.directory.name)
+
+        self.assertEqual(len(dataset['positions']), rows)
+        # Each game has its own run of rows, and together they fill the dataset
+        next_row = 0
+        for start, game_rows in sorted(dataset['games'].tolist()):
+            self.assertEqual(start, next_row)
+            next_row += game_rows
+        self.assertEqual(next_row, rows)
+        self.assertTrue(np.all(dataset['positions'][:, 1:25].clip(min=0).sum(axis=1) <= 15))
+        self.assertTrue(np.all(np.abs(dataset['outcomes']) >= 1))
+
+    def test_outcomes_are_from_the_side_to_move(self):
+        generate_dataset(self.directory.name, CompareAllMovesSimple(), MoveRandomPiece(), 1, seed=2, processes=1)
+        dataset = load_dataset(self.directory.name)
+        start, rows = dataset['games'][0]
+        outcomes = dataset['outcomes'][start:start + rows]
+
+        # The players take turns, so consecutive decisions have opposite results
+        self.assertTrue(np.all(outcomes[1:] == -outcomes[:-1]))
+
+    def test_arrays_are_memory_mapped(self):
+        generate_dataset(self.directory.name, CompareAllMovesSimple(), MoveRandomPiece(), 2, seed=3, processes=2)
+        dataset = load_dataset(self.directory.name)
+
+        self.assertIsInstance(dataset['positions'], np.memmap)
+        self.assertEqual(os.path.getsize(os.path.join(self.directory.name, 'positions.npy')) // 26 // 100, 2)
+        self.assertFalse(np.any(dataset['games'] == -1))
+
+
+if __name__ == '__main__':
+    unittest.main()
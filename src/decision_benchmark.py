@@ -0,0 +1,282 @@
+import argparse
+import math
+import multiprocessing as mp
+import os
+import random
+import resource
+import statistics
+import time
+
+from src.beam_benchmark import DecisionSampler
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.game import Game
+from src.opening_book import book_dice
+from src.play_generator import generate_plays
+from src.position import Position
+from src.rollout import RolloutEngine, close_pools
+from src.strategy_factory import StrategyFactory
+
+DEFAULT_SUITE_PATH = os.path.join(os.path.dirname(__file__), 'decision_suite.txt')
+# Plays not rated when a suite is generated: HumanStrategy asks for its moves,
+# RolloutStrategy only chooses between the reference strategy's best three plays
+# (which are always rated) and MoveRandomPiece's plays are rated as it makes them
+NOT_COVERED = ('HumanStrategy', 'RolloutStrategy', 'MoveRandomPiece')
+# A play only counts as an error when it is rated this many standard errors
+# below the best one, so rollout noise is not counted as an error
+ERROR_MARGIN = 2.0
+
+_suite = None
+
+
+class SuiteDecision:
+    # A position (seen by the side to move) and roll, with the cubeless equity
+    # of the positions its plays lead to, as rolled out with the suite's dice,
+    # and the standard error of each one's difference from the best play
+    def __init__(self, position, dice_roll, equities, standard_errors=None):
+        self.position = position
+        self.dice_roll = dice_roll
+        self.equities = equities
+        self.standard_errors = standard_errors if standard_errors is not None else {}
+
+    def best_play(self):
+        return max(self.equities, key=self.equities.get)
+
+    def best_equity(self):
+        return max(self.equities.values())
+
+    def is_error(self, equity, standard_error):
+        return self.best_equity() - equity > ERROR_MARGIN * standard_error
+
+
+class DecisionSuite:
+    # The rollouts of every decision play the same dice sequences (seeded by the
+    # suite's seed and the decision's index), so a play missing from the suite
+    # can be rated later just like the ones in it
+    def __init__(self, decisions, seed, trials):
+        self.decisions = decisions
+        self.seed = seed
+        self.trials = trials
+
+    def __len__(self):
+        return len(self.decisions)
+
+    def rollout_seed(self, index):
+        return '%s:%d' % (self.seed, index)
+
+    @classmethod
+    def load(cls, path=DEFAULT_SUITE_PATH):
+        with open(path) as suite_file:
+            seed, trials = suite_file.readline().split()
+            decisions = []
+            for line in suite_file:
+                position, dice, plays = line.split()
+                dice_roll = [int(die) for die in dice]
+                equities = {}
+                standard_errors = {}
+                for play in plays.split(','):
+                    key, equity, standard_error = (play.split(':') + ['0'])[:3]
+                    equities[Position.from_key(key)] = float(equity)
+                    standard_errors[Position.from_key(key)] = float(standard_error)
+                decisions.append(SuiteDecision(Position.from_key(position),
+                                               dice_roll * 2 if dice_roll[0] == dice_roll[1] else dice_roll,
+                                               equities, standard_errors))
+        return cls(decisions, seed, int(trials))
+
+    def save(self, path=DEFAULT_SUITE_PATH):
+        with open(path, 'w') as suite_file:
+            suite_file.write('%s %d\n' % (self.seed, self.trials))
+            for decision in self.decisions:
+                suite_file.write('%s %s %s\n' % (
+                    decision.position.key(), book_dice(decision.dice_roll),
+                    ','.join('%s:%.4f:%.4f' % (position.key(), equity, decision.standard_errors.get(position, 0.0))
+                             for position, equity in decision.equities.items())))
+
+
+def rollout_outcomes(positions, seed, engine):
+    # Each position is after the play, so the opponent rolls first
+    boards = [position.to_board(Colour.WHITE) for position in positions]
+    return engine.trial_outcomes(boards, Colour.WHITE, Colour.BLACK, seed)
+
+
+def equity(outcomes):
+    return 2 * sum(outcomes) / len(outcomes) - 1
+
+
+def difference_error(best_outcomes, outcomes):
+    # The standard error of the difference in equity between two plays. Their
+    # trials are played with the same dice, in antithetic pairs, so it is the
+    # differences of whole pairs that are independent (ignoring the first roll's
+    # stratification overstates it a little)
+    differences = [best_outcomes[trial] + best_outcomes[trial + 1] - outcomes[trial] - outcomes[trial + 1]
+                   for trial in range(0, len(outcomes) - 1, 2)]
+    if len(differences) < 2:
+        return 0.0
+    return statistics.stdev(differences) / math.sqrt(len(differences))
+
+
+def sample_decisions(size, seed, reference):
+    # Distinct decisions with more than one way to play them, from games between
+    # copies of the reference strategy
+    random.seed(seed)
+    seen = set()
+    decisions = []
+    while len(decisions) < size:
+        sampler = DecisionSampler()
+        game = Game(reference, reference, Colour(random.randint(0, 1)))
+        game.add_observer(sampler)
+        game.run_game(verbose=False)
+        for position, dice_roll in sampler.decisions:
+            key = (position, book_dice(dice_roll))
+            plays = generate_plays(position.to_board(Colour.WHITE), Colour.WHITE, dice_roll)
+            if key not in seen and len(plays) > 1:
+                seen.add(key)
+                decisions.append((position, dice_roll))
+    return decisions[:size]
+
+
+def generate_suite(size, seed=0, trials=144, candidates=8, covered=None, processes=None):
+    # Each decision rates the reference strategy's best few plays and the play
+    # every covered strategy makes (every registered strategy by default); it
+    # takes a long time, so it is done once and the suite is saved
+    reference = CompareAllMovesWeightingDistanceAndSinglesWithEndGame2()
+    if covered is None:
+        covered = [entry.name for entry in StrategyFactory.get_all() if entry.name not in NOT_COVERED]
+    strategies = [StrategyFactory.create_by_name(name) for name in covered]
+    engine = RolloutEngine(trials=trials, processes=processes)
+    suite = DecisionSuite([], seed, trials)
+    try:
+        for index, (position, dice_roll) in enumerate(sample_decisions(size, seed, reference)):
+            board = position.to_board(Colour.WHITE)
+            plays = [play['position'] for play in reference.rank_moves(board, Colour.WHITE, dice_roll)[:candidates]]
+            for strategy in strategies:
+                plays.append(play_position(position, strategy.choose_plays([position], [dice_roll])[0]))
+            plays = list(dict.fromkeys(plays))
+            outcomes = dict(zip(plays, rollout_outcomes(plays, suite.rollout_seed(index), engine)))
+            equities = {play: equity(play_outcomes) for play, play_outcomes in outcomes.items()}
+            best_outcomes = outcomes[max(equities, key=equities.get)]
+            suite.decisions.append(SuiteDecision(position, dice_roll, equities, {
+                play: difference_error(best_outcomes, play_outcomes) for play, play_outcomes in outcomes.items()}))
+            print(".", end="", flush=True)
+        print("")
+    finally:
+        close_pools()
+    return suite
+
+
+def play_position(position, play):
+    for point, die_roll in play:
+        position = position.apply_move(point, die_roll)
+    return position
+
+
+def _start_worker(suite):
+    global _suite
+    _suite = suite
+
+
+def _children_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _evaluate_chunk(task):
+    # Only the strategy's own choices are timed; plays missing from the suite
+    # are rolled out here, after the clock has stopped. A strategy that rolls out
+    # on the shared pool does its work in the pool's processes, whose time only
+    # counts once they have exited, so the pool is closed before the clock stops
+    strategy_name, start, stop = task
+    decisions = _suite.decisions[start:stop]
+    strategy = StrategyFactory.create_by_name(strategy_name)
+    random.seed('%s:%d' % (strategy_name, start))
+    cpu_time = time.process_time() + _children_cpu_time()
+    plays = strategy.choose_plays([decision.position for decision in decisions],
+                                  [list(decision.dice_roll) for decision in decisions])
+    close_pools()
+    cpu_time = time.process_time() + _children_cpu_time() - cpu_time
+
+    result = {'decisions': len(decisions), 'errors': 0, 'equity_lost': 0.0, 'unrated': 0, 'cpu_time': cpu_time}
+    engine = None
+    for index, (decision, play) in enumerate(zip(decisions, plays), start):
+        position = play_position(decision.position, play)
+        play_equity = decision.equities.get(position)
+        standard_error = decision.standard_errors.get(position, 0.0)
+        if play_equity is None:
+            # The best play is rolled out again (with the same dice, so to the
+            # same result) to compare the play with
+            engine = engine if engine is not None else RolloutEngine(trials=_suite.trials, processes=1)
+            best_outcomes, outcomes = rollout_outcomes([decision.best_play(), position],
+                                                       _suite.rollout_seed(index), engine)
+            play_equity, standard_error = equity(outcomes), difference_error(best_outcomes, outcomes)
+            result['unrated'] += 1
+        result['errors'] += decision.is_error(play_equity, standard_error)
+        result['equity_lost'] += max(0.0, decision.best_equity() - play_equity)
+    return strategy_name, result
+
+
+def run_benchmark(strategy_names, suite, processes=None, chunk_size=100):
+    # Every strategy's decisions are split into chunks that are all played at
+    # once on the pool, so slow strategies do not hold the others up
+    tasks = [(name, start, min(start + chunk_size, len(suite)))
+             for name in strategy_names for start in range(0, len(suite), chunk_size)]
+    results = {name: {'decisions': 0, 'errors': 0, 'equity_lost': 0.0, 'unrated': 0, 'cpu_time': 0.0}
+               for name in strategy_names}
+
+    def add(chunk_results):
+        strategy_name, chunk_result = chunk_results
+        for name, value in chunk_result.items():
+            results[strategy_name][name] += value
+
+    if processes == 1:
+        _start_worker(suite)
+        for task in tasks:
+            add(_evaluate_chunk(task))
+    else:
+        with mp.Pool(processes, initializer=_start_worker, initargs=(suite,)) as pool:
+            for chunk_results in pool.imap_unordered(_evaluate_chunk, tasks):
+                add(chunk_results)
+    return results
+
+
+def print_results(results):
+    print("%-28s %10s %12s %12s %14s %10s" %
+          ('strategy', 'error rate', 'equity lost', 'CPU s', 'decisions/s', 'unrated'))
+    for name, result in sorted(results.items(), key=lambda item: item[1]['equity_lost']):
+        decisions = max(1, result['decisions'])
+        print("%-28s %9.1f%% %12.4f %12.2f %14.1f %10d" % (
+            name,
+            100 * result['errors'] / decisions,
+            result['equity_lost'] / decisions,
+            result['cpu_time'],
+            result['decisions'] / result['cpu_time'] if result['cpu_time'] > 0 else float('inf'),
+            result['unrated']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rate strategies by the plays they choose on a fixed set of positions')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    generate_parser = subparsers.add_parser('generate', help='roll out a new suite of positions')
+    generate_parser.add_argument('--size', type=int, default=2000)
+    generate_parser.add_argument('--seed', default='0')
+    generate_parser.add_argument('--trials', type=int, default=144, help='rollout trials for every rated play')
+    generate_parser.add_argument('--candidates', type=int, default=8,
+                                 help="how many of the reference strategy's best plays to rate")
+    run_parser = subparsers.add_parser('run', help='benchmark strategies on the suite')
+    run_parser.add_argument('strategies', nargs='*', help='strategy names (default every registered strategy)')
+    for subparser in (generate_parser, run_parser):
+        subparser.add_argument('--suite', default=DEFAULT_SUITE_PATH)
+        subparser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        decision_suite = generate_suite(args.size, args.seed, args.trials, args.candidates, processes=args.processes)
+        decision_suite.save(args.suite)
+        print("Saved %d decisions" % len(decision_suite))
+    else:
+        decision_suite = DecisionSuite.load(args.suite)
+        names = args.strategies or [entry.name for entry in StrategyFactory.get_all()
+                                    if entry.name != 'HumanStrategy']
+        start_time = time.time()
+        benchmark_results = run_benchmark(names, decision_suite, args.processes)
+        print("%d decisions in %.1f s" % (len(decision_suite), time.time() - start_time))
+        print_results(benchmark_results)
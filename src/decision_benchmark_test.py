@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.decision_benchmark import (DecisionSuite, SuiteDecision, difference_error, generate_suite, play_position,
+                                    run_benchmark)
+from src.position import Position
+
+
+class TestDecisionBenchmark(unittest.TestCase):
+
+    def test_suite_is_saved_and_loaded(self):
+        suite = generate_suite(3, seed='test', trials=2, candidates=2, covered=['CompareAllMovesSimple'], processes=1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'suite.txt')
+            suite.save(path)
+            loaded = DecisionSuite.load(path)
+
+        self.assertEqual((loaded.seed, loaded.trials, len(loaded)), ('test', 2, 3))
+        for decision, loaded_decision in zip(suite.decisions, loaded.decisions):
+            self.assertEqual(loaded_decision.position, decision.position)
+            self.assertEqual(loaded_decision.dice_roll, decision.dice_roll)
+            self.assertEqual(loaded_decision.equities.keys(), decision.equities.keys())
+            self.assertGreater(len(decision.equities), 1)
+
+    def test_shipped_suite_is_the_one_in_the_readme(self):
+        suite = DecisionSuite.load()
+
+        self.assertEqual((suite.seed, suite.trials, len(suite)), ('0', 288, 1000))
+
+    def test_covered_strategies_are_rated_without_rollouts(self):
+        suite = generate_suite(3, seed='test', trials=2, candidates=2, covered=['CompareAllMovesSimple'], processes=1)
+
+        results = run_benchmark(['CompareAllMovesSimple'], suite, processes=1)['CompareAllMovesSimple']
+
+        self.assertEqual(results['decisions'], 3)
+        self.assertEqual(results['unrated'], 0)
+        self.assertLessEqual(results['errors'], 3)
+
+    def test_errors_and_equity_lost(self):
+        position = Position.from_board(Board.create_starting_board(), Colour.WHITE)
+        dice_roll = [6, 5]
+        chosen = play_position(position, CompareAllMovesSimple().choose_plays([position], [dice_roll])[0])
+        other = play_position(position, [(24, 6), (18, 5)])
+        suite = DecisionSuite([SuiteDecision(position, dice_roll, {chosen: 0.2, other: 0.1}),
+                               SuiteDecision(position, dice_roll, {chosen: -0.1, other: 0.15})], 'test', 2)
+
+        results = run_benchmark(['CompareAllMovesSimple'], suite, processes=1)['CompareAllMovesSimple']
+
+        self.assertEqual(results['errors'], 1)
+        self.assertAlmostEqual(results['equity_lost'], 0.25)
+
+    def test_losses_within_the_rollout_noise_are_not_errors(self):
+        position = Position.from_board(Board.create_starting_board(), Colour.WHITE)
+        best = play_position(position, [(24, 6), (18, 5)])
+        decision = SuiteDecision(position, [6, 5], {best: 0.2}, {best: 0.0})
+
+        self.assertFalse(decision.is_error(0.15, 0.03))
+        self.assertTrue(decision.is_error(0.1, 0.03))
+
+    def test_difference_error_is_of_whole_pairs(self):
+        self.assertEqual(difference_error([1, 0, 1, 0], [1, 0, 1, 0]), 0.0)
+        self.assertAlmostEqual(difference_error([1, 1, 1, 0, 0, 0], [0, 0, 0, 0, 0, 0]), 0.5773502691896258)
+
+
+if __name__ == '__main__':
+    unittest.main()
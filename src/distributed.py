@@ -0,0 +1,205 @@
+import argparse
+import multiprocessing as mp
+import threading
+from multiprocessing.connection import Listener, Client
+from multiprocessing.context import AuthenticationError
+
+from src.experiment import GamePlayer
+from src.game_statistics import GameStatistics
+
+DEFAULT_PORT = 6000
+
+
+class Coordinator:
+    # Splits the games into seeded units and hands them to whichever workers
+    # connect. A unit held by a worker that disconnects (or, with unit_timeout,
+    # takes too long) is handed out again, up to max_attempts times in all, after
+    # which the run fails; only the first result for a unit counts
+    def __init__(self, white_strategy, black_strategy, games_to_play: int, address, authkey: bytes,
+                 unit_size: int = 100, seed=0, unit_timeout: float = None, paired: bool = False,
+                 max_attempts: int = 3):
+        self.white_strategy = white_strategy
+        self.black_strategy = black_strategy
+        self.seed = seed
+        self.paired = paired
+        if paired:
+            # Both games of a pair have to be in the same unit
+            unit_size += unit_size % 2
+        self.unit_timeout = unit_timeout
+        self.max_attempts = max_attempts
+        self.units = [(index, start, min(start + unit_size, games_to_play))
+                      for index, start in enumerate(range(0, games_to_play, unit_size))]
+        self.reissued_units = 0
+        self.__address = address
+        self.__authkey = authkey
+        self.__statistics = GameStatistics()
+        self.__pending = list(reversed(self.units))
+        self.__completed = set()
+        self.__attempts = {}
+        self.__failed_unit = None
+        self.__condition = threading.Condition()
+        self.__listener = None
+
+    @property
+    def address(self):
+        return self.__listener.address
+
+    def start(self):
+        self.__listener = Listener(self.__address, authkey=self.__authkey)
+        threading.Thread(target=self.__accept_workers, daemon=True).start()
+
+    def wait(self):
+        with self.__condition:
+            while not self.__is_finished():
+                self.__condition.wait()
+        self.__stop_accepting()
+        if self.__failed_unit is not None:
+            raise Exception("Unit %d lost its worker %d times" % (self.__failed_unit, self.max_attempts))
+        return self.__statistics
+
+    def run(self):
+        self.start()
+        return self.wait()
+
+    def __accept_workers(self):
+        while True:
+            try:
+                connection = self.__listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                return
+            with self.__condition:
+                if self.__is_finished():
+                    connection.close()
+                    self.__listener.close()
+                    return
+            threading.Thread(target=self.__serve, args=(connection,), daemon=True).start()
+
+    def __serve(self, connection):
+        unit = None
+        try:
+            with connection:
+                connection.send(('setup', self.white_strategy, self.black_strategy, self.seed, self.paired))
+                while True:
+                    unit = self.__next_unit()
+                    if unit is None:
+                        connection.send(('stop',))
+                        return
+                    connection.send(('play',) + unit)
+                    if self.unit_timeout is not None and not connection.poll(self.unit_timeout):
+                        raise TimeoutError()
+                    unit_index, statistics = connection.recv()
+                    self.__complete(unit_index, statistics)
+                    unit = None
+        except (EOFError, OSError):
+            if unit is not None:
+                self.__reissue(unit)
+
+    def __next_unit(self):
+        with self.__condition:
+            while not self.__pending and not self.__is_finished():
+                self.__condition.wait()
+            while self.__pending and not self.__is_finished():
+                unit = self.__pending.pop()
+                if unit[0] not in self.__completed:
+                    self.__attempts[unit[0]] = self.__attempts.get(unit[0], 0) + 1
+                    return unit
+            return None
+
+    def __complete(self, unit_index, statistics):
+        with self.__condition:
+            if unit_index not in self.__completed:
+                self.__completed.add(unit_index)
+                self.__statistics.merge(statistics)
+            self.__condition.notify_all()
+
+    def __reissue(self, unit):
+        with self.__condition:
+            if unit[0] not in self.__completed:
+                if self.__attempts[unit[0]] >= self.max_attempts:
+                    # A unit that keeps crashing its workers would be handed out forever
+                    self.__failed_unit = unit[0]
+                else:
+                    self.__pending.append(unit)
+                    self.reissued_units += 1
+            self.__condition.notify_all()
+
+    def __is_finished(self):
+        return self.__failed_unit is not None or len(self.__completed) == len(self.units)
+
+    def __stop_accepting(self):
+        # Listener.accept cannot be interrupted, so wake it with a connection of our own
+        host, port = self.__listener.address
+        try:
+            Client(('127.0.0.1' if host in ('0.0.0.0', '') else host, port), authkey=self.__authkey).close()
+        except OSError:
+            pass
+
+
+def run_worker(address, authkey: bytes):
+    units_played = 0
+    with Client(address, authkey=authkey) as connection:
+        _, white_strategy, black_strategy, seed, paired = connection.recv()
+        player = GamePlayer(white_strategy, black_strategy, seed, paired)
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                break
+            if message[0] == 'stop':
+                break
+            _, unit_index, start, stop = message
+            connection.send((unit_index, player.play_games(range(start, stop))))
+            units_played += 1
+    return units_played
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play an experiment across many machines')
+    subparsers = parser.add_subparsers(dest='role', required=True)
+    coordinator_parser = subparsers.add_parser('coordinator')
+    coordinator_parser.add_argument('white_strategy')
+    coordinator_parser.add_argument('black_strategy')
+    coordinator_parser.add_argument('--games', type=int, default=1000)
+    coordinator_parser.add_argument('--unit-size', type=int, default=100)
+    coordinator_parser.add_argument('--seed', default='0')
+    coordinator_parser.add_argument('--paired', action='store_true',
+                                    help='play each dice sequence twice with the strategies swapping colours')
+    coordinator_parser.add_argument('--host', default='127.0.0.1',
+                                    help='interface to listen on, e.g. 0.0.0.0 for every one')
+    coordinator_parser.add_argument('--move-cache',
+                                    help="file in which each machine caches the strategies' moves between runs")
+    worker_parser = subparsers.add_parser('worker')
+    worker_parser.add_argument('--host', default='127.0.0.1')
+    worker_parser.add_argument('--processes', type=int, default=mp.cpu_count())
+    for subparser in (coordinator_parser, worker_parser):
+        subparser.add_argument('--port', type=int, default=DEFAULT_PORT)
+        subparser.add_argument('--authkey', required=True,
+                               help='shared secret; results are pickled, so only use on a trusted network')
+    args = parser.parse_args()
+
+    if args.role == 'coordinator':
+        from src.experiment import Experiment
+        from src.strategy_factory import StrategyFactory
+
+        white_strategy = StrategyFactory.create_by_name(args.white_strategy)
+        black_strategy = StrategyFactory.create_by_name(args.black_strategy)
+        if args.move_cache:
+            from src.move_cache import MoveCache, cache_if_possible
+
+            move_cache = MoveCache(args.move_cache)
+            white_strategy = cache_if_possible(white_strategy, move_cache)
+            black_strategy = cache_if_possible(black_strategy, move_cache)
+        experiment = Experiment(args.games, white_strategy, black_strategy, paired=args.paired)
+        print("Waiting for workers on %s:%d" % (args.host, args.port))
+        experiment.run_distributed((args.host, args.port), args.authkey.encode(), args.unit_size, args.seed)
+        print("")
+        experiment.print_results()
+    else:
+        workers = [mp.Process(target=run_worker, args=((args.host, args.port), args.authkey.encode()))
+                   for _ in range(args.processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
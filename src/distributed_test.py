@@ -0,0 +1,66 @@
+import multiprocessing as mp
+import unittest
+from multiprocessing.connection import Client
+
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.distributed import Coordinator, run_worker
+from src.experiment import GamePlayer
+from src.strategies import MoveRandomPiece
+
+AUTHKEY = b'test'
+
+
+class TestDistributed(unittest.TestCase):
+
+    def setUp(self):
+        self.coordinator = Coordinator(CompareAllMovesSimple(), MoveRandomPiece(), 24,
+                                       ('127.0.0.1', 0), AUTHKEY, unit_size=5, seed='test')
+        self.coordinator.start()
+        self.expected = GamePlayer(CompareAllMovesSimple(), MoveRandomPiece(), 'test').play_games(range(24))
+
+    def start_workers(self, count):
+        workers = [mp.Process(target=run_worker, args=(self.coordinator.address, AUTHKEY)) for _ in range(count)]
+        for worker in workers:
+            worker.start()
+        return workers
+
+    def assert_same_games(self, statistics):
+        self.assertEqual(statistics.counters, self.expected.counters)
+        self.assertAlmostEqual(statistics.metrics['turns'].mean, self.expected.metrics['turns'].mean)
+
+    def test_several_workers_play_every_game_once(self):
+        workers = self.start_workers(3)
+        statistics = self.coordinator.wait()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(len(self.coordinator.units), 5)
+        self.assert_same_games(statistics)
+
+    def test_units_of_a_dead_worker_are_reissued(self):
+        with Client(self.coordinator.address, authkey=AUTHKEY) as connection:
+            connection.recv()
+            self.assertEqual(connection.recv()[0], 'play')
+
+        workers = self.start_workers(1)
+        statistics = self.coordinator.wait()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(self.coordinator.reissued_units, 1)
+        self.assert_same_games(statistics)
+
+    def test_unit_that_keeps_losing_its_worker_fails_the_run(self):
+        coordinator = Coordinator(CompareAllMovesSimple(), MoveRandomPiece(), 5,
+                                  ('127.0.0.1', 0), AUTHKEY, unit_size=5, max_attempts=2)
+        coordinator.start()
+        for _ in range(2):
+            with Client(coordinator.address, authkey=AUTHKEY) as connection:
+                connection.recv()
+                self.assertEqual(connection.recv()[0], 'play')
+
+        self.assertRaises(Exception, coordinator.wait)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,39 +1,111 @@
 import multiprocessing as mp
+import random
 import time
-from random import randint
 
+from src.batch_runner import BatchGamePlayer
 from src.colour import Colour
 from src.game import Game
+from src.game_statistics import GameStatistics
+from src.move_cache import CachedStrategy
+from src.result_store import ResultStore, strategy_key
 from src.strategies import Strategy
-from scipy.stats import binom
 
 
 class Experiment:
-    def __init__(self, games_to_play: int, white_strategy: Strategy, black_strategy: Strategy, parallelise: bool = True):
+    def __init__(self, games_to_play: int, white_strategy: Strategy, black_strategy: Strategy, parallelise: bool = True,
+                 store: ResultStore = None, seed=None, paired: bool = False, adjudicator=None, batch_size: int = None):
+        if batch_size is not None and (paired or adjudicator is not None):
+            raise Exception("Batched games cannot be paired or adjudicated")
         self.__games_to_play = games_to_play
-        self.__results = []
+        self.__statistics = GameStatistics()
         self.__elapsed_time = 0
         self.__white_strategy = white_strategy
         self.__black_strategy = black_strategy
         self.__parallelise = parallelise
+        self.__store = store
+        # Stored games can only be reused, and pairs only share dice, if the same
+        # index always plays the same game
+        self.__seed = 0 if seed is None and (store is not None or paired) else seed
+        self.__paired = paired
+        self.__adjudicator = adjudicator
+        # With a batch size each worker interleaves that many games, see src.batch_runner
+        self.__batch_size = batch_size
+        self.__reused_games = 0
 
     def run(self):
         start_time = time.time()
 
-        player = GamePlayer(self.__white_strategy, self.__black_strategy)
-        index_range = range(self.__games_to_play)
+        if self.__batch_size is not None:
+            player = BatchGamePlayer(self.__white_strategy, self.__black_strategy,
+                                     self.__seed if self.__seed is not None else 0, self.__batch_size)
+        else:
+            player = GamePlayer(self.__white_strategy, self.__black_strategy, self.__seed, self.__paired,
+                                self.__adjudicator)
+        self.__statistics = GameStatistics()
+        game_indexes = range(self.__games_to_play)
+
+        if self.__store is not None:
+            seed = 'paired:%s' % self.__seed if self.__paired else self.__seed
+            if self.__adjudicator is not None:
+                # Adjudicated games end differently, so they are stored apart
+                seed = 'adjudicated:%s:%s:%s' % (self.__adjudicator.threshold, self.__adjudicator.verify, seed)
+            if self.__batch_size is not None:
+                seed = 'batched:%s' % seed
+            keys = (strategy_key(self.__white_strategy), strategy_key(self.__black_strategy), seed)
+            played = self.__store.load_games(*keys, self.__games_to_play)
+            if self.__paired:
+                # Half a pair is played again, so both games of a pair are always saved together
+                played = {game_index: game_statistics for game_index, game_statistics in played.items()
+                          if game_index ^ 1 in played or game_index ^ 1 >= self.__games_to_play}
+            self.__statistics.add_games(played, self.__paired)
+            self.__reused_games = len(played)
+            game_indexes = [game_index for game_index in game_indexes if game_index not in played]
+
+            # Each chunk is saved as soon as it is played, so an interrupted run resumes from there
+            play_chunk = player.play_games_individually
+
+            def add_chunk(results):
+                self.__store.save_games(*keys, results)
+                self.__statistics.add_games(dict(results), self.__paired)
+        else:
+            play_chunk = player.play_games
+            add_chunk = self.__statistics.merge
 
         if self.__parallelise:
-            pool = mp.Pool(mp.cpu_count())
-            self.__results = pool.map(player, index_range)
-            pool.close()
+            processes = mp.cpu_count()
+            # Each worker folds a chunk of games into its own accumulator, so
+            # only one GameStatistics per chunk travels back to this process
+            chunk_size = max(1, min(100, len(game_indexes) // (processes * 4)))
+            if self.__paired:
+                chunk_size += chunk_size % 2
+            chunks = [game_indexes[start:start + chunk_size] for start in range(0, len(game_indexes), chunk_size)]
+            with mp.Pool(processes) as pool:
+                for chunk_results in pool.imap_unordered(play_chunk, chunks):
+                    add_chunk(chunk_results)
         else:
-            self.__results = [player.__call__(i) for i in index_range]
+            add_chunk(play_chunk(game_indexes))
+
+        self.__elapsed_time = time.time() - start_time
+
+    def run_distributed(self, address, authkey: bytes, unit_size: int = 100, seed=0):
+        # Workers anywhere on the network connect with src.distributed.run_worker
+        from src.distributed import Coordinator
 
+        start_time = time.time()
+        coordinator = Coordinator(self.__white_strategy, self.__black_strategy, self.__games_to_play,
+                                  address, authkey, unit_size, seed, paired=self.__paired)
+        self.__statistics = coordinator.run()
         self.__elapsed_time = time.time() - start_time
 
     def print_results(self):
-        white_start_count = sum(1 for x in self.__results if x[0] == Colour.WHITE)
+        # scipy is slow to import, so only pay for it when there are results to print
+        from scipy.stats import binom
+
+        if self.__paired:
+            self.__print_paired_results(binom)
+            return
+
+        white_start_count = self.__statistics.counters['white_starts']
         white_win_count = self.get_white_wins()
 
         if white_win_count < 0.5 * self.__games_to_play:
@@ -42,27 +114,116 @@ class Experiment:
             probability = 2 * binom.cdf(self.__games_to_play - white_win_count, self.__games_to_play, 0.5)
 
         print("After %d games" % self.__games_to_play)
+        if self.__reused_games > 0:
+            print("Reused from store: %d" % self.__reused_games)
         print("White starts: %d" % white_start_count)
         print("White wins: %d" % white_win_count)
+        print("Gammons: %d" % self.__statistics.counters['gammons'])
+        print("Backgammons: %d" % self.__statistics.counters['backgammons'])
         print("Time taken: %.2f s" % self.__elapsed_time)
+        self.__print_cache_hit_rate()
+        self.__print_adjudication()
         print("Assuming the strategies are equally as good,",
               "the probability of this discrepancy in wins is %.8f" % probability)
+        self.__statistics.print_distributions()
+
+    def __print_paired_results(self, binom):
+        # Pairs split one game each tell us nothing about the strategies; the rest
+        # are compared with a sign test
+        won_by_white = self.__statistics.counters['pairs_won_by_white_strategy']
+        won_by_black = self.__statistics.counters['pairs_won_by_black_strategy']
+        decided = won_by_white + won_by_black
+        probability = min(1.0, 2 * binom.cdf(min(won_by_white, won_by_black), decided, 0.5)) if decided else 1.0
+
+        print("After %d pairs of games with the same dice" % self.__statistics.counters['pairs'])
+        print("Pairs won twice by the white strategy: %d" % won_by_white)
+        print("Pairs won twice by the black strategy: %d" % won_by_black)
+        print("Pairs split: %d" % (self.__statistics.counters['pairs'] - decided))
+        print("Gammons: %d" % self.__statistics.counters['gammons'])
+        print("Backgammons: %d" % self.__statistics.counters['backgammons'])
+        print("Time taken: %.2f s" % self.__elapsed_time)
+        self.__print_cache_hit_rate()
+        self.__print_adjudication()
+        print("Assuming the strategies are equally as good,",
+              "the probability of this discrepancy in won pairs is %.8f" % probability)
+        self.__statistics.print_distributions()
+
+    def __print_cache_hit_rate(self):
+        hits = self.__statistics.counters['cache_hits']
+        lookups = hits + self.__statistics.counters['cache_misses']
+        if lookups > 0:
+            print("Move cache hit rate: %.1f%% of %d decisions" % (100 * hits / lookups, lookups))
+
+    def __print_adjudication(self):
+        adjudicated = self.__statistics.counters['adjudicated_games']
+        if self.__adjudicator is None or adjudicated == 0:
+            return
+        games = self.__statistics.counters['games']
+        print("Adjudicated: %d (%.1f%%) of %d games" % (adjudicated, 100 * adjudicated / games, games))
+        if self.__adjudicator.verify:
+            print("Adjudication would have flipped %d results and saved %.2f s of play" % (
+                self.__statistics.counters['adjudication_flips'], self.__statistics.counters['adjudication_saved_time']))
 
     def get_white_wins(self):
-        return sum(1 for x in self.__results if x[1] == Colour.WHITE)
+        return self.__statistics.counters['white_wins']
+
+    def get_statistics(self):
+        return self.__statistics
+
+    def get_reused_games(self):
+        return self.__reused_games
 
 
 class GamePlayer:
-    def __init__(self, white_strategy, black_strategy):
+    def __init__(self, white_strategy, black_strategy, seed=None, paired: bool = False, adjudicator=None):
         self.__white_strategy = white_strategy
         self.__black_strategy = black_strategy
+        self.__seed = seed
+        self.__paired = paired
+        self.__adjudicator = adjudicator
 
     def __call__(self, game_index):
         print(".", end="")
-        game = Game(
-            white_strategy=self.__white_strategy,
-            black_strategy=self.__black_strategy,
-            first_player=Colour(randint(0, 1))
-        )
+        if self.__seed is not None:
+            # The same game is played for the same index, whichever process plays it
+            random.seed("%s:%d" % (self.__seed, game_index))
+        if not self.__paired:
+            game = Game(
+                white_strategy=self.__white_strategy,
+                black_strategy=self.__black_strategy,
+                first_player=Colour(random.randint(0, 1)),
+                adjudicator=self.__adjudicator
+            )
+        else:
+            # Both games of a pair roll the same dice, with the strategies swapping colours
+            dice = random.Random("%s:pair:%d" % (self.__seed, game_index // 2))
+            swapped = game_index % 2 == 1
+            game = Game(
+                white_strategy=self.__black_strategy if swapped else self.__white_strategy,
+                black_strategy=self.__white_strategy if swapped else self.__black_strategy,
+                first_player=Colour(dice.randint(0, 1)),
+                rng=dice,
+                adjudicator=self.__adjudicator
+            )
+        cached_strategies = {id(strategy): strategy for strategy in (self.__white_strategy, self.__black_strategy)
+                             if isinstance(strategy, CachedStrategy)}.values()
+        hits_before = sum(strategy.hits for strategy in cached_strategies)
+        misses_before = sum(strategy.misses for strategy in cached_strategies)
         game.run_game(verbose=False)
-        return game.who_started(), game.who_won()
+        game_statistics = game.get_statistics()
+        if cached_strategies:
+            game_statistics['cache_hits'] = sum(strategy.hits for strategy in cached_strategies) - hits_before
+            game_statistics['cache_misses'] = sum(strategy.misses for strategy in cached_strategies) - misses_before
+        return game_statistics
+
+    def play_games(self, game_indexes):
+        statistics = GameStatistics()
+        if self.__paired:
+            statistics.add_games(dict(self.play_games_individually(game_indexes)), paired=True)
+        else:
+            for game_index in game_indexes:
+                statistics.add(self(game_index))
+        return statistics
+
+    def play_games_individually(self, game_indexes):
+        return [(game_index, self(game_index)) for game_index in game_indexes]
@@ -0,0 +1,34 @@
+import unittest
+
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.experiment import Experiment, GamePlayer
+from src.strategies import MoveRandomPiece
+
+
+class TestExperiment(unittest.TestCase):
+
+    def test_seeded_games_are_repeatable(self):
+        player = GamePlayer(CompareAllMovesSimple(), MoveRandomPiece(), seed='test')
+
+        self.assertEqual(player(3)['turns'], player(3)['turns'])
+
+    def test_paired_games_with_the_same_strategy_are_always_split(self):
+        experiment = Experiment(12, CompareAllMovesSimple(), CompareAllMovesSimple(), parallelise=False, paired=True)
+        experiment.run()
+        counters = experiment.get_statistics().counters
+
+        self.assertEqual(counters['games'], 12)
+        self.assertEqual(counters['pairs'], 6)
+        self.assertEqual(counters['pairs_won_by_white_strategy'], 0)
+        self.assertEqual(counters['pairs_won_by_black_strategy'], 0)
+
+    def test_paired_games_favour_the_stronger_strategy(self):
+        experiment = Experiment(12, CompareAllMovesSimple(), MoveRandomPiece(), parallelise=False, paired=True)
+        experiment.run()
+        counters = experiment.get_statistics().counters
+
+        self.assertGreater(counters['pairs_won_by_white_strategy'], counters['pairs_won_by_black_strategy'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,33 @@
 import json
-from random import randint
+import random
+import time
 from src.board import Board
 from src.colour import Colour
+from src.game_observer import GameObserver
+from src.legal_plays import LegalPlayTable
 from src.strategies import Strategy, HumanStrategy
 from src.move_not_possible_exception import MoveNotPossibleException
 
+def roll_dice(no_doubles=False, rng=random):
+    dice_roll = [rng.randint(1, 6), rng.randint(1, 6)]
+    while no_doubles and dice_roll[0] == dice_roll[1]:
+        dice_roll = [rng.randint(1, 6), rng.randint(1, 6)]
+    if dice_roll[0] == dice_roll[1]:
+        dice_roll = [dice_roll[0]] * 4
+    return dice_roll
+
+
 class ReadOnlyBoard:
     board: Board
 
     def __init__(self, board):
         self.board = board
+        # Bind the board's query methods once so strategies do not go through __getattr__
+        for name in ('is_move_possible', 'get_movable_mask', 'get_occupied_mask', 'get_blocked_mask',
+                     'no_moves_possible', 'can_move_off', 'destination_for', 'can_land_on', 'pieces_at',
+                     'get_piece_at', 'get_pieces', 'get_taken_pieces', 'get_counts', 'has_game_ended', 'is_race',
+                     'who_won', 'get_win_type', 'pip_count', 'position_key', 'create_copy', 'print_board', 'to_json'):
+            setattr(self, name, getattr(board, name))
 
     def __getattr__(self, name):
         if hasattr(self.board, name) and callable(getattr(self.board, name)):
@@ -26,14 +44,33 @@ class ReadOnlyBoard:
         raise Exception("Do not try and change the board directly, use the make_move parameter instead")
 
 class Game:
-    def __init__(self, white_strategy: Strategy, black_strategy: Strategy, first_player: Colour, show_computer_roll: bool = False):
+    def __init__(self, white_strategy: Strategy, black_strategy: Strategy, first_player: Colour, show_computer_roll: bool = False,
+                 rng: random.Random = None, adjudicator=None):
         self.board = Board.create_starting_board()
+        self.read_only_board = ReadOnlyBoard(self.board)
         self.first_player = first_player
         self.strategies = {
             Colour.WHITE: white_strategy,
             Colour.BLACK: black_strategy
         }
         self.show_computer_roll = show_computer_roll
+        # Dice come from their own generator when given one, so strategies that use
+        # the random module do not change the rolls
+        self.rng = rng if rng is not None else random
+        self.turns = 0
+        self.hits = {Colour.WHITE: 0, Colour.BLACK: 0}
+        self.doubles = {Colour.WHITE: 0, Colour.BLACK: 0}
+        self.time_taken = {Colour.WHITE: 0.0, Colour.BLACK: 0.0}
+        self.observers = []
+        # An src.adjudicator.Adjudicator can end the game early once the race is decided
+        self.adjudicator = adjudicator
+        self.adjudicated_winner = None
+        self.__adjudication_time = None
+        self.__adjudication_saved_time = 0.0
+        self.__ended_by_adjudication = False
+
+    def add_observer(self, observer: GameObserver):
+        self.observers.append(observer)
 
     def run_game(self, verbose=True):
         if verbose:
@@ -44,44 +81,55 @@ class Game:
         full_dice_roll = []
         while True:
             previous_dice_roll = full_dice_roll.copy()
-            dice_roll = [randint(1, 6), randint(1, 6)]
-            if i == self.first_player.value:
-                while dice_roll[0] == dice_roll[1]:
-                    dice_roll = [randint(1, 6), randint(1, 6)]
-            if dice_roll[0] == dice_roll[1]:
-                dice_roll = [dice_roll[0]] * 4
+            dice_roll = roll_dice(no_doubles=i == self.first_player.value, rng=self.rng)
             full_dice_roll = dice_roll.copy()
 
             # Predict opponent's next roll
-            next_roll = [randint(1, 6), randint(1, 6)]
-            if next_roll[0] == next_roll[1]:
-                next_roll = [next_roll[0]] * 4
+            next_roll = roll_dice(rng=self.rng)
 
             colour = Colour(i % 2)
+            for observer in self.observers:
+                observer.on_turn_start(self, colour)
+                observer.on_dice_rolled(self, colour, dice_roll)
             if verbose:
                 print("%s rolled %s" % (colour, dice_roll))
+            self.turns += 1
+            if len(dice_roll) == 4:
+                self.doubles[colour] += 1
+
+            opponent_taken_location = 25 if colour == Colour.WHITE else 0
+            # People are held to the rules on how many dice to use; the computer's moves are only checked one by one
+            legal_plays = LegalPlayTable(self.board, colour, dice_roll) \
+                if isinstance(self.strategies[colour], HumanStrategy) else None
 
             def handle_move(location, die_roll):
-                rolls_to_move = self.get_rolls_to_move(location, die_roll, dice_roll)
+                if legal_plays is not None:
+                    rolls_to_move = legal_plays.move(location, die_roll)
+                else:
+                    rolls_to_move = self.get_rolls_to_move(location, die_roll, dice_roll)
                 if rolls_to_move is None:
                     raise MoveNotPossibleException("You cannot move that piece %d" % die_roll)
                 for roll in rolls_to_move:
                     piece = self.board.get_piece_at(location)
                     original_location = location
+                    taken_before = self.board.get_counts(colour.other())[opponent_taken_location]
                     location = self.board.move_piece(piece, roll)
+                    if self.board.get_counts(colour.other())[opponent_taken_location] > taken_before:
+                        self.hits[colour] += 1
                     dice_roll.remove(roll)
-                    moves.append({'start_location': original_location, 'die_roll': roll, 'end_location': location})
+                    move = {'start_location': original_location, 'die_roll': roll, 'end_location': location}
+                    moves.append(move)
                     previous_dice_roll.append(roll)
+                    for observer in self.observers:
+                        observer.on_move(self, colour, move)
                 return rolls_to_move
 
-            board_snapshot = self.board.to_json()
-            dice_roll_snapshot = dice_roll.copy()
-
             opponents_moves = moves.copy()
             moves.clear()
 
+            start_time = time.perf_counter()
             self.strategies[colour].move(
-                ReadOnlyBoard(self.board),
+                self.read_only_board,
                 colour,
                 dice_roll.copy(),
                 lambda location, die_roll: handle_move(location, die_roll),
@@ -91,13 +139,25 @@ class Game:
                     'next_opponent_roll': next_roll
                 }
             )
+            self.time_taken[colour] += time.perf_counter() - start_time
+            for observer in self.observers:
+                observer.on_turn_end(self, colour)
 
             if verbose:
                 self.board.print_board()
             i = i + 1
-            if self.board.has_game_ended():
+            if not self.board.has_game_ended() and self.adjudicator is not None and self.adjudicated_winner is None:
+                self.adjudicated_winner = self.adjudicator.adjudicate(self.board, Colour(i % 2))
+                if self.adjudicated_winner is not None:
+                    self.__adjudication_time = time.perf_counter()
+                    self.__ended_by_adjudication = not self.adjudicator.verify
+            if self.board.has_game_ended() or self.__ended_by_adjudication:
+                if self.adjudicated_winner is not None and not self.__ended_by_adjudication:
+                    self.__adjudication_saved_time = time.perf_counter() - self.__adjudication_time
                 if verbose:
-                    print('%s has won!' % self.board.who_won())
+                    print('%s has won!' % self.who_won())
+                for observer in self.observers:
+                    observer.on_game_over(self, self.who_won())
                 self.strategies[colour.other()].game_over({
                     'dice_roll': full_dice_roll,
                     'opponents_move': moves
@@ -133,4 +193,30 @@ class Game:
         return self.first_player
 
     def who_won(self):
+        if self.__ended_by_adjudication:
+            return self.adjudicated_winner
         return self.board.who_won()
+
+    def get_statistics(self):
+        winner = self.who_won()
+        statistics = {
+            'who_started': self.first_player,
+            'who_won': winner,
+            # Only single games are adjudicated
+            'win_type': 1 if self.__ended_by_adjudication else self.board.get_win_type(),
+            'turns': self.turns,
+            'loser_pip_count': self.board.pip_count(winner.other()),
+            'white_hits': self.hits[Colour.WHITE],
+            'black_hits': self.hits[Colour.BLACK],
+            'white_doubles': self.doubles[Colour.WHITE],
+            'black_doubles': self.doubles[Colour.BLACK],
+            'white_time': self.time_taken[Colour.WHITE],
+            'black_time': self.time_taken[Colour.BLACK],
+        }
+        if self.adjudicated_winner is not None:
+            statistics['adjudicated_games'] = 1
+            if not self.__ended_by_adjudication:
+                # Verifying: the game was played out anyway
+                statistics['adjudication_flips'] = int(self.adjudicated_winner != winner)
+                statistics['adjudication_saved_time'] = self.__adjudication_saved_time
+        return statistics
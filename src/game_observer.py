@@ -0,0 +1,32 @@
+class GameObserver:
+    # Subscribers override only the events they need; a game without observers
+    # does no extra work per turn
+    def on_turn_start(self, game, colour):
+        pass
+
+    def on_dice_rolled(self, game, colour, dice_roll):
+        pass
+
+    def on_move(self, game, colour, move):
+        pass
+
+    def on_turn_end(self, game, colour):
+        pass
+
+    def on_game_over(self, game, winner):
+        pass
+
+
+class GameRecorder(GameObserver):
+    # Keeps every turn with the board as JSON after it, e.g. for replaying a game
+    def __init__(self):
+        self.turns = []
+
+    def on_dice_rolled(self, game, colour, dice_roll):
+        self.turns.append({'colour': colour, 'dice_roll': dice_roll.copy(), 'moves': []})
+
+    def on_move(self, game, colour, move):
+        self.turns[-1]['moves'].append(move)
+
+    def on_turn_end(self, game, colour):
+        self.turns[-1]['board'] = game.board.to_json()
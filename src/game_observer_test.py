@@ -0,0 +1,59 @@
+import json
+import unittest
+
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.game import Game
+from src.game_observer import GameObserver, GameRecorder
+
+
+class EventCounter(GameObserver):
+    def __init__(self):
+        self.events = {'turn_start': 0, 'dice_rolled': 0, 'move': 0, 'turn_end': 0, 'game_over': []}
+
+    def on_turn_start(self, game, colour):
+        self.events['turn_start'] += 1
+
+    def on_dice_rolled(self, game, colour, dice_roll):
+        self.events['dice_rolled'] += 1
+
+    def on_move(self, game, colour, move):
+        self.events['move'] += 1
+
+    def on_turn_end(self, game, colour):
+        self.events['turn_end'] += 1
+
+    def on_game_over(self, game, winner):
+        self.events['game_over'].append(winner)
+
+
+class TestGameObserver(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(CompareAllMovesSimple(), CompareAllMovesSimple(), Colour.WHITE)
+
+    def test_observers_see_every_turn(self):
+        counter = EventCounter()
+        self.game.add_observer(counter)
+        self.game.run_game(verbose=False)
+
+        self.assertEqual(counter.events['turn_start'], self.game.turns)
+        self.assertEqual(counter.events['dice_rolled'], self.game.turns)
+        self.assertEqual(counter.events['turn_end'], self.game.turns)
+        self.assertGreater(counter.events['move'], self.game.turns)
+        self.assertEqual(counter.events['game_over'], [self.game.who_won()])
+
+    def test_recorder_keeps_moves_and_boards(self):
+        recorder = GameRecorder()
+        self.game.add_observer(recorder)
+        self.game.run_game(verbose=False)
+
+        self.assertEqual(len(recorder.turns), self.game.turns)
+        self.assertEqual(recorder.turns[0]['colour'], Colour.WHITE)
+        self.assertEqual(recorder.turns[1]['colour'], Colour.BLACK)
+        self.assertEqual(len(recorder.turns[0]['moves']), 2)
+        self.assertEqual(json.loads(recorder.turns[-1]['board']), json.loads(self.game.board.to_json()))
+
+
+if __name__ == '__main__':
+    unittest.main()
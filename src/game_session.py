@@ -0,0 +1,298 @@
+import json
+from random import randint
+
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple, \
+    CompareAllMovesWeightingDistanceAndSingles, \
+    CompareAllMovesWeightingDistanceAndSinglesWithEndGame, \
+    CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.game import Game, ReadOnlyBoard, roll_dice
+from src.hint import HintProvider
+from src.legal_plays import LegalPlayTable
+from src.move_cache import MoveCache, cache_if_possible
+from src.move_not_possible_exception import MoveNotPossibleException
+from src.opening_book import OpeningBookStrategy
+from src.root_split import RootSplitStrategy
+from src.speculation import Speculator, SpeculativeReplies
+from src.strategies import MoveFurthestBackStrategy
+
+# How many board versions a delta client can fall behind before it is sent a snapshot
+DELTA_HISTORY = 64
+
+
+def create_opponent(difficulty, move_cache: MoveCache = None, search_executor=None):
+    # With a search executor the hard levels search big (double) rolls on its worker processes
+    def split(strategy):
+        return RootSplitStrategy(strategy, search_executor) if search_executor is not None else strategy
+
+    if difficulty == 'veryeasy':
+        return MoveFurthestBackStrategy()
+    elif difficulty == 'easy':
+        strategy = CompareAllMovesSimple()
+    elif difficulty == 'medium':
+        strategy = CompareAllMovesWeightingDistanceAndSingles()
+    elif difficulty == 'hard':
+        strategy = split(CompareAllMovesWeightingDistanceAndSinglesWithEndGame())
+    elif difficulty == 'veryhard':
+        strategy = OpeningBookStrategy(split(CompareAllMovesWeightingDistanceAndSinglesWithEndGame2()))
+    else:
+        raise Exception('Not a valid strategy')
+    return cache_if_possible(strategy, move_cache) if move_cache is not None else strategy
+
+
+def choose_opponent_moves(strategy, board, colour, dice_roll):
+    # Runs the (CPU bound) strategy on a private copy of the board, so it can be
+    # sent to another process; the moves are replayed on the real board afterwards
+    board = board.create_copy()
+    moves = []
+
+    def make_move(location, die_roll):
+        piece = board.get_piece_at(location)
+        if piece is None or piece.colour != colour or die_roll not in dice_roll:
+            raise MoveNotPossibleException("You cannot move that piece %d" % die_roll)
+        if not board.is_move_possible(piece, die_roll):
+            raise MoveNotPossibleException("You cannot move that piece %d" % die_roll)
+        end_location = board.move_piece(piece, die_roll)
+        dice_roll.remove(die_roll)
+        moves.append({'start_location': location, 'die_roll': die_roll, 'end_location': end_location})
+        return [die_roll]
+
+    # Strategies may break ties between equal plays by the order of the dice, so
+    # they are always given low-high and a speculated reply is the one searched on demand
+    strategy.move(ReadOnlyBoard(board), colour, sorted(dice_roll), make_move, {})
+    return moves
+
+
+class GameSession:
+    # One web game: the human plays white and the computer plays black. The
+    # session only changes state when asked to, so it can be driven by a
+    # request handler without a thread of its own per game
+    def __init__(self, opponent_strategy, first_player: Colour = None, speculator: Speculator = None,
+                 hints: HintProvider = None):
+        self.opponent_strategy = opponent_strategy
+        self.hints = hints
+        self.__replies = SpeculativeReplies(speculator, opponent_strategy, Colour.BLACK) if speculator else None
+        self.__predictor = CompareAllMovesSimple()
+        self.game = Game(
+            white_strategy=None,
+            black_strategy=opponent_strategy,
+            first_player=first_player if first_player is not None else Colour(randint(0, 1))
+        )
+        self.board = self.game.board
+        self.dice_roll = []
+        self.used_rolls = []
+        self.opponent_dice_roll = []
+        self.board_after_your_last_turn = self.board.to_json()
+        self.__waiting_for_opponent = self.game.first_player == Colour.BLACK
+        # Every change to the board is a new version; the locations each one
+        # changed (with what they held before) are kept so delta clients only
+        # need the points that moved
+        self.version = 0
+        self.__changes = []
+        self.__legal_plays = None
+        self.__legal_plays_dice = None
+
+    def is_waiting_for_opponent(self):
+        return self.__waiting_for_opponent and not self.board.has_game_ended()
+
+    def get_opponent_request(self):
+        if not self.dice_roll and not self.opponent_dice_roll:
+            self.opponent_dice_roll = roll_dice(no_doubles=True)
+        else:
+            self.opponent_dice_roll = roll_dice()
+        return self.opponent_strategy, self.board, Colour.BLACK, self.opponent_dice_roll.copy()
+
+    def apply_opponent_moves(self, moves):
+        board_json_before_opp_move = self.board_after_your_last_turn
+        opponents_move = []
+        for move in moves:
+            self.__move_piece(move['start_location'], move['die_roll'])
+            opponents_move.append(dict(move, changes=self.__points_to_json(self.__changes[-1])))
+        self.__waiting_for_opponent = False
+
+        if not self.board.has_game_ended():
+            self.__start_turn(no_doubles=False)
+        return {
+            'result': 'success',
+            'opponents_activity': {
+                'opponents_move': opponents_move,
+                'dice_roll': self.opponent_dice_roll,
+            },
+            'board_after_your_last_turn': board_json_before_opp_move,
+        }
+
+    def play_opponent_turn(self):
+        request = self.get_opponent_request()
+        speculated_reply = self.take_speculated_reply()
+        if speculated_reply is not None:
+            return self.apply_opponent_moves(speculated_reply.result())
+        return self.apply_opponent_moves(choose_opponent_moves(*request))
+
+    def take_speculated_reply(self):
+        # Must be called after get_opponent_request, once the opponent's dice are known
+        if self.__replies is None:
+            return None
+        return self.__replies.take(self.board, self.opponent_dice_roll)
+
+    def predict_board_after_turn(self):
+        board = self.board.create_copy()
+        moves_left = self.get_moves_left()
+        if moves_left and not board.no_moves_possible(Colour.WHITE, moves_left):
+            self.__predictor.move(board, Colour.WHITE, moves_left, board.get_move_lambda(), {})
+        return board
+
+    def start(self):
+        if self.is_waiting_for_opponent():
+            return None
+        self.__start_turn(no_doubles=True)
+        return {
+            'result': 'success',
+            'opponents_activity': {'opponents_move': [], 'dice_roll': []},
+            'board_after_your_last_turn': self.board_after_your_last_turn,
+        }
+
+    def move_piece(self, location, die_roll):
+        # Returns None when the move ended the turn and the opponent has to move next
+        if self.is_waiting_for_opponent() or self.board.has_game_ended():
+            return {'result': 'move_failed'}
+        rolls_to_move = self.get_legal_plays().move(location, die_roll)
+        if rolls_to_move is None:
+            return {'result': 'move_failed'}
+
+        for roll in rolls_to_move:
+            location = self.__move_piece(location, roll)
+            self.used_rolls.append(roll)
+
+        if self.board.has_game_ended():
+            return {'result': 'success'}
+        if self.get_legal_plays().can_move():
+            self.__speculate()
+            return {'result': 'success'}
+        return self.end_turn()
+
+    def get_hint(self, count=3):
+        # The best plays of the dice the human has left, from the current board
+        moves_left = self.get_moves_left()
+        if self.hints is None or self.is_waiting_for_opponent() or self.board.has_game_ended():
+            return {'plays': [], 'complete': True, 'dice_roll': moves_left}
+        return dict(self.hints.hint(self.board, Colour.WHITE, moves_left, count), dice_roll=moves_left)
+
+    def end_turn(self):
+        # Only once no legal move is left, so every die that can be played is
+        if self.is_waiting_for_opponent() or self.board.has_game_ended() or self.get_legal_plays().can_move():
+            return {'result': 'move_failed'}
+        self.board_after_your_last_turn = self.board.to_json()
+        self.__waiting_for_opponent = True
+        return None
+
+    def get_legal_plays(self):
+        # Worked out when the turn starts; again only if the dice were changed
+        if self.__legal_plays is None or self.__legal_plays_dice != self.dice_roll:
+            self.__legal_plays = LegalPlayTable(self.board, Colour.WHITE, self.get_moves_left())
+            self.__legal_plays_dice = list(self.dice_roll)
+        return self.__legal_plays
+
+    def get_moves_left(self):
+        moves_left = self.dice_roll.copy()
+        for used_move in self.used_rolls:
+            moves_left.remove(used_move)
+        return moves_left
+
+    def get_state(self, response={}, delta=False, since_version=None):
+        # With delta, the board is only sent as the points that changed since the
+        # client's version (and each opponent move as the points it changed),
+        # unless the client has no version or has fallen too far behind
+        state = {'version': self.version,
+                 'dice_roll': self.dice_roll,
+                 'used_rolls': self.used_rolls,
+                 'player_can_move': self.get_legal_plays().can_move()}
+        if self.board.has_game_ended():
+            state['winner'] = str(self.board.who_won())
+        if 'opponents_activity' in response:
+            # dict, keys: start_location, die_roll, end_location
+            opponents_activity = response['opponents_activity']
+            if delta:
+                state['opp_move'] = opponents_activity['opponents_move']
+            else:
+                state['opp_move'] = self.__with_boards_after_moves(response['board_after_your_last_turn'],
+                                                                   opponents_activity['opponents_move'])
+            state['opp_roll'] = opponents_activity['dice_roll']
+        if 'board_after_your_last_turn' in response and not delta:
+            state['board_after_your_last_turn'] = response['board_after_your_last_turn']
+        changed = self.__changed_since(since_version) if delta else None
+        if changed is None:
+            state['board'] = self.board.to_json()
+        else:
+            state['changes'] = self.__points_to_json(changed)
+        if 'result' in response:
+            state['result'] = response['result']
+        return state
+
+    def respond(self, response, delta=False, since_version=None):
+        # Lets the computer reply in this thread when the human's turn is over
+        if response is None:
+            response = self.play_opponent_turn()
+        return self.get_state(response, delta, since_version)
+
+    def __move_piece(self, location, die_roll):
+        counts_before = self.board.position_key()
+        end_location = self.board.move_piece(self.board.get_piece_at(location), die_roll)
+        counts_after = self.board.position_key()
+        self.__changes.append({location: (counts_before[0][location], counts_before[1][location])
+                               for location in range(26)
+                               if counts_before[0][location] != counts_after[0][location]
+                               or counts_before[1][location] != counts_after[1][location]})
+        del self.__changes[:-DELTA_HISTORY]
+        self.version += 1
+        return end_location
+
+    def __changed_since(self, since_version):
+        # None when the changes since that version are no longer known. A point
+        # that was changed back to what it held then has not changed
+        if since_version is None or not self.version - len(self.__changes) <= since_version <= self.version:
+            return None
+        counts_then = {}
+        for counts_before in self.__changes[len(self.__changes) - (self.version - since_version):]:
+            for location, counts in counts_before.items():
+                counts_then.setdefault(location, counts)
+        counts_now = self.board.position_key()
+        return {location for location, counts in counts_then.items()
+                if counts != (counts_now[0][location], counts_now[1][location])}
+
+    def __points_to_json(self, locations):
+        return {location: self.board.point_to_json(location) for location in sorted(locations)}
+
+    @staticmethod
+    def __with_boards_after_moves(board_json, opponents_move):
+        # Rebuilds the full board after each move from the points it changed
+        points = {int(location): point for location, point in json.loads(board_json).items()}
+        moves = []
+        for move in opponents_move:
+            for location, point in move['changes'].items():
+                if point is None:
+                    points.pop(location, None)
+                else:
+                    points[location] = point
+            moves.append({'start_location': move['start_location'], 'die_roll': move['die_roll'],
+                          'end_location': move['end_location'],
+                          'board_after_move': json.dumps({location: points[location] for location in sorted(points)})})
+        return moves
+
+    def __start_turn(self, no_doubles):
+        self.dice_roll = roll_dice(no_doubles=no_doubles)
+        self.used_rolls = []
+        self.__legal_plays = None
+        self.get_legal_plays()
+        if self.hints is not None:
+            self.hints.precompute(self.board, Colour.WHITE, self.dice_roll)
+        self.__speculate()
+
+    def __speculate(self):
+        # Start searching the computer's replies while the human is still thinking
+        if self.__replies is not None:
+            self.__replies.predict(self.predict_board_after_turn(), choose_opponent_moves)
+
+    @staticmethod
+    def get_empty_state():
+        return {'board': "{}", 'dice_roll': [], 'used_rolls': []}
+
@@ -0,0 +1,123 @@
+import json
+import random
+import unittest
+
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.game_session import GameSession
+from src.play_generator import generate_plays
+
+
+class TestGameSession(unittest.TestCase):
+
+    @staticmethod
+    def play_turn(session):
+        # Plays the human's dice; None once the turn is over
+        response = None
+        for move in generate_plays(session.board, Colour.WHITE, session.get_moves_left())[0]['moves']:
+            response = session.move_piece(move['piece_at'], move['die_roll'])
+        return response
+
+    def test_human_starts_with_a_roll(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+
+        state = session.respond(session.start())
+
+        self.assertEqual(state['result'], 'success')
+        self.assertEqual(len(state['dice_roll']), 2)
+        self.assertNotEqual(state['dice_roll'][0], state['dice_roll'][1])
+        self.assertEqual(state['opp_move'], [])
+        self.assertTrue(state['player_can_move'])
+
+    def test_computer_starts_first(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.BLACK)
+
+        self.assertIsNone(session.start())
+        state = session.respond(None)
+
+        self.assertEqual(len(state['opp_roll']), 2)
+        self.assertEqual(len(state['opp_move']), 2)
+        self.assertEqual(state['opp_move'][-1]['board_after_move'], state['board'])
+        self.assertEqual(state['used_rolls'], [])
+
+    def test_invalid_move_fails(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+        session.start()
+
+        self.assertEqual(session.move_piece(6, session.dice_roll[0]), {'result': 'move_failed'})
+        self.assertEqual(session.move_piece(3, session.dice_roll[0]), {'result': 'move_failed'})
+
+    def test_end_turn_is_refused_while_dice_can_be_played(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+        session.start()
+        session.dice_roll = [6, 5]
+
+        self.assertEqual(session.end_turn(), {'result': 'move_failed'})
+        self.assertEqual(session.move_piece(1, 6), {'result': 'success'})
+        self.assertEqual(session.end_turn(), {'result': 'move_failed'})
+        self.assertFalse(session.is_waiting_for_opponent())
+
+    def test_playing_the_turn_lets_the_computer_move(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+        session.start()
+
+        self.assertIsNone(self.play_turn(session))
+        starting_board = session.board.to_json()
+        state = session.respond(None)
+
+        self.assertEqual(state['board_after_your_last_turn'], starting_board)
+        self.assertNotEqual(json.loads(state['board']), json.loads(starting_board))
+
+    def test_using_all_dice_ends_the_turn(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+        session.start()
+        session.dice_roll = [6, 5]
+
+        self.assertEqual(session.move_piece(1, 6), {'result': 'success'})
+        self.assertEqual(session.used_rolls, [6])
+        self.assertIsNone(session.move_piece(12, 5))
+
+    def test_delta_changes_rebuild_the_board(self):
+        random.seed(3)
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+        session.respond(session.start(), delta=True)
+        self.play_turn(session)
+        points = {int(location): point for location, point in json.loads(session.board.to_json()).items()}
+        version = session.version
+
+        state = session.respond(None, delta=True, since_version=version)
+        for move in state['opp_move']:
+            self.assertNotIn('board_after_move', move)
+        for location, point in state['changes'].items():
+            if point is None:
+                points.pop(location, None)
+            else:
+                points[location] = point
+
+        self.assertNotIn('board', state)
+        self.assertEqual(state['version'], version + len(state['opp_move']))
+        self.assertEqual(points, {int(location): point for location, point in json.loads(session.board.to_json()).items()})
+
+    def test_delta_changes_leave_out_points_changed_back(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+        session.start()
+        session.dice_roll = [2, 5]
+        version = session.version
+        session.move_piece(12, 2)
+        session.move_piece(14, 5)
+
+        self.assertEqual(set(session.get_state({}, delta=True, since_version=version)['changes']), {12, 19})
+
+    def test_delta_client_too_far_behind_gets_a_snapshot(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+        session.start()
+        self.play_turn(session)
+        session.respond(None)
+
+        self.assertIn('changes', session.get_state({}, delta=True, since_version=session.version - 1))
+        self.assertIn('board', session.get_state({}, delta=True, since_version=session.version + 1))
+        self.assertIn('board', session.get_state({}, delta=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
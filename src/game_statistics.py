@@ -0,0 +1,150 @@
+import math
+
+from src.colour import Colour
+
+
+class RunningStatistic:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.__sum_squared_deviations = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.__sum_squared_deviations += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.__sum_squared_deviations += other.__sum_squared_deviations + \
+            delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+    def variance(self):
+        if self.count < 2:
+            return 0.0
+        return self.__sum_squared_deviations / (self.count - 1)
+
+    def standard_deviation(self):
+        return math.sqrt(self.variance())
+
+
+class QuantileSketch:
+    # Log-bucketed histogram of non-negative values: every quantile is within
+    # relative_accuracy of the true value and the number of buckets only
+    # depends on the range of the values, not on how many were added
+    def __init__(self, relative_accuracy=0.01):
+        self.__gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__buckets = {}
+        self.__zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.__zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.__log_gamma)
+        self.__buckets[index] = self.__buckets.get(index, 0) + 1
+
+    def merge(self, other):
+        if other.__gamma != self.__gamma:
+            raise Exception("Cannot merge sketches with different accuracies")
+        self.count += other.count
+        self.__zero_count += other.__zero_count
+        for index, count in other.__buckets.items():
+            self.__buckets[index] = self.__buckets.get(index, 0) + count
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.__zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.__buckets):
+            seen += self.__buckets[index]
+            if rank < seen:
+                return 2 * self.__gamma ** index / (self.__gamma + 1)
+        return 2 * self.__gamma ** max(self.__buckets) / (self.__gamma + 1)
+
+
+class GameStatistics:
+    # In paired games the white strategy plays white in the first game of each
+    # pair and black in the second, with the same dice
+    COUNTERS = ('games', 'white_starts', 'white_wins', 'gammons', 'backgammons',
+                'pairs', 'pairs_won_by_white_strategy', 'pairs_won_by_black_strategy',
+                'cache_hits', 'cache_misses', 'adjudicated_games', 'adjudication_flips', 'adjudication_saved_time')
+    METRICS = ('turns', 'loser_pip_count', 'white_hits', 'black_hits',
+               'white_doubles', 'black_doubles', 'white_time', 'black_time')
+
+    def __init__(self):
+        self.counters = {name: 0 for name in GameStatistics.COUNTERS}
+        self.metrics = {name: RunningStatistic() for name in GameStatistics.METRICS}
+        self.sketches = {name: QuantileSketch() for name in GameStatistics.METRICS}
+
+    def add(self, game_statistics):
+        self.counters['games'] += 1
+        if game_statistics['who_started'] == Colour.WHITE:
+            self.counters['white_starts'] += 1
+        if game_statistics['who_won'] == Colour.WHITE:
+            self.counters['white_wins'] += 1
+        if game_statistics['win_type'] == 2:
+            self.counters['gammons'] += 1
+        elif game_statistics['win_type'] == 3:
+            self.counters['backgammons'] += 1
+        # Only games with a move cache or an adjudicator report these
+        for name in ('cache_hits', 'cache_misses', 'adjudicated_games', 'adjudication_flips', 'adjudication_saved_time'):
+            self.counters[name] += game_statistics.get(name, 0)
+        for name in GameStatistics.METRICS:
+            self.metrics[name].add(game_statistics[name])
+            self.sketches[name].add(game_statistics[name])
+
+    def add_pair(self, first, second):
+        self.add(first)
+        self.add(second)
+        self.counters['pairs'] += 1
+        if first['who_won'] == Colour.WHITE and second['who_won'] == Colour.BLACK:
+            self.counters['pairs_won_by_white_strategy'] += 1
+        elif first['who_won'] == Colour.BLACK and second['who_won'] == Colour.WHITE:
+            self.counters['pairs_won_by_black_strategy'] += 1
+
+    def add_games(self, results, paired=False):
+        # results maps game index to statistics; when paired, games 2n and 2n + 1 are a pair
+        for game_index in sorted(results):
+            if not paired:
+                self.add(results[game_index])
+            elif game_index % 2 == 0 and game_index + 1 in results:
+                self.add_pair(results[game_index], results[game_index + 1])
+            elif game_index % 2 == 0 or game_index - 1 not in results:
+                self.add(results[game_index])
+
+    def merge(self, other):
+        for name in GameStatistics.COUNTERS:
+            self.counters[name] += other.counters[name]
+        for name in GameStatistics.METRICS:
+            self.metrics[name].merge(other.metrics[name])
+            self.sketches[name].merge(other.sketches[name])
+
+    def print_distributions(self):
+        print("%-16s %10s %10s %10s %10s %10s" % ('', 'mean', 'std dev', 'median', '90%', 'max'))
+        for name in GameStatistics.METRICS:
+            metric = self.metrics[name]
+            if metric.count == 0:
+                continue
+            sketch = self.sketches[name]
+            print("%-16s %10.3f %10.3f %10.3f %10.3f %10.3f" % (
+                name, metric.mean, metric.standard_deviation(),
+                sketch.quantile(0.5), sketch.quantile(0.9), metric.maximum))
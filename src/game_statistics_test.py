@@ -0,0 +1,98 @@
+import random
+import statistics
+import unittest
+
+from src.colour import Colour
+from src.game_statistics import RunningStatistic, QuantileSketch, GameStatistics
+
+
+class TestRunningStatistic(unittest.TestCase):
+
+    def test_mean_and_variance(self):
+        running = RunningStatistic()
+        for value in [2, 4, 4, 4, 5, 5, 7, 9]:
+            running.add(value)
+
+        self.assertAlmostEqual(running.mean, 5)
+        self.assertAlmostEqual(running.variance(), statistics.variance([2, 4, 4, 4, 5, 5, 7, 9]))
+        self.assertEqual((running.minimum, running.maximum), (2, 9))
+
+    def test_merge_matches_single_pass(self):
+        values = [random.random() * 100 for _ in range(200)]
+        left, right, combined = RunningStatistic(), RunningStatistic(), RunningStatistic()
+        for value in values[:70]:
+            left.add(value)
+        for value in values[70:]:
+            right.add(value)
+        for value in values:
+            combined.add(value)
+
+        left.merge(right)
+
+        self.assertEqual(left.count, 200)
+        self.assertAlmostEqual(left.mean, combined.mean)
+        self.assertAlmostEqual(left.variance(), combined.variance())
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_quantiles_are_within_accuracy(self):
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in range(1, 1001):
+            sketch.add(value)
+
+        self.assertAlmostEqual(sketch.quantile(0.5), 500, delta=10)
+        self.assertAlmostEqual(sketch.quantile(0.9), 900, delta=18)
+
+    def test_merge_and_zeros(self):
+        left, right = QuantileSketch(), QuantileSketch()
+        for _ in range(10):
+            left.add(0)
+            right.add(50)
+
+        left.merge(right)
+
+        self.assertEqual(left.count, 20)
+        self.assertEqual(left.quantile(0.25), 0.0)
+        self.assertAlmostEqual(left.quantile(0.75), 50, delta=1)
+
+
+class TestGameStatistics(unittest.TestCase):
+
+    def game(self, who_won, win_type):
+        game_statistics = {name: 1 for name in GameStatistics.METRICS}
+        game_statistics.update({'who_started': Colour.WHITE, 'who_won': who_won, 'win_type': win_type})
+        return game_statistics
+
+    def test_counts_and_merge(self):
+        first, second = GameStatistics(), GameStatistics()
+        first.add(self.game(Colour.WHITE, 1))
+        first.add(self.game(Colour.BLACK, 2))
+        second.add(self.game(Colour.WHITE, 3))
+
+        first.merge(second)
+
+        self.assertEqual(first.counters, {'games': 3, 'white_starts': 3, 'white_wins': 2,
+                                          'gammons': 1, 'backgammons': 1, 'pairs': 0,
+                                          'pairs_won_by_white_strategy': 0, 'pairs_won_by_black_strategy': 0,
+                                          'cache_hits': 0, 'cache_misses': 0, 'adjudicated_games': 0,
+                                          'adjudication_flips': 0, 'adjudication_saved_time': 0})
+        self.assertEqual(first.metrics['turns'].count, 3)
+
+    def test_paired_games(self):
+        statistics = GameStatistics()
+        statistics.add_games({
+            0: self.game(Colour.WHITE, 1), 1: self.game(Colour.BLACK, 1),
+            2: self.game(Colour.WHITE, 1), 3: self.game(Colour.WHITE, 1),
+            4: self.game(Colour.BLACK, 1), 5: self.game(Colour.WHITE, 1),
+            6: self.game(Colour.BLACK, 1),
+        }, paired=True)
+
+        self.assertEqual(statistics.counters['games'], 7)
+        self.assertEqual(statistics.counters['pairs'], 3)
+        self.assertEqual(statistics.counters['pairs_won_by_white_strategy'], 1)
+        self.assertEqual(statistics.counters['pairs_won_by_black_strategy'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
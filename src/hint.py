@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMoves, CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.play_generator import generate_plays
+from src.position import Position
+
+
+def rank_plays(strategy, board, colour, dice_roll, time_budget):
+    # The legal plays scored by the strategy's evaluator, best first; not
+    # complete when the time budget runs out first. A module function, so a
+    # process pool can run it
+    deadline = time.perf_counter() + time_budget
+    evaluator = strategy.evaluator_for(Position.from_board(board, colour))
+    plays = []
+    complete = True
+    if dice_roll and not board.no_moves_possible(colour, dice_roll):
+        generated = generate_plays(board, colour, dice_roll, deadline)
+        if generated is None:
+            return {'plays': [], 'complete': False}
+        for play in generated:
+            if time.perf_counter() > deadline:
+                complete = False
+                break
+            plays.append({'moves': [describe_move(move, colour) for move in play['moves']],
+                          'score': evaluator.evaluate_position(play['position'])})
+    plays.sort(key=lambda play: play['score'])
+    return {'plays': plays, 'complete': complete}
+
+
+def describe_move(move, colour):
+    # In the same form as the opponent's moves sent to the web client
+    location = move['piece_at']
+    end_location = location + move['die_roll'] if colour == Colour.WHITE else location - move['die_roll']
+    return {'start_location': location, 'die_roll': move['die_roll'], 'end_location': end_location}
+
+
+class HintProvider:
+    # Ranks the legal plays for a position and dice with a CompareAllMoves
+    # strategy's evaluator (lower scores are better). Plays not scored within the
+    # time budget are left out; complete rankings are kept by position key and
+    # dice, so a hint asked for again (or computed when the turn started) costs
+    # nothing. With an executor every ranking is computed on it, and a hint asked
+    # for while its ranking is being computed waits for that one
+    def __init__(self, strategy: CompareAllMoves = None, time_budget: float = 0.1, max_entries: int = 4096,
+                 executor=None):
+        self.strategy = strategy if strategy is not None else CompareAllMovesWeightingDistanceAndSinglesWithEndGame2()
+        self.time_budget = time_budget
+        self.max_entries = max_entries
+        self.executor = executor
+        self.hits = 0
+        self.misses = 0
+        self.__rankings = OrderedDict()
+        self.__pending = {}
+        # Reentrant, as a ranking that is already done is kept as soon as it is submitted
+        self.__lock = threading.RLock()
+
+    def hint(self, board, colour, dice_roll, count=3):
+        ranking = self.rank(board, colour, dice_roll)
+        return {'plays': ranking['plays'][:count], 'complete': ranking['complete']}
+
+    def rank(self, board, colour, dice_roll):
+        # Blocks until the ranking is ready, so with an executor it should not be
+        # called on an event loop
+        key = self.__key(board, colour, dice_roll)
+        with self.__lock:
+            ranking = self.__rankings.get(key)
+            if ranking is not None:
+                self.__rankings.move_to_end(key)
+                self.hits += 1
+                return ranking
+            future = self.__pending.get(key)
+            if future is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if self.executor is not None:
+                    future = self.__submit(key, board, colour, dice_roll)
+
+        if future is not None:
+            return future.result()
+        ranking = rank_plays(self.strategy, board, colour, dice_roll, self.time_budget)
+        self.__keep(key, ranking)
+        return ranking
+
+    def precompute(self, board, colour, dice_roll):
+        # Ranks the plays before the hint is asked for
+        if self.executor is None:
+            self.rank(board, colour, dice_roll)
+            return
+        key = self.__key(board, colour, dice_roll)
+        with self.__lock:
+            if key not in self.__rankings and key not in self.__pending:
+                self.__submit(key, board, colour, dice_roll)
+
+    @staticmethod
+    def __key(board, colour, dice_roll):
+        return Position.from_board(board, colour).key(), tuple(sorted(dice_roll))
+
+    def __submit(self, key, board, colour, dice_roll):
+        # Called with the lock held; the ranking is kept once it is done
+        future = self.executor.submit(rank_plays, self.strategy, board.create_copy(), colour, list(dice_roll),
+                                      self.time_budget)
+        self.__pending[key] = future
+        future.add_done_callback(lambda done: self.__finish(key, done))
+        return future
+
+    def __finish(self, key, future):
+        # Kept before it stops being pending, so a hint never finds it in neither
+        if not future.cancelled() and future.exception() is None:
+            self.__keep(key, future.result())
+        with self.__lock:
+            self.__pending.pop(key, None)
+
+    def __keep(self, key, ranking):
+        # A ranking cut short by the time budget is not kept, so the next hint
+        # gets another chance to rank every play
+        if not ranking['complete']:
+            return
+        with self.__lock:
+            self.__rankings[key] = ranking
+            while len(self.__rankings) > self.max_entries:
+                self.__rankings.popitem(last=False)
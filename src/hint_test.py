@@ -0,0 +1,102 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.game_session import GameSession
+from src.hint import HintProvider
+
+
+class TestHintProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.hints = HintProvider(CompareAllMovesSimple())
+
+    def test_plays_are_ranked_by_the_evaluator(self):
+        board = Board.create_starting_board()
+
+        hint = self.hints.hint(board, Colour.WHITE, [6, 1], count=5)
+        ranked = CompareAllMovesSimple().rank_moves(board, Colour.WHITE, [6, 1])
+
+        self.assertTrue(hint['complete'])
+        self.assertEqual(len(hint['plays']), 5)
+        self.assertEqual([play['score'] for play in hint['plays']], [play['value'] for play in ranked[:5]])
+        for play in hint['plays']:
+            board_after_play = board.create_copy()
+            for move in play['moves']:
+                location = board_after_play.move_piece(board_after_play.get_piece_at(move['start_location']),
+                                                       move['die_roll'])
+                self.assertEqual(location, move['end_location'])
+
+    def test_hints_are_cached_by_position_and_dice(self):
+        self.hints.hint(Board.create_starting_board(), Colour.WHITE, [6, 1])
+        self.hints.hint(Board.create_starting_board(), Colour.WHITE, [1, 6])
+
+        self.assertEqual((self.hints.hits, self.hints.misses), (1, 1))
+
+    def test_plays_past_the_time_budget_are_left_out(self):
+        hints = HintProvider(CompareAllMovesSimple(), time_budget=0)
+
+        hint = hints.hint(Board.create_starting_board(), Colour.WHITE, [3, 3, 3, 3])
+
+        self.assertFalse(hint['complete'])
+        self.assertEqual(hint['plays'], [])
+
+    def test_incomplete_rankings_are_not_kept(self):
+        hints = HintProvider(CompareAllMovesSimple(), time_budget=0)
+        for _ in range(2):
+            hints.hint(Board.create_starting_board(), Colour.WHITE, [3, 3, 3, 3])
+
+        self.assertEqual((hints.hits, hints.misses), (0, 2))
+
+    def test_precomputed_on_the_executor(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            hints = HintProvider(CompareAllMovesSimple(), executor=executor)
+            hints.precompute(Board.create_starting_board(), Colour.WHITE, [6, 1])
+
+        hints.hint(Board.create_starting_board(), Colour.WHITE, [6, 1])
+
+        self.assertEqual((hints.hits, hints.misses), (1, 0))
+
+    def test_hint_waits_for_the_ranking_being_precomputed(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            release = threading.Event()
+            executor.submit(release.wait)
+            hints = HintProvider(CompareAllMovesSimple(), executor=executor)
+            hints.precompute(Board.create_starting_board(), Colour.WHITE, [6, 1])
+            release.set()
+
+            hint = hints.hint(Board.create_starting_board(), Colour.WHITE, [6, 1])
+
+        self.assertTrue(hint['complete'])
+        self.assertEqual((hints.hits, hints.misses), (1, 0))
+
+    def test_missed_hint_is_ranked_on_the_executor(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            hints = HintProvider(CompareAllMovesSimple(), executor=executor)
+            hints.hint(Board.create_starting_board(), Colour.WHITE, [6, 1])
+            hints.hint(Board.create_starting_board(), Colour.WHITE, [6, 1])
+
+        self.assertEqual((hints.hits, hints.misses), (1, 1))
+
+    def test_session_hint_is_computed_when_the_turn_starts(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE, hints=self.hints)
+        session.start()
+
+        hint = session.get_hint()
+
+        self.assertEqual((self.hints.hits, self.hints.misses), (1, 1))
+        self.assertEqual(hint['dice_roll'], session.dice_roll)
+        self.assertEqual(len(hint['plays']), 3)
+
+    def test_no_hint_while_the_computer_is_moving(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.BLACK, hints=self.hints)
+        session.start()
+
+        self.assertEqual(session.get_hint()['plays'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
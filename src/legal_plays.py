@@ -0,0 +1,64 @@
+from src.position import Position
+
+
+class LegalPlayTable:
+    # Every legal way to play a roll, worked out once when the turn starts: a
+    # graph of the positions part way through the turn (with the dice still to
+    # play), keeping only the moves that lead to a play using as many dice as
+    # possible (and the higher die, when only one of two can be used). Each one
+    # maps every move allowed from it, a die or one checker moved by several, to
+    # the rolls used and where they lead, so checking a move is a lookup
+    def __init__(self, board, colour, dice_roll):
+        self.colour = colour
+        self.__most_dice = {}
+        self.__moves = {}
+        self.__node = (Position.from_board(board, colour), tuple(sorted(dice_roll)))
+        only_die = None
+        if self.__count_most_dice(self.__node) == 1 and len(dice_roll) == 2 and dice_roll[0] != dice_roll[1]:
+            if any(die_roll == max(dice_roll) for _, die_roll, _ in self.__single_moves(self.__node)):
+                only_die = max(dice_roll)
+        self.__add_moves(self.__node, only_die)
+
+    def can_move(self):
+        return len(self.__moves[self.__node]) > 0
+
+    def move(self, location, distance):
+        # The rolls that move the piece at location by distance, or None if that
+        # is not part of a legal play from here; a legal move is taken
+        entry = self.__moves[self.__node].get((Position.to_point(location, self.colour), distance))
+        if entry is None:
+            return None
+        rolls, self.__node = entry
+        return rolls
+
+    @staticmethod
+    def __single_moves(node):
+        position, dice = node
+        for die_roll in sorted(set(dice)):
+            dice_left = list(dice)
+            dice_left.remove(die_roll)
+            for point in position.movable_points(die_roll):
+                yield point, die_roll, (position.apply_move(point, die_roll), tuple(dice_left))
+
+    def __count_most_dice(self, node):
+        if node not in self.__most_dice:
+            self.__most_dice[node] = max([1 + self.__count_most_dice(child) for _, _, child in self.__single_moves(node)],
+                                         default=0)
+        return self.__most_dice[node]
+
+    def __add_moves(self, node, only_die=None):
+        if node in self.__moves:
+            return self.__moves[node]
+        moves = {}
+        most_dice = self.__most_dice[node]
+        for point, die_roll, child in self.__single_moves(node):
+            if self.__most_dice[child] != most_dice - 1 or (only_die is not None and die_roll != only_die):
+                continue
+            child_moves = self.__add_moves(child)
+            moves.setdefault((point, die_roll), ([die_roll], child))
+            # The same checker carrying on from where the die took it
+            for (next_point, distance), (rolls, end) in child_moves.items():
+                if next_point == point - die_roll:
+                    moves.setdefault((point, die_roll + distance), ([die_roll] + rolls, end))
+        self.__moves[node] = moves
+        return moves
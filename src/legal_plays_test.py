@@ -0,0 +1,61 @@
+import unittest
+
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.game_session import GameSession
+from src.legal_plays import LegalPlayTable
+from src.test_board_base import TestBoardBase
+
+
+class TestLegalPlayTable(TestBoardBase):
+
+    def test_must_use_both_dice_when_possible(self):
+        self.add_many_pieces(1, Colour.WHITE, 1)
+        self.add_many_pieces(1, Colour.WHITE, 10)
+        self.add_many_pieces(2, Colour.BLACK, 7)
+
+        # Moving 1 by 6 leaves no way to play the 5
+        self.assertIsNone(LegalPlayTable(self.board, Colour.WHITE, [6, 5]).move(1, 6))
+        table = LegalPlayTable(self.board, Colour.WHITE, [6, 5])
+        self.assertEqual(table.move(10, 6), [6])
+        self.assertEqual(table.move(1, 5), [5])
+        self.assertFalse(table.can_move())
+
+    def test_must_use_higher_die_when_only_one_can_be_used(self):
+        self.add_many_pieces(1, Colour.WHITE, 1)
+        self.add_many_pieces(2, Colour.BLACK, 3)
+        self.add_many_pieces(2, Colour.BLACK, 8)
+        self.add_many_pieces(2, Colour.BLACK, 9)
+
+        self.assertIsNone(LegalPlayTable(self.board, Colour.WHITE, [2, 5]).move(1, 2))
+        self.assertEqual(LegalPlayTable(self.board, Colour.WHITE, [2, 5]).move(1, 5), [5])
+
+    def test_one_checker_can_use_several_dice(self):
+        self.board = Board.create_starting_board()
+
+        table = LegalPlayTable(self.board, Colour.WHITE, [6, 5])
+        self.assertIn(table.move(1, 11), ([6, 5], [5, 6]))
+        self.assertFalse(table.can_move())
+        self.assertEqual(LegalPlayTable(self.board, Colour.BLACK, [3, 3, 3, 3]).move(24, 9), [3, 3, 3])
+
+    def test_no_moves_possible(self):
+        self.add_many_pieces(1, Colour.WHITE, 0)
+        self.add_many_pieces(2, Colour.BLACK, 3)
+        self.add_many_pieces(2, Colour.BLACK, 4)
+
+        table = LegalPlayTable(self.board, Colour.WHITE, [3, 4])
+        self.assertFalse(table.can_move())
+        self.assertIsNone(table.move(0, 3))
+
+    def test_a_whole_play_ends_the_turn_in_a_session(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE)
+        session.start()
+        session.dice_roll = [6, 5]
+
+        self.assertIsNone(session.move_piece(1, 11))
+        self.assertEqual(session.respond(None)['used_rolls'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shlex
+import signal
+import subprocess
+import time
+import uuid
+from urllib.parse import urlencode
+
+from src.board import Board
+from src.colour import Colour
+from src.play_generator import generate_plays
+
+# Stops a client that keeps getting move_failed from looping for ever
+MAX_REQUESTS_PER_GAME = 1000
+
+
+class LoadClient:
+    # One simulated player: plays whole games through /new-game and /move-piece,
+    # choosing a legal play at random, and times every request
+    def __init__(self, host, port, difficulty, latencies):
+        self.host = host
+        self.port = port
+        self.difficulty = difficulty
+        self.latencies = latencies
+        self.session_id = uuid.uuid4().hex
+        self.errors = 0
+
+    async def play_game(self):
+        state = await self.request('/new-game', difficulty=self.difficulty)
+        for _ in range(MAX_REQUESTS_PER_GAME):
+            if 'winner' in state:
+                return True
+            state = await self.play_turn(state)
+        return False
+
+    async def play_turn(self, state):
+        moves_left = list(state['dice_roll'])
+        for used_roll in state['used_rolls']:
+            moves_left.remove(used_roll)
+        board = Board.from_json(state['board'])
+        moves = []
+        if moves_left and not board.no_moves_possible(Colour.WHITE, moves_left):
+            moves = [(move['piece_at'], move['die_roll'])
+                     for move in random.choice(generate_plays(board, Colour.WHITE, moves_left))['moves']]
+        for location, die_roll in moves:
+            state = await self.request('/move-piece', location=location, **{'die-roll': die_roll})
+            if state.get('result') == 'move_failed' or 'winner' in state:
+                break
+        else:
+            if moves:
+                # A whole play ends the turn, so the computer has already replied
+                return state
+        if state.get('result') == 'move_failed':
+            self.errors += 1
+        if 'winner' in state:
+            return state
+        return await self.request('/move-piece', **{'end-turn': 'true'})
+
+    async def request(self, path, **args):
+        target = '%s?%s' % (path, urlencode(dict(args, session=self.session_id)))
+        start = time.perf_counter()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(('GET %s HTTP/1.1\r\nHost: %s:%d\r\nConnection: close\r\n\r\n'
+                          % (target, self.host, self.port)).encode('latin-1'))
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            # Read the body by its length rather than to the end of the stream: a
+            # worker process forked while the connection was open keeps it open
+            length = None
+            for line in head.decode('latin-1').split('\r\n')[1:]:
+                name, _, value = line.partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+            body = await (reader.readexactly(length) if length is not None else reader.read())
+        finally:
+            writer.close()
+        self.latencies.setdefault(path, []).append(time.perf_counter() - start)
+        if head.split()[1] != b'200':
+            self.errors += 1
+            return {'result': 'move_failed'}
+        return json.loads(body)
+
+
+class ResourceSampler:
+    # CPU and memory of the server process and its children (e.g. the AI worker
+    # pool), read from /proc every interval seconds
+    def __init__(self, pid, interval=1.0):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+
+    async def run(self):
+        start = time.monotonic()
+        last_time, last_cpu = start, self.cpu_seconds()
+        while True:
+            await asyncio.sleep(self.interval)
+            now, cpu = time.monotonic(), self.cpu_seconds()
+            self.samples.append((now - start, 100 * (cpu - last_cpu) / (now - last_time), self.rss_megabytes()))
+            last_time, last_cpu = now, cpu
+
+    def processes(self):
+        children = {}
+        for name in os.listdir('/proc'):
+            if name.isdigit():
+                stat = self.__read_stat(int(name))
+                if stat is not None:
+                    children.setdefault(int(stat[1]), []).append(int(name))
+        processes, pending = [], [self.pid]
+        while pending:
+            pid = pending.pop()
+            processes.append(pid)
+            pending.extend(children.get(pid, []))
+        return processes
+
+    def cpu_seconds(self):
+        ticks = 0
+        for pid in self.processes():
+            stat = self.__read_stat(pid)
+            if stat is not None:
+                ticks += int(stat[11]) + int(stat[12])
+        return ticks / os.sysconf('SC_CLK_TCK')
+
+    def rss_megabytes(self):
+        pages = 0
+        for pid in self.processes():
+            try:
+                with open('/proc/%d/statm' % pid) as statm:
+                    pages += int(statm.read().split()[1])
+            except OSError:
+                pass
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+    @staticmethod
+    def __read_stat(pid):
+        # The fields after the command name, which may itself contain spaces
+        try:
+            with open('/proc/%d/stat' % pid) as stat:
+                return stat.read().rpartition(')')[2].split()
+        except OSError:
+            return None
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+async def run_load_test(host, port, clients, games_per_client, difficulty='easy', server_pid=None,
+                        sample_interval=1.0):
+    latencies = {}
+    load_clients = [LoadClient(host, port, difficulty, latencies) for _ in range(clients)]
+    sampler = ResourceSampler(server_pid, sample_interval) if server_pid is not None else None
+    sampling = asyncio.ensure_future(sampler.run()) if sampler is not None else None
+
+    async def play(client):
+        return sum([await client.play_game() for _ in range(games_per_client)])
+
+    start = time.perf_counter()
+    games = await asyncio.gather(*[play(client) for client in load_clients])
+    duration = time.perf_counter() - start
+    if sampling is not None:
+        sampling.cancel()
+    return {
+        'clients': clients,
+        'duration': duration,
+        'games': sum(games),
+        'requests': sum(len(times) for times in latencies.values()),
+        'errors': sum(client.errors for client in load_clients),
+        'latencies': latencies,
+        'samples': sampler.samples if sampler is not None else [],
+    }
+
+
+def print_results(results):
+    print("%d clients finished %d games in %.1fs: %.1f requests/s, %.2f games/s, %d errors" % (
+        results['clients'], results['games'], results['duration'], results['requests'] / results['duration'],
+        results['games'] / results['duration'], results['errors']))
+    print("")
+    print("%-14s %10s %10s %10s %10s %10s" % ('endpoint', 'requests', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms'))
+    for path, times in sorted(results['latencies'].items()):
+        print("%-14s %10d %10.1f %10.1f %10.1f %10.1f" % (
+            path, len(times), 1000 * percentile(times, 50), 1000 * percentile(times, 95),
+            1000 * percentile(times, 99), 1000 * max(times)))
+    if results['samples']:
+        print("")
+        print("%-10s %10s %10s" % ('time s', 'server CPU', 'RSS MB'))
+        for elapsed, cpu_percent, rss in results['samples']:
+            print("%-10.1f %9.0f%% %10.1f" % (elapsed, cpu_percent, rss))
+
+
+def wait_for_server(host, port, timeout=30):
+    async def connect():
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _, writer = await asyncio.open_connection(host, port)
+                writer.close()
+                return
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+    asyncio.run(connect())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play many simultaneous games against a local game server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--clients', type=int, default=10)
+    parser.add_argument('--games', type=int, default=1, help='games played by each client')
+    parser.add_argument('--difficulty', default='easy')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between server CPU/memory samples')
+    server_parser = parser.add_mutually_exclusive_group()
+    server_parser.add_argument('--server-pid', type=int, help='process id of an already running server to sample')
+    server_parser.add_argument('--server-command',
+                               help="start the server with this command (e.g. 'python async_app.py') and stop it after")
+    args = parser.parse_args()
+
+    server = None
+    server_pid = args.server_pid
+    if args.server_command:
+        server = subprocess.Popen(shlex.split(args.server_command))
+        server_pid = server.pid
+        wait_for_server(args.host, args.port)
+    try:
+        print_results(asyncio.run(run_load_test(args.host, args.port, args.clients, args.games, args.difficulty,
+                                                server_pid, args.interval)))
+    finally:
+        if server is not None:
+            # Interrupt rather than terminate, so the server shuts its worker pool down too
+            server.send_signal(signal.SIGINT)
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                server.kill()
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from async_app import AsyncGameServer
+from src.load_generator import run_load_test, percentile
+
+
+class TestLoadGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.loop = asyncio.new_event_loop()
+        game_server = AsyncGameServer(self.executor)
+        self.server = self.loop.run_until_complete(self.__start(game_server))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.server.close()
+        self.loop.close()
+        self.executor.shutdown()
+
+    async def __start(self, game_server):
+        return await asyncio.start_server(game_server.handle_connection, '127.0.0.1', 0)
+
+    def test_clients_play_whole_games(self):
+        results = asyncio.run(run_load_test('127.0.0.1', self.port, 3, 1, 'easy', os.getpid(), 0.01))
+
+        self.assertEqual(results['games'], 3)
+        self.assertEqual(results['errors'], 0)
+        self.assertEqual(len(results['latencies']['/new-game']), 3)
+        self.assertGreater(len(results['latencies']['/move-piece']), 3)
+        self.assertTrue(results['samples'])
+        self.assertTrue(all(rss > 0 for _, _, rss in results['samples']))
+
+    def test_percentile_uses_the_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
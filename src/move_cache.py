@@ -0,0 +1,155 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+from src.position import Position
+from src.result_store import strategy_key
+from src.strategies import Strategy
+
+HEADER = struct.Struct('<4sI')
+MAGIC = b'BGMC'
+# key hash, checksum, number of moves, moves as point * 8 + die
+RECORD = struct.Struct('<QIB4s3x')
+WAYS = 4
+
+
+class MoveCache:
+    # A fixed size hash table of chosen plays in a memory-mapped file, so every
+    # process that opens the same path shares it (and it survives between runs).
+    # Each key hashes to a bucket of WAYS slots; when they are all taken one of
+    # them is overwritten. Records carry a checksum, so a record being written by
+    # another process at the same time reads as a miss rather than a wrong play
+    __maps = {}
+
+    def __init__(self, path=None, slots: int = 1 << 18):
+        self.__owner = path is None
+        if path is None:
+            file_descriptor, path = tempfile.mkstemp(suffix='.movecache')
+            os.close(file_descriptor)
+        self.path = path
+        self.slots = slots - slots % WAYS
+        self.__map = None
+
+    def __getstate__(self):
+        return {'path': self.path, 'slots': self.slots}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.slots = state['slots']
+        self.__owner = False
+        self.__map = None
+
+    def get(self, key_hash):
+        table = self.__table()
+        for offset in self.__bucket(key_hash):
+            stored_hash, checksum, count, moves = RECORD.unpack_from(table, offset)
+            if stored_hash == key_hash and checksum == zlib.crc32(moves[:count], key_hash & 0xffffffff):
+                return [(move >> 3, move & 7) for move in moves[:count]]
+        return None
+
+    def put(self, key_hash, moves):
+        table = self.__table()
+        encoded = bytes(point << 3 | die_roll for point, die_roll in moves)
+        bucket = self.__bucket(key_hash)
+        offset = bucket[(key_hash >> 32) % WAYS]
+        for candidate in bucket:
+            stored_hash = struct.unpack_from('<Q', table, candidate)[0]
+            if stored_hash == key_hash or stored_hash == 0:
+                offset = candidate
+                break
+        RECORD.pack_into(table, offset, key_hash, zlib.crc32(encoded, key_hash & 0xffffffff), len(encoded), encoded)
+
+    @staticmethod
+    def key_hash(strategy_identity, position, dice_roll):
+        key = '%s|%s|%s' % (strategy_identity, position.key(), ''.join(str(die) for die in dice_roll))
+        return int.from_bytes(hashlib.blake2b(key.encode('ascii'), digest_size=8).digest(), 'little') or 1
+
+    def close(self):
+        table = MoveCache.__maps.pop(self.path, None)
+        if table is not None:
+            table.close()
+        self.__map = None
+        if self.__owner and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __bucket(self, key_hash):
+        first = HEADER.size + (key_hash % (self.slots // WAYS)) * WAYS * RECORD.size
+        return [first + way * RECORD.size for way in range(WAYS)]
+
+    def __table(self):
+        if self.__map is None:
+            # One mapping per file in each process, however many copies of the cache were unpickled
+            if self.path not in MoveCache.__maps:
+                MoveCache.__maps[self.path] = self.__open()
+            self.__map = MoveCache.__maps[self.path]
+            self.slots = HEADER.unpack_from(self.__map)[1]
+        return self.__map
+
+    def __open(self):
+        size = HEADER.size + self.slots * RECORD.size
+        with open(self.path, 'a+b') as cache_file:
+            cache_file.seek(0)
+            header = cache_file.read(HEADER.size)
+            if len(header) == HEADER.size and HEADER.unpack(header)[0] == MAGIC:
+                self.slots = HEADER.unpack(header)[1]
+                size = HEADER.size + self.slots * RECORD.size
+            else:
+                cache_file.truncate(0)
+                cache_file.write(HEADER.pack(MAGIC, self.slots))
+            cache_file.truncate(size)
+            return mmap.mmap(cache_file.fileno(), size)
+
+
+def cache_if_possible(strategy: Strategy, cache: MoveCache):
+    # Strategies whose play depends on more than the position and dice (random
+    # choices, the opponent's last move) are left to choose every play themselves
+    return CachedStrategy(strategy, cache) if strategy.position_only else strategy
+
+
+class CachedStrategy(Strategy):
+    # Replays the base strategy's earlier choice for the same position and dice
+    position_only = True
+
+    def __init__(self, base_strategy: Strategy, cache: MoveCache):
+        if not base_strategy.position_only:
+            raise Exception("%s does not always play the same way in the same position" %
+                            type(base_strategy).__name__)
+        self.base_strategy = base_strategy
+        self.cache = cache
+        self.identity = strategy_key(base_strategy)
+        self.hits = 0
+        self.misses = 0
+
+    def get_difficulty(self):
+        return self.base_strategy.get_difficulty()
+
+    def config(self):
+        # Where the plays are cached and how often it has been used does not
+        # change how the strategy plays
+        return {'base_strategy': self.base_strategy}
+
+    def move(self, board, colour, dice_roll, make_move, opponents_activity):
+        key_hash = MoveCache.key_hash(self.identity, Position.from_board(board, colour), dice_roll)
+        moves = self.cache.get(key_hash)
+        if moves is not None:
+            self.hits += 1
+            for point, die_roll in moves:
+                make_move(Position.to_location(point, colour), die_roll)
+            return
+
+        self.misses += 1
+        moves = []
+
+        def record_move(location, die_roll):
+            result = make_move(location, die_roll)
+            moves.append((Position.to_point(location, colour), die_roll))
+            return result
+
+        self.base_strategy.move(board, colour, dice_roll, record_move, opponents_activity)
+        self.cache.put(key_hash, moves)
+
+    def game_over(self, opponents_activity):
+        self.base_strategy.game_over(opponents_activity)
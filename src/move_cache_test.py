@@ -0,0 +1,95 @@
+import multiprocessing as mp
+import os
+import tempfile
+import unittest
+
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.experiment import Experiment
+from src.move_cache import MoveCache, CachedStrategy, cache_if_possible
+from src.opening_book import OpeningBookStrategy
+from src.rollout import RolloutStrategy
+from src.strategies import LookAheadStrategy, MoveMostlySmart, MoveRandomPiece
+
+
+def put_in_cache(cache):
+    cache.put(12345, [(8, 5), (6, 3)])
+
+
+class TestMoveCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'moves.cache')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_plays_are_kept_between_runs(self):
+        cache = MoveCache(self.path)
+        cache.put(12345, [(25, 6), (13, 6), (6, 6), (1, 1)])
+        cache.close()
+
+        cache = MoveCache(self.path)
+        self.assertEqual(cache.get(12345), [(25, 6), (13, 6), (6, 6), (1, 1)])
+        self.assertIsNone(cache.get(54321))
+        cache.close()
+
+    def test_full_bucket_evicts(self):
+        cache = MoveCache(self.path, slots=4)
+        for key_hash in range(1, 7):
+            cache.put(key_hash, [(key_hash, 1)])
+
+        self.assertEqual(sum(cache.get(key_hash) is not None for key_hash in range(1, 7)), 4)
+        self.assertEqual(cache.get(6), [(6, 1)])
+        cache.close()
+
+    def test_cache_is_shared_with_worker_processes(self):
+        cache = MoveCache()
+        with mp.Pool(1) as pool:
+            pool.apply(put_in_cache, (cache,))
+
+        self.assertEqual(cache.get(12345), [(8, 5), (6, 3)])
+        path = cache.path
+        cache.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_cached_strategy_replays_the_same_play(self):
+        cache = MoveCache(self.path)
+        strategy = CachedStrategy(CompareAllMovesSimple(), cache)
+        expected = Board.create_starting_board()
+        CompareAllMovesSimple().move(expected, Colour.BLACK, [6, 4], expected.get_move_lambda(), {})
+
+        for _ in range(2):
+            board = Board.create_starting_board()
+            strategy.move(board, Colour.BLACK, [6, 4], board.get_move_lambda(), {})
+            self.assertEqual(board.get_counts(Colour.BLACK), expected.get_counts(Colour.BLACK))
+
+        self.assertEqual((strategy.hits, strategy.misses), (1, 1))
+        cache.close()
+
+    def test_only_position_only_strategies_are_cached(self):
+        cache = MoveCache(self.path)
+        for strategy in (MoveRandomPiece(), MoveMostlySmart(), RolloutStrategy(), LookAheadStrategy()):
+            self.assertRaises(Exception, CachedStrategy, strategy, cache)
+            self.assertIs(cache_if_possible(strategy, cache), strategy)
+
+        self.assertIsInstance(cache_if_possible(OpeningBookStrategy(CompareAllMovesSimple()), cache), CachedStrategy)
+        self.assertIs(type(cache_if_possible(OpeningBookStrategy(MoveRandomPiece()), cache)), OpeningBookStrategy)
+        cache.close()
+
+    def test_experiment_counts_cache_lookups(self):
+        cache = MoveCache(self.path)
+        strategy = CachedStrategy(CompareAllMovesSimple(), cache)
+        experiment = Experiment(4, strategy, MoveRandomPiece(), parallelise=False, seed=1)
+        experiment.run()
+        counters = experiment.get_statistics().counters
+
+        self.assertGreater(counters['cache_misses'], 0)
+        self.assertEqual((counters['cache_hits'], counters['cache_misses']), (strategy.hits, strategy.misses))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
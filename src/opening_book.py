@@ -0,0 +1,148 @@
+import os
+import sys
+
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.position import Position
+from src.strategies import Strategy
+
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(__file__), 'opening_book.txt')
+# The accepted best play for each opening roll, as the point each checker moves
+# from and the die it uses. Rollouts played out by the search strategies get
+# some of these wrong (31 as 24/21 24/23), so the book's opening moves are
+# these and only the replies to them are left to the strategy
+OPENING_PLAYS = {
+    '21': [(13, 2), (24, 1)],
+    '31': [(8, 3), (6, 1)],
+    '32': [(24, 3), (13, 2)],
+    '41': [(24, 1), (13, 4)],
+    '42': [(8, 4), (6, 2)],
+    '43': [(24, 4), (13, 3)],
+    '51': [(13, 5), (24, 1)],
+    '52': [(13, 5), (13, 2)],
+    '53': [(8, 5), (6, 3)],
+    '54': [(24, 4), (13, 5)],
+    '61': [(13, 6), (8, 1)],
+    '62': [(24, 6), (13, 2)],
+    '63': [(24, 6), (13, 3)],
+    '64': [(8, 6), (6, 4)],
+    '65': [(24, 6), (18, 5)],
+}
+
+
+def book_dice(dice_roll):
+    return '%d%d' % (max(dice_roll[:2]), min(dice_roll[:2]))
+
+
+class OpeningBook:
+    __loaded = {}
+
+    def __init__(self, plays=None):
+        self.__plays = plays if plays is not None else {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_BOOK_PATH):
+        if path not in cls.__loaded:
+            plays = {}
+            if os.path.exists(path):
+                with open(path) as book_file:
+                    for line in book_file:
+                        position, dice, moves = (line.split() + [''])[:3]
+                        plays[(position, dice)] = [tuple(int(x) for x in move.split('/'))
+                                                   for move in moves.split(',') if move]
+            cls.__loaded[path] = OpeningBook(plays)
+        return cls.__loaded[path]
+
+    def save(self, path=DEFAULT_BOOK_PATH):
+        with open(path, 'w') as book_file:
+            for (position, dice), moves in sorted(self.__plays.items()):
+                book_file.write('%s %s %s\n' % (position, dice, ','.join('%d/%d' % move for move in moves)))
+
+    def __len__(self):
+        return len(self.__plays)
+
+    def add(self, board, colour, dice_roll, moves):
+        self.__plays[(Position.from_board(board, colour).key(), book_dice(dice_roll))] = \
+            [(Position.to_point(move['piece_at'], colour), move['die_roll']) for move in moves]
+
+    def get_moves(self, board, colour, dice_roll):
+        moves = self.__plays.get((Position.from_board(board, colour).key(), book_dice(dice_roll)))
+        if moves is None:
+            return None
+        return [{'piece_at': Position.to_location(point, colour), 'die_roll': die_roll} for point, die_roll in moves]
+
+
+class OpeningBookStrategy(Strategy):
+    def __init__(self, base_strategy: Strategy = None, book: OpeningBook = None):
+        self.base_strategy = base_strategy if base_strategy else CompareAllMovesWeightingDistanceAndSinglesWithEndGame2()
+        self.book = book if book is not None else OpeningBook.load()
+
+    @staticmethod
+    def get_difficulty():
+        return "Hard"
+
+    @property
+    def position_only(self):
+        return self.base_strategy.position_only
+
+    def move(self, board, colour, dice_roll, make_move, opponents_activity):
+        moves = self.book.get_moves(board, colour, dice_roll)
+        if moves is None:
+            self.base_strategy.move(board, colour, dice_roll, make_move, opponents_activity)
+            return
+        for move in moves:
+            make_move(move['piece_at'], move['die_roll'])
+
+
+def all_rolls(include_doubles=True):
+    return [[a, b] for a in range(6, 0, -1) for b in range(a, 0, -1) if include_doubles or a != b]
+
+
+def choose_moves(strategy, board, colour, dice_roll):
+    board = board.create_copy()
+    moves = []
+
+    def make_move(location, die_roll):
+        moves.append({'piece_at': location, 'die_roll': die_roll})
+        return board.move_piece(board.get_piece_at(location), die_roll)
+
+    dice_roll = [dice_roll[0]] * 4 if dice_roll[0] == dice_roll[1] else list(dice_roll)
+    strategy.move(board, colour, dice_roll, make_move, {})
+    return moves, board
+
+
+def opening_moves(opening_roll):
+    return [{'piece_at': Position.to_location(point, Colour.WHITE), 'die_roll': die_roll}
+            for point, die_roll in OPENING_PLAYS[book_dice(opening_roll)]]
+
+
+def generate_book(strategy):
+    # Every opening roll, then the strategy's reply to it with every roll
+    book = OpeningBook()
+    start = Board.create_starting_board()
+    for opening_roll in all_rolls(include_doubles=False):
+        moves = opening_moves(opening_roll)
+        book.add(start, Colour.WHITE, opening_roll, moves)
+        board = start.create_copy()
+        for move in moves:
+            board.move_piece(board.get_piece_at(move['piece_at']), move['die_roll'])
+        for reply_roll in all_rolls():
+            reply_moves, _ = choose_moves(strategy, board, Colour.BLACK, reply_roll)
+            book.add(board, Colour.BLACK, reply_roll, reply_moves)
+        print(".", end="", flush=True)
+    print("")
+    return book
+
+
+if __name__ == '__main__':
+    from src.rollout import RolloutStrategy
+    from src.strategy_factory import StrategyFactory
+
+    # By default the replies are rolled out more thoroughly than RolloutStrategy
+    # plays a game
+    strategy_name = sys.argv[1] if len(sys.argv) > 1 else None
+    book = generate_book(StrategyFactory.create_by_name(strategy_name) if strategy_name
+                         else RolloutStrategy(candidates=5, trials=144))
+    book.save(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_BOOK_PATH)
+    print("Saved %d positions" % len(book))
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.opening_book import OpeningBook, OpeningBookStrategy
+from src.position import Position
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        self.board = Board.create_starting_board()
+        self.book = OpeningBook()
+        self.book.add(self.board, Colour.WHITE, [3, 1], [
+            {'piece_at': 17, 'die_roll': 3},
+            {'piece_at': 19, 'die_roll': 1},
+        ])
+
+    def test_starting_position_is_the_same_for_both_colours(self):
+        self.assertEqual(Position.from_board(self.board, Colour.WHITE), Position.from_board(self.board, Colour.BLACK))
+
+    def test_moves_are_mirrored_for_black(self):
+        moves = self.book.get_moves(self.board, Colour.BLACK, [1, 3])
+
+        self.assertEqual(moves, [{'piece_at': 8, 'die_roll': 3}, {'piece_at': 6, 'die_roll': 1}])
+
+    def test_unknown_roll_is_not_in_book(self):
+        self.assertIsNone(self.book.get_moves(self.board, Colour.WHITE, [6, 5]))
+
+    def test_save_and_load(self):
+        path = os.path.join(tempfile.mkdtemp(), 'book.txt')
+        self.book.save(path)
+
+        loaded = OpeningBook.load(path)
+
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded.get_moves(self.board, Colour.WHITE, [3, 1]),
+                         self.book.get_moves(self.board, Colour.WHITE, [3, 1]))
+
+    def test_book_plays_the_standard_openings(self):
+        # 31 as 8/5 6/5 and 42 as 8/4 6/4
+        for dice_roll, made_point in (([3, 1], 20), ([4, 2], 21)):
+            board = Board.create_starting_board()
+            OpeningBookStrategy(CompareAllMovesSimple()).move(board, Colour.WHITE, dice_roll, board.get_move_lambda(), {})
+
+            self.assertEqual(len(board.pieces_at(made_point)), 2)
+            self.assertEqual(len(board.pieces_at(17)), 2)
+            self.assertEqual(len(board.pieces_at(19)), 4)
+
+    def test_strategy_plays_book_moves(self):
+        strategy = OpeningBookStrategy(CompareAllMovesSimple(), self.book)
+        strategy.move(self.board, Colour.WHITE, [3, 1], self.board.get_move_lambda(), {})
+
+        self.assertEqual(len(self.board.pieces_at(20)), 2)
+        self.assertEqual(len(self.board.pieces_at(17)), 2)
+
+    def test_strategy_falls_back_to_search(self):
+        strategy = OpeningBookStrategy(CompareAllMovesSimple(), self.book)
+        strategy.move(self.board, Colour.WHITE, [6, 5], self.board.get_move_lambda(), {})
+
+        self.assertEqual(self.board.pip_count(Colour.WHITE), 167 - 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import time
+
+from src.position import Position
+
+
+class _DeadlinePassed(Exception):
+    pass
+
+
+def generate_plays(board, colour, dice_roll, deadline=None):
+    # With a deadline (a time.perf_counter() value), None if it passes before
+    # every play is found
+    if len(dice_roll) == 2 and dice_roll[0] != dice_roll[1]:
+        orders = [list(dice_roll), list(reversed(dice_roll))]
+    else:
+        orders = [list(dice_roll)]
+
+    plays = {}
+    position = Position.from_board(board, colour)
+    try:
+        for order in orders:
+            _add_plays(position, order, [], plays, deadline)
+    except _DeadlinePassed:
+        return None
+
+    most_dice_used = max(len(moves) for moves in plays.values())
+    plays = {position: moves for position, moves in plays.items() if len(moves) == most_dice_used}
+
+    # When only one of two different dice can be played, the higher one must be used if possible
+    if most_dice_used == 1 and len(orders) == 2:
+        highest_die = max(dice_roll)
+        if any(moves[0][1] == highest_die for moves in plays.values()):
+            plays = {position: moves for position, moves in plays.items() if moves[0][1] == highest_die}
+
+    return [{
+        'moves': [{'die_roll': die_roll, 'piece_at': Position.to_location(point, colour)} for point, die_roll in moves],
+        'position': position,
+    } for position, moves in plays.items()]
+
+
+def _add_plays(position, dice_rolls, moves, plays, deadline):
+    if deadline is not None and time.perf_counter() > deadline:
+        raise _DeadlinePassed()
+    movable = position.movable_points(dice_rolls[0]) if dice_rolls else []
+    if not movable:
+        if position not in plays or len(plays[position]) < len(moves):
+            plays[position] = moves
+        return
+
+    for point in movable:
+        _add_plays(position.apply_move(point, dice_rolls[0]), dice_rolls[1:], moves + [(point, dice_rolls[0])], plays,
+                   deadline)
@@ -0,0 +1,56 @@
+import time
+import unittest
+
+from src.board import Board
+from src.colour import Colour
+from src.play_generator import generate_plays
+from src.test_board_base import TestBoardBase
+
+
+class TestGeneratePlays(TestBoardBase):
+
+    def test_plays_are_unique_positions(self):
+        self.add_many_pieces(2, Colour.WHITE, 1)
+
+        plays = generate_plays(self.board, Colour.WHITE, [1, 2])
+
+        self.assertEqual(len(plays), 2)
+
+    def test_must_use_both_dice_when_possible(self):
+        self.add_many_pieces(1, Colour.WHITE, 1)
+        self.add_many_pieces(1, Colour.WHITE, 10)
+        self.add_many_pieces(2, Colour.BLACK, 7)
+
+        plays = generate_plays(self.board, Colour.WHITE, [6, 5])
+
+        self.assertTrue(all(len(play['moves']) == 2 for play in plays))
+        self.assertNotIn([{'die_roll': 6, 'piece_at': 1}], [play['moves'] for play in plays])
+
+    def test_must_use_higher_die_when_only_one_can_be_used(self):
+        self.add_many_pieces(1, Colour.WHITE, 1)
+        self.add_many_pieces(2, Colour.BLACK, 3)
+        self.add_many_pieces(2, Colour.BLACK, 8)
+        self.add_many_pieces(2, Colour.BLACK, 9)
+
+        plays = generate_plays(self.board, Colour.WHITE, [2, 5])
+
+        self.assertEqual([play['moves'] for play in plays], [[{'die_roll': 5, 'piece_at': 1}]])
+
+    def test_no_plays_possible(self):
+        self.add_many_pieces(1, Colour.WHITE, 0)
+        self.add_many_pieces(2, Colour.BLACK, 3)
+        self.add_many_pieces(2, Colour.BLACK, 4)
+
+        plays = generate_plays(self.board, Colour.WHITE, [3, 4])
+
+        self.assertEqual([play['moves'] for play in plays], [[]])
+
+    def test_none_once_the_deadline_passes(self):
+        board = Board.create_starting_board()
+
+        self.assertIsNone(generate_plays(board, Colour.WHITE, [3, 3, 3, 3], deadline=time.perf_counter()))
+        self.assertTrue(generate_plays(board, Colour.WHITE, [3, 3, 3, 3], deadline=time.perf_counter() + 60))
+
+
+if __name__ == '__main__':
+    unittest.main()
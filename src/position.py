@@ -0,0 +1,113 @@
+from src.board import Board
+from src.colour import Colour
+
+POINT_SYMBOLS = '0123456789abcdefghijklmnopqrstu'
+BAR = 25
+OPPONENTS_BAR = 0
+
+
+class Position:
+    # Immutable snapshot of a board seen by the side to move. Points are numbered
+    # by distance from home for that side (25 is its bar, 0 the opponent's bar);
+    # its pieces are counted as positive numbers and the opponent's as negative
+    __slots__ = ('points', '__hash')
+
+    def __init__(self, points):
+        self.points = tuple(points)
+        self.__hash = hash(self.points)
+
+    @classmethod
+    def from_board(cls, board, colour):
+        own = board.get_counts(colour)
+        opponent = board.get_counts(colour.other())
+        if colour == Colour.WHITE:
+            own = own[::-1]
+            opponent = opponent[::-1]
+        return cls(own[point] - opponent[point] for point in range(26))
+
+    @classmethod
+    def from_key(cls, key):
+        return cls(POINT_SYMBOLS.index(symbol) - 15 for symbol in key)
+
+    @staticmethod
+    def to_location(point, colour):
+        return 25 - point if colour == Colour.WHITE else point
+
+    @staticmethod
+    def to_point(location, colour):
+        return 25 - location if colour == Colour.WHITE else location
+
+    def to_board(self, colour):
+        board = Board()
+        for point, count in enumerate(self.points):
+            if count > 0:
+                board.add_many_pieces(count, colour, Position.to_location(point, colour))
+            elif count < 0:
+                board.add_many_pieces(-count, colour.other(), Position.to_location(point, colour))
+        return board
+
+    def key(self):
+        return ''.join(POINT_SYMBOLS[count + 15] for count in self.points)
+
+    def flip(self):
+        return Position(-self.points[25 - point] for point in range(26))
+
+    def movable_points(self, die_roll):
+        points = self.points
+        if points[BAR] > 0:
+            sources = [BAR]
+        else:
+            sources = [point for point in range(24, 0, -1) if points[point] > 0]
+        movable = []
+        for point in sources:
+            target = point - die_roll
+            if target >= 1:
+                if points[target] >= -1:
+                    movable.append(point)
+            elif self.can_move_off() and (target == 0 or not any(x > 0 for x in points[die_roll:])):
+                movable.append(point)
+        return movable
+
+    def can_move_off(self):
+        return not any(count > 0 for count in self.points[7:])
+
+    def apply_move(self, point, die_roll):
+        points = list(self.points)
+        points[point] -= 1
+        target = point - die_roll
+        if target >= 1:
+            if points[target] == -1:
+                points[target] = 0
+                points[OPPONENTS_BAR] -= 1
+            points[target] += 1
+        return Position(points)
+
+    def pip_count(self):
+        return sum(point * count for point, count in enumerate(self.points) if count > 0)
+
+    def opponent_pip_count(self):
+        return sum((25 - point) * -count for point, count in enumerate(self.points) if count < 0)
+
+    def has_game_ended(self):
+        return not any(count > 0 for count in self.points) or not any(count < 0 for count in self.points)
+
+    def is_race(self):
+        own = [point for point, count in enumerate(self.points) if count > 0]
+        opponent = [point for point, count in enumerate(self.points) if count < 0]
+        return len(own) > 0 and len(opponent) > 0 and max(own) < min(opponent)
+
+    def __eq__(self, other):
+        return isinstance(other, Position) and self.points == other.points
+
+    def __hash__(self):
+        return self.__hash
+
+    def __repr__(self):
+        return 'Position(%s)' % self.key()
+
+    def __getstate__(self):
+        return self.points
+
+    def __setstate__(self, state):
+        self.points = state
+        self.__hash = hash(state)
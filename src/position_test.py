@@ -0,0 +1,61 @@
+import unittest
+
+from src.board import Board
+from src.colour import Colour
+from src.position import Position
+from src.test_board_base import TestBoardBase
+
+
+class TestPosition(TestBoardBase):
+
+    def test_starting_position_is_the_same_for_both_colours(self):
+        board = Board.create_starting_board()
+
+        white = Position.from_board(board, Colour.WHITE)
+        black = Position.from_board(board, Colour.BLACK)
+
+        self.assertEqual(white, black)
+        self.assertEqual(hash(white), hash(black))
+        self.assertEqual(white.pip_count(), 167)
+        self.assertEqual(white.opponent_pip_count(), 167)
+
+    def test_positions_can_be_dict_keys(self):
+        board = Board.create_starting_board()
+        cache = {Position.from_board(board, Colour.WHITE): 'cached'}
+
+        self.assertEqual(cache[Position.from_board(board.create_copy(), Colour.BLACK)], 'cached')
+
+    def test_apply_move_matches_board(self):
+        self.add_piece(Colour.WHITE, 12)
+        self.add_piece(Colour.BLACK, 15)
+        position = Position.from_board(self.board, Colour.WHITE)
+
+        self.move_piece_at(12, 3)
+
+        self.assertEqual(position.apply_move(13, 3), Position.from_board(self.board, Colour.WHITE))
+        self.assertEqual(position.points[0], 0)
+        self.assertEqual(position.apply_move(13, 3).points[0], -1)
+
+    def test_movable_points_matches_board(self):
+        self.add_many_pieces(1, Colour.BLACK, 1)
+        self.add_many_pieces(2, Colour.BLACK, 5)
+        self.add_many_pieces(2, Colour.WHITE, 3)
+        position = Position.from_board(self.board, Colour.BLACK)
+
+        for die_roll in range(1, 7):
+            expected = [location for location in (5, 1)
+                        if self.board.is_move_possible(self.board.get_piece_at(location), die_roll)]
+            self.assertEqual(position.movable_points(die_roll), expected)
+
+    def test_round_trip(self):
+        board = Board.create_starting_board()
+        board.move_piece(board.get_piece_at(1), 3)
+        position = Position.from_board(board, Colour.WHITE)
+
+        self.assertEqual(Position.from_board(position.to_board(Colour.BLACK), Colour.BLACK), position)
+        self.assertEqual(Position.from_key(position.key()), position)
+        self.assertEqual(position.flip(), Position.from_board(board, Colour.BLACK))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import itertools
+import os
+import sys
+
+DEFAULT_BEAR_OFF_PATH = os.path.join(os.path.dirname(__file__), 'bear_off.txt')
+BEAR_OFF_CHECKERS = 10
+AVERAGE_PIPS_PER_ROLL = 49 / 6
+
+
+def bear_off_plays(home, dice):
+    # Every home board that can be left after playing the dice in this order
+    homes = {home}
+    for die in dice:
+        homes = {after for before in homes for after in _bear_off_moves(before, die)}
+    return homes
+
+
+def _bear_off_moves(home, die):
+    highest = max((point for point in range(1, 7) if home[point - 1] > 0), default=0)
+    if highest == 0:
+        return [home]
+    moves = []
+    for point in range(1, 7):
+        if home[point - 1] > 0 and (point >= die or point == highest):
+            after = list(home)
+            after[point - 1] -= 1
+            if point > die:
+                after[point - die - 1] += 1
+            moves.append(tuple(after))
+    return moves
+
+
+def generate_bear_off_table(checkers=BEAR_OFF_CHECKERS):
+    # Expected number of rolls to bear off every home board with up to this many
+    # checkers, playing each roll to minimise it; positions after a roll always
+    # have fewer pips, so they are solved first
+    table = {(0,) * 6: 0.0}
+    homes = [home for home in itertools.product(range(checkers + 1), repeat=6) if 0 < sum(home) <= checkers]
+    homes.sort(key=lambda home: sum(point * count for point, count in enumerate(home, 1)))
+    for home in homes:
+        total = 0
+        for first, second in itertools.combinations_with_replacement(range(1, 7), 2):
+            if first == second:
+                plays = bear_off_plays(home, [first] * 4)
+            else:
+                plays = bear_off_plays(home, [first, second]) | bear_off_plays(home, [second, first])
+            total += (1 if first == second else 2) * min(table[play] for play in plays)
+        table[home] = 1 + total / 36
+    return table
+
+
+class RaceEvaluator:
+    # Once there is no contact a move only changes how long the mover needs to
+    # bear off, so positions are valued in expected rolls (lower is better)
+
+    # Keith count: (checkers allowed on the point, extra pips for every checker above that)
+    STACKING_WASTAGE = {1: (1, 2), 2: (1, 1), 3: (3, 1)}
+    # Extra pips for each of these points left empty
+    GAP_WASTAGE = {4: 1, 5: 1, 6: 1}
+    # Pips still wasted on average after the Keith count, by number of checkers left;
+    # fitted against the bear-off table up to 10 checkers and extended by its trend
+    CHECKER_WASTAGE = (0, 2.8, 3.2, 4.7, 5.3, 6.2, 6.6, 7.2, 7.5, 7.9, 8.1, 8.3, 8.5, 8.7, 8.9, 9.1)
+
+    __tables = {}
+
+    def __init__(self, bear_off_path=DEFAULT_BEAR_OFF_PATH):
+        self.bear_off_path = bear_off_path
+
+    @property
+    def bear_off(self):
+        # Loaded on first use, so importing a strategy stays cheap
+        return RaceEvaluator.load_bear_off(self.bear_off_path)
+
+    @classmethod
+    def load_bear_off(cls, path=DEFAULT_BEAR_OFF_PATH):
+        if path not in cls.__tables:
+            table = {}
+            if os.path.exists(path):
+                with open(path) as table_file:
+                    for line in table_file:
+                        home, expected_rolls = line.split()
+                        table[tuple(int(count, 16) for count in home)] = float(expected_rolls)
+            cls.__tables[path] = table
+        return cls.__tables[path]
+
+    @staticmethod
+    def save_bear_off(table, path=DEFAULT_BEAR_OFF_PATH):
+        with open(path, 'w') as table_file:
+            for home, expected_rolls in sorted(table.items()):
+                table_file.write('%s %.6f\n' % (''.join('%x' % count for count in home), expected_rolls))
+
+    def evaluate_position(self, position):
+        home = tuple(count if count > 0 else 0 for count in position.points[1:7])
+        expected_rolls = self.bear_off.get(home)
+        if expected_rolls is not None and not any(count > 0 for count in position.points[7:]):
+            return expected_rolls
+        return self.effective_pip_count(position) / AVERAGE_PIPS_PER_ROLL
+
+    def evaluate_positions(self, positions):
+        return [self.evaluate_position(position) for position in positions]
+
+    def evaluate_move(self, position, point, die_roll):
+        return self.evaluate_position(position.apply_move(point, die_roll)) - self.evaluate_position(position)
+
+    def evaluate_moves(self, position, points, die_roll):
+        values = self.evaluate_positions([position] + [position.apply_move(point, die_roll) for point in points])
+        return [value - values[0] for value in values[1:]]
+
+    def effective_pip_count(self, position):
+        points = position.points
+        pips = sum(point * count for point, count in enumerate(points) if count > 0)
+        checkers = sum(count for count in points if count > 0)
+        pips += RaceEvaluator.CHECKER_WASTAGE[min(checkers, len(RaceEvaluator.CHECKER_WASTAGE) - 1)]
+        for point, (allowed, wastage) in RaceEvaluator.STACKING_WASTAGE.items():
+            if points[point] > allowed:
+                pips += (points[point] - allowed) * wastage
+        for point, wastage in RaceEvaluator.GAP_WASTAGE.items():
+            if points[point] <= 0:
+                pips += wastage
+        return pips
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BEAR_OFF_PATH
+    bear_off_table = generate_bear_off_table()
+    RaceEvaluator.save_bear_off(bear_off_table, path)
+    print("Saved %d positions" % len(bear_off_table))
@@ -0,0 +1,50 @@
+import unittest
+
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.position import Position
+from src.race_evaluator import RaceEvaluator, generate_bear_off_table
+from src.test_board_base import TestBoardBase, Contains
+
+
+class TestRaceEvaluator(TestBoardBase):
+
+    def test_bear_off_table(self):
+        table = generate_bear_off_table(checkers=2)
+
+        self.assertEqual(table[(1, 0, 0, 0, 0, 0)], 1)
+        self.assertEqual(table[(0, 0, 0, 0, 0, 1)], 1.25)
+        self.assertEqual(table[(2, 0, 0, 0, 0, 0)], 1)
+        self.assertAlmostEqual(RaceEvaluator().bear_off[(0, 0, 0, 0, 0, 2)], table[(0, 0, 0, 0, 0, 2)], places=6)
+
+    def test_wastage_is_added_to_pips(self):
+        self.add_many_pieces(3, Colour.WHITE, 24)
+        self.add_many_pieces(1, Colour.WHITE, 19)
+        self.add_many_pieces(15, Colour.BLACK, 10)
+
+        position = Position.from_board(self.board, Colour.WHITE)
+
+        self.assertTrue(position.is_race())
+        self.assertAlmostEqual(RaceEvaluator().effective_pip_count(position), 9 + 4 + 2 + 5.3)
+
+    def test_search_uses_race_evaluator_without_contact(self):
+        self.add_many_pieces(2, Colour.WHITE, 14)
+        self.add_many_pieces(2, Colour.BLACK, 13)
+        strategy = CompareAllMovesSimple()
+
+        self.assertIs(strategy.evaluator_for(Position.from_board(self.board, Colour.WHITE)), strategy.race_evaluator)
+        self.assertIs(strategy.evaluator_for(Position.from_board(self.board, Colour.BLACK)), strategy.race_evaluator)
+
+    def test_race_play_avoids_wastage(self):
+        self.add_many_pieces(1, Colour.WHITE, 17)
+        self.add_many_pieces(1, Colour.WHITE, 18)
+        self.add_many_pieces(15, Colour.BLACK, 1)
+
+        CompareAllMovesSimple().move(self.board, Colour.WHITE, [6, 1], self.board.get_move_lambda(), {})
+
+        self.assert_location(19, Contains(1).pieces())
+        self.assert_location(23, Contains(1).pieces())
+
+
+if __name__ == '__main__':
+    unittest.main()
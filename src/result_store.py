@@ -0,0 +1,87 @@
+import hashlib
+import json
+import sqlite3
+from enum import Enum
+
+from src.colour import Colour
+from src.strategies import Strategy
+
+DEFAULT_STORE_PATH = 'experiment_results.sqlite'
+
+
+def get_state(value):
+    # Objects only have a default __getstate__ from Python 3.11
+    return getattr(value, '__getstate__', lambda: vars(value))()
+
+
+def describe(value):
+    # Everything that can change how a strategy plays, in a form that is the
+    # same every time the strategy is created with the same configuration
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Enum):
+        return str(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [describe(item) for item in value]
+        return sorted(items, key=json.dumps) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, dict):
+        return {str(key): describe(item) for key, item in value.items()}
+    description = {'class': '%s.%s' % (type(value).__module__, type(value).__qualname__)}
+    if hasattr(type(value), 'evaluator'):
+        description['evaluator'] = describe(type(value).evaluator)
+    state = value.config() if isinstance(value, Strategy) else get_state(value)
+    if isinstance(state, dict):
+        description.update({name: describe(item) for name, item in state.items()})
+    elif state is not None:
+        description['state'] = describe(state)
+    return description
+
+
+def strategy_key(strategy):
+    config = json.dumps(describe(strategy), sort_keys=True)
+    return '%s:%s' % (type(strategy).__name__, hashlib.sha1(config.encode('utf-8')).hexdigest()[:16])
+
+
+class ResultStore:
+    # Every game an experiment plays, keyed by both strategies (name and a hash
+    # of their configuration), the experiment's seed and the game's index
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS games ('
+            'white TEXT NOT NULL, black TEXT NOT NULL, seed TEXT NOT NULL, game_index INTEGER NOT NULL, '
+            'statistics TEXT NOT NULL, PRIMARY KEY (white, black, seed, game_index))')
+        self.__connection.commit()
+
+    def load_games(self, white_key, black_key, seed, games_to_play):
+        rows = self.__connection.execute(
+            'SELECT game_index, statistics FROM games '
+            'WHERE white = ? AND black = ? AND seed = ? AND game_index < ?',
+            (white_key, black_key, str(seed), games_to_play))
+        return {game_index: self.__decode(statistics) for game_index, statistics in rows}
+
+    def save_games(self, white_key, black_key, seed, results):
+        with self.__connection:
+            self.__connection.executemany(
+                'INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?)',
+                [(white_key, black_key, str(seed), game_index, self.__encode(statistics))
+                 for game_index, statistics in results])
+
+    def count_games(self):
+        return self.__connection.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    def close(self):
+        self.__connection.close()
+
+    @staticmethod
+    def __encode(statistics):
+        return json.dumps(dict(statistics, who_started=str(statistics['who_started']),
+                               who_won=str(statistics['who_won'])))
+
+    @staticmethod
+    def __decode(text):
+        statistics = json.loads(text)
+        statistics['who_started'] = Colour.load(statistics['who_started'])
+        statistics['who_won'] = Colour.load(statistics['who_won'])
+        return statistics
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple, \
+    CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.experiment import Experiment
+from src.move_cache import CachedStrategy, MoveCache
+from src.result_store import ResultStore, strategy_key
+from src.rollout import RolloutStrategy
+from src.strategies import MoveMostlySmart, MoveRandomPiece
+
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ResultStore(os.path.join(self.directory.name, 'results.sqlite'))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_strategy_key_depends_on_configuration(self):
+        self.assertEqual(strategy_key(RolloutStrategy()), strategy_key(RolloutStrategy()))
+        self.assertNotEqual(strategy_key(RolloutStrategy()), strategy_key(RolloutStrategy(trials=36)))
+        self.assertNotEqual(strategy_key(CompareAllMovesSimple()),
+                            strategy_key(CompareAllMovesWeightingDistanceAndSinglesWithEndGame2()))
+        self.assertNotEqual(strategy_key(CompareAllMovesSimple()), strategy_key(CompareAllMovesSimple(beam_width=3)))
+
+    def test_strategy_key_leaves_out_state_kept_while_playing(self):
+        self.assertEqual(len({strategy_key(MoveMostlySmart()) for _ in range(20)}), 1)
+        self.assertNotEqual(strategy_key(MoveMostlySmart()), strategy_key(MoveMostlySmart(random_turn_range=(0, 5))))
+
+        cache = MoveCache(os.path.join(self.directory.name, 'moves.cache'))
+        strategy = CachedStrategy(CompareAllMovesSimple(), cache)
+        key = strategy_key(strategy)
+        board = Board.create_starting_board()
+        strategy.move(board, Colour.WHITE, [6, 4], board.get_move_lambda(), {})
+
+        self.assertEqual(strategy_key(strategy), key)
+        cache.close()
+
+    def test_stored_games_are_reused(self):
+        first = Experiment(6, CompareAllMovesSimple(), MoveRandomPiece(), parallelise=False, store=self.store)
+        first.run()
+        second = Experiment(10, CompareAllMovesSimple(), MoveRandomPiece(), parallelise=False, store=self.store)
+        second.run()
+        fresh = Experiment(10, CompareAllMovesSimple(), MoveRandomPiece(), parallelise=False, seed=0)
+        fresh.run()
+
+        self.assertEqual(self.store.count_games(), 10)
+        self.assertEqual(second.get_reused_games(), 6)
+        self.assertEqual(second.get_statistics().counters, fresh.get_statistics().counters)
+        self.assertAlmostEqual(second.get_statistics().metrics['turns'].mean,
+                               fresh.get_statistics().metrics['turns'].mean)
+
+    def test_other_strategies_do_not_reuse_games(self):
+        Experiment(4, CompareAllMovesSimple(), MoveRandomPiece(), parallelise=False, store=self.store).run()
+        experiment = Experiment(4, MoveRandomPiece(), MoveRandomPiece(), parallelise=False, store=self.store)
+        experiment.run()
+
+        self.assertEqual(experiment.get_reused_games(), 0)
+        self.assertEqual(self.store.count_games(), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
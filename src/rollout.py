@@ -0,0 +1,200 @@
+import multiprocessing as mp
+import os
+import random
+
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.strategies import Strategy
+
+
+class PlayoutStrategy(Strategy):
+    @staticmethod
+    def get_difficulty():
+        return "Easy"
+
+    def move(self, board, colour, dice_roll, make_move, opponents_activity):
+        for die_roll in sorted(dice_roll, reverse=True):
+            location = self.choose_location(board, colour, die_roll)
+            if location is None:
+                continue
+            make_move(location, die_roll)
+            if board.has_game_ended():
+                return
+
+    def choose_location(self, board, colour, die_roll):
+        movable = board.get_movable_mask(colour, die_roll)
+        if movable == 0:
+            return None
+
+        # Bear off first, then hit, then make a point, otherwise move the piece furthest back
+        if colour == Colour.WHITE:
+            step = die_roll
+            bearing_off = movable >> (25 - die_roll)
+            if bearing_off:
+                return 25 - die_roll + (bearing_off & -bearing_off).bit_length() - 1
+        else:
+            step = -die_roll
+            bearing_off = movable & ((1 << (die_roll + 1)) - 1)
+            if bearing_off:
+                return bearing_off.bit_length() - 1
+
+        own = board.get_occupied_mask(colour)
+        opponent_blots = board.get_occupied_mask(colour.other()) & ~board.get_blocked_mask(colour.other())
+        own_blots = own & ~board.get_blocked_mask(colour)
+        locations = self.__locations(movable)
+        if colour == Colour.BLACK:
+            locations.reverse()
+        for targets in (opponent_blots, own_blots):
+            for location in locations:
+                if targets >> (location + step) & 1:
+                    return location
+        return locations[0]
+
+    @staticmethod
+    def __locations(mask):
+        locations = []
+        location = 0
+        while mask:
+            if mask & 1:
+                locations.append(location)
+            mask >>= 1
+            location += 1
+        return locations
+
+
+def rollout_dice(seed, trial):
+    # Trials come in antithetic pairs (every die d replaced by 7 - d) and the
+    # first roll of each pair is stratified over the 36 possible rolls
+    pair = trial // 2
+    rng = random.Random("%s:%d" % (seed, pair))
+    roll = divmod(pair % 36, 6)
+    roll = (roll[0] + 1, roll[1] + 1)
+    while True:
+        if trial % 2 == 1:
+            roll = (7 - roll[0], 7 - roll[1])
+        yield roll
+        roll = (rng.randint(1, 6), rng.randint(1, 6))
+
+
+def play_out(board, colour_to_move, dice, policy, max_plies=None):
+    colour = colour_to_move
+    plies = 0
+    while not board.has_game_ended():
+        if max_plies is not None and plies >= max_plies:
+            return None
+        roll = next(dice)
+        dice_roll = [roll[0]] * 4 if roll[0] == roll[1] else list(roll)
+        policy.move(board, colour, dice_roll, board.get_move_lambda(), {})
+        colour = colour.other()
+        plies += 1
+    return board.who_won()
+
+
+def truncated_win_probability(board, colour, colour_to_move):
+    # Crude race estimate used when a playout is cut short: the side to move is worth about 4 pips
+    own_pips = board.pip_count(colour)
+    opponent_pips = board.pip_count(colour.other())
+    lead = opponent_pips - own_pips + (4 if colour_to_move == colour else -4)
+    if lead > 0:
+        return 1.0
+    if lead < 0:
+        return 0.0
+    return 0.5
+
+
+def _rollout_chunk(task):
+    index, board, colour_to_move, colour, seed, trials, max_plies = task
+    policy = PlayoutStrategy()
+    outcomes = []
+    for trial in trials:
+        board_copy = board.create_copy()
+        winner = play_out(board_copy, colour_to_move, rollout_dice(seed, trial), policy, max_plies)
+        if winner is None:
+            plies_played = max_plies
+            next_to_move = colour_to_move if plies_played % 2 == 0 else colour_to_move.other()
+            outcomes.append(truncated_win_probability(board_copy, colour, next_to_move))
+        else:
+            outcomes.append(1.0 if winner == colour else 0.0)
+    return index, outcomes
+
+
+# One pool of workers for each process count, shared by every engine in this
+# process, since strategies (and so engines) are created for every game and never
+# told when they are no longer used. A forked child starts its own pools
+_pools = {}
+
+
+def _shared_pool(processes):
+    key = (os.getpid(), processes)
+    if key not in _pools:
+        _pools[key] = mp.Pool(processes)
+    return _pools[key]
+
+
+def close_pools():
+    for key in [key for key in _pools if key[0] == os.getpid()]:
+        pool = _pools.pop(key)
+        pool.close()
+        pool.join()
+
+
+class RolloutEngine:
+    def __init__(self, trials: int = 72, max_plies: int = None, processes: int = None, chunk_size: int = 12):
+        self.__trials = trials + trials % 2
+        self.__max_plies = max_plies
+        self.__processes = processes
+        self.__chunk_size = chunk_size + chunk_size % 2
+
+    def estimate_win_probability(self, board, colour, colour_to_move=None, seed=None):
+        if colour_to_move is None:
+            colour_to_move = colour
+        return self.estimate_win_probabilities([board], colour, colour_to_move, seed)[0]
+
+    def estimate_win_probabilities(self, boards, colour, colour_to_move, seed=None):
+        return [sum(outcomes) / self.__trials for outcomes in self.trial_outcomes(boards, colour, colour_to_move, seed)]
+
+    def trial_outcomes(self, boards, colour, colour_to_move, seed=None):
+        # How much colour won in each trial (in trial order) for every board. Every
+        # board is played out with the same dice sequences (common random numbers)
+        if seed is None:
+            seed = random.getrandbits(32)
+        tasks = []
+        for index, board in enumerate(boards):
+            for start in range(0, self.__trials, self.__chunk_size):
+                trials = range(start, min(start + self.__chunk_size, self.__trials))
+                tasks.append((index, board, colour_to_move, colour, seed, trials, self.__max_plies))
+
+        outcomes = [[] for _ in boards]
+        for index, chunk_outcomes in self.__map(tasks):
+            outcomes[index].extend(chunk_outcomes)
+        return outcomes
+
+    def __map(self, tasks):
+        # Pool workers are daemonic and cannot start a pool of their own (e.g. inside an Experiment)
+        if self.__processes == 1 or mp.current_process().daemon:
+            return [_rollout_chunk(task) for task in tasks]
+        return _shared_pool(self.__processes or mp.cpu_count()).map(_rollout_chunk, tasks)
+
+
+class RolloutStrategy(Strategy):
+    def __init__(self, candidates: int = 3, trials: int = 72, max_plies: int = None, processes: int = None,
+                 base_strategy=None):
+        self.candidates = candidates
+        self.base_strategy = base_strategy if base_strategy else CompareAllMovesWeightingDistanceAndSinglesWithEndGame2()
+        self.engine = RolloutEngine(trials=trials, max_plies=max_plies, processes=processes)
+
+    @staticmethod
+    def get_difficulty():
+        return "Very Hard"
+
+    def move(self, board, colour, dice_roll, make_move, opponents_activity):
+        candidates = self.base_strategy.rank_moves(board, colour, dice_roll)[:self.candidates]
+        if len(candidates) > 1:
+            win_rates = self.engine.estimate_win_probabilities(
+                [play['position'].to_board(colour) for play in candidates], colour, colour.other())
+            best_play = candidates[win_rates.index(max(win_rates))]
+        else:
+            best_play = candidates[0]
+
+        for move in best_play['moves']:
+            make_move(move['piece_at'], move['die_roll'])
@@ -0,0 +1,68 @@
+import unittest
+from itertools import islice
+
+from src.board import Board
+from src.colour import Colour
+from src import rollout
+from src.rollout import RolloutEngine, RolloutStrategy, close_pools, rollout_dice
+from src.test_board_base import TestBoardBase, Contains
+
+
+class TestRolloutDice(unittest.TestCase):
+
+    def test_pairs_are_antithetic(self):
+        rolls = list(islice(rollout_dice(5, 6), 10))
+        antithetic_rolls = list(islice(rollout_dice(5, 7), 10))
+
+        self.assertEqual(antithetic_rolls, [(7 - a, 7 - b) for a, b in rolls])
+
+    def test_first_roll_is_stratified(self):
+        first_rolls = set(next(rollout_dice(5, trial)) for trial in range(0, 72, 2))
+
+        self.assertEqual(len(first_rolls), 36)
+
+
+class TestRolloutEngine(TestBoardBase):
+
+    def test_certain_win(self):
+        self.add_many_pieces(1, Colour.WHITE, 24)
+        self.add_many_pieces(15, Colour.BLACK, 24)
+
+        engine = RolloutEngine(trials=8, processes=1)
+
+        self.assertEqual(engine.estimate_win_probability(self.board, Colour.WHITE), 1.0)
+        self.assertEqual(engine.estimate_win_probability(self.board, Colour.BLACK, Colour.WHITE), 0.0)
+
+    def test_same_seed_gives_same_estimate(self):
+        board = Board.create_starting_board()
+        engine = RolloutEngine(trials=8, max_plies=20, processes=1)
+
+        self.assertEqual(engine.estimate_win_probability(board, Colour.WHITE, seed=3),
+                         engine.estimate_win_probability(board, Colour.WHITE, seed=3))
+
+    def test_engines_share_one_pool_until_closed(self):
+        board = Board.create_starting_board()
+        for _ in range(2):
+            RolloutEngine(trials=4, max_plies=4, processes=2).estimate_win_probability(board, Colour.WHITE, seed=3)
+
+        self.assertEqual(len(rollout._pools), 1)
+        close_pools()
+        self.assertEqual(rollout._pools, {})
+
+
+class TestRolloutStrategy(TestBoardBase):
+
+    def test_bears_off_to_win(self):
+        self.add_many_pieces(1, Colour.WHITE, 23)
+        self.add_many_pieces(1, Colour.WHITE, 24)
+        self.add_many_pieces(2, Colour.BLACK, 10)
+
+        strategy = RolloutStrategy(trials=4, processes=1)
+        strategy.move(self.board, Colour.WHITE, [6, 4], self.board.get_move_lambda(), {})
+
+        self.assert_location(23, Contains(0).pieces())
+        self.assert_location(24, Contains(0).pieces())
+
+
+if __name__ == '__main__':
+    unittest.main()
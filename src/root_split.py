@@ -0,0 +1,67 @@
+from src.compare_all_moves_strategy import CompareAllMoves
+from src.position import Position
+from src.strategies import Strategy
+
+# Below this many leaves (roughly 10ms of search) sending the work to other processes costs more than it saves
+DEFAULT_THRESHOLD = 1000
+
+
+def search_after_move(strategy, new_position, dice_rolls_left, evaluator):
+    return strategy.search_after_move(new_position, dice_rolls_left, evaluator)
+
+
+class RootSplitStrategy(Strategy):
+    # Plays like the CompareAllMoves strategy it wraps, but when the search
+    # looks big (doubles, mostly) each first move is searched on the executor
+    # and the results are merged in the same order the strategy would have
+    # searched them, so the play chosen is the same
+    def __init__(self, base_strategy: CompareAllMoves, executor=None, threshold: int = DEFAULT_THRESHOLD):
+        self.base_strategy = base_strategy
+        self.executor = executor
+        self.threshold = threshold
+
+    def __getstate__(self):
+        # A copy sent to another process searches inline
+        return {'base_strategy': self.base_strategy, 'threshold': self.threshold}
+
+    def __setstate__(self, state):
+        self.__init__(state['base_strategy'], None, state['threshold'])
+
+    def get_difficulty(self):
+        return self.base_strategy.get_difficulty()
+
+    @property
+    def position_only(self):
+        return self.base_strategy.position_only
+
+    @staticmethod
+    def estimate_tree_size(position, dice_roll):
+        return sum(max(1, len(position.movable_points(dice_rolls[0]))) ** len(dice_rolls)
+                   for dice_rolls in CompareAllMoves.dice_orders(dice_roll))
+
+    def move(self, board, colour, dice_roll, make_move, opponents_activity):
+        position = Position.from_board(board, colour)
+        if self.executor is None or self.estimate_tree_size(position, dice_roll) < self.threshold:
+            self.base_strategy.move(board, colour, dice_roll, make_move, opponents_activity)
+            return
+
+        strategy = self.base_strategy
+        evaluator = strategy.evaluator_for(position)
+        searches = []
+        for dice_rolls in strategy.dice_orders(dice_roll):
+            die_roll, dice_rolls_left = dice_rolls[0], dice_rolls[1:]
+            searches.append((die_roll, [
+                (point, self.executor.submit(search_after_move, strategy, position.apply_move(point, die_roll),
+                                             dice_rolls_left, evaluator))
+                for point in strategy.candidate_points(position, die_roll, dice_rolls_left, evaluator)]))
+
+        results = []
+        for die_roll, futures in searches:
+            result = {'best_value': float('inf'), 'best_moves': []}
+            for point, future in futures:
+                result = strategy.add_move(result, point, die_roll, future.result())
+            results.append(result)
+        strategy.make_best_moves(strategy.best_of_orders(results), colour, make_move)
+
+    def game_over(self, opponents_activity):
+        self.base_strategy.game_over(opponents_activity)
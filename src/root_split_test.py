@@ -0,0 +1,75 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.board import Board
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesWeightingDistanceAndSinglesWithEndGame2
+from src.position import Position
+from src.root_split import RootSplitStrategy
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def play(strategy, board, colour, dice_roll):
+    board = board.create_copy()
+    strategy.move(board, colour, dice_roll.copy(), board.get_move_lambda(), {})
+    return Position.from_board(board, colour)
+
+
+class TestRootSplitStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.base_strategy = CompareAllMovesWeightingDistanceAndSinglesWithEndGame2()
+        self.board = Board()
+        self.board.add_many_pieces(2, Colour.WHITE, 1)
+        self.board.add_many_pieces(3, Colour.WHITE, 6)
+        self.board.add_many_pieces(4, Colour.WHITE, 12)
+        self.board.add_many_pieces(3, Colour.WHITE, 17)
+        self.board.add_many_pieces(3, Colour.WHITE, 19)
+        self.board.add_many_pieces(2, Colour.BLACK, 24)
+        self.board.add_many_pieces(5, Colour.BLACK, 13)
+        self.board.add_many_pieces(3, Colour.BLACK, 8)
+        self.board.add_many_pieces(5, Colour.BLACK, 5)
+
+    def test_split_search_plays_like_the_strategy(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            strategy = RootSplitStrategy(self.base_strategy, executor, threshold=0)
+            for dice_roll in ([3, 3, 3, 3], [6, 6, 6, 6], [5, 2], [1, 4]):
+                for colour in Colour:
+                    self.assertEqual(play(strategy, self.board, colour, dice_roll),
+                                     play(self.base_strategy, self.board, colour, dice_roll))
+
+    def test_small_searches_stay_inline(self):
+        with CountingExecutor() as executor:
+            strategy = RootSplitStrategy(self.base_strategy, executor, threshold=200)
+            self.assertLess(strategy.estimate_tree_size(Position.from_board(self.board, Colour.WHITE), [5, 2]),
+                            strategy.threshold)
+            play(strategy, self.board, Colour.WHITE, [5, 2])
+            self.assertEqual(executor.submitted, 0)
+
+            self.assertGreaterEqual(
+                strategy.estimate_tree_size(Position.from_board(self.board, Colour.WHITE), [2, 2, 2, 2]),
+                strategy.threshold)
+            play(strategy, self.board, Colour.WHITE, [2, 2, 2, 2])
+            self.assertGreater(executor.submitted, 0)
+
+    def test_copy_in_another_process_searches_inline(self):
+        with CountingExecutor() as executor:
+            strategy = pickle.loads(pickle.dumps(RootSplitStrategy(self.base_strategy, executor, threshold=0)))
+
+        self.assertIsNone(strategy.executor)
+        self.assertEqual(play(strategy, self.board, Colour.WHITE, [4, 4, 4, 4]),
+                         play(self.base_strategy, self.board, Colour.WHITE, [4, 4, 4, 4]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import threading
+
+from src.position import Position
+
+# Replies are always searched with the dice low-high (see choose_opponent_moves),
+# so one search covers both orders of a roll
+ALL_ROLLS = [[a, b] for a in range(1, 7) for b in range(a, 7)]
+
+
+def reply_key(dice_roll):
+    return min(dice_roll[:2]), max(dice_roll[:2])
+
+
+class Speculator:
+    # Shared by every session of a server: limits how many speculative searches
+    # may be queued on the executor at once, so they never crowd out real work
+    def __init__(self, executor, max_pending: int = 64):
+        self.executor = executor
+        self.max_pending = max_pending
+        self.hits = 0
+        self.misses = 0
+        self.__pending = 0
+        self.__lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        with self.__lock:
+            if self.__pending >= self.max_pending:
+                return None
+            self.__pending += 1
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(self.__done)
+        return future
+
+    def __done(self, future):
+        with self.__lock:
+            self.__pending -= 1
+
+
+class SpeculativeReplies:
+    # The opponent's reply to every possible roll, computed in the background
+    # from the position the current turn is expected to end in
+    def __init__(self, speculator: Speculator, strategy, colour):
+        self.__speculator = speculator
+        self.__strategy = strategy
+        self.__colour = colour
+        self.__position = None
+        self.__replies = {}
+
+    def predict(self, board, choose_moves):
+        position = Position.from_board(board, self.__colour)
+        if position == self.__position:
+            return
+        self.discard()
+        self.__position = position
+        for dice_roll in ALL_ROLLS:
+            full_roll = [dice_roll[0]] * 4 if dice_roll[0] == dice_roll[1] else list(dice_roll)
+            future = self.__speculator.submit(choose_moves, self.__strategy, board, self.__colour, full_roll)
+            if future is None:
+                break
+            self.__replies[reply_key(dice_roll)] = future
+
+    def take(self, board, dice_roll):
+        reply = None
+        if self.__position == Position.from_board(board, self.__colour):
+            reply = self.__replies.pop(reply_key(dice_roll), None)
+        if reply is None:
+            self.__speculator.misses += 1
+        else:
+            self.__speculator.hits += 1
+        self.discard()
+        return reply
+
+    def discard(self):
+        for future in self.__replies.values():
+            future.cancel()
+        self.__replies = {}
+        self.__position = None
@@ -0,0 +1,83 @@
+import random
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.colour import Colour
+from src.compare_all_moves_strategy import CompareAllMovesSimple
+from src.game_session import GameSession, choose_opponent_moves
+from src.play_generator import generate_plays
+from src.position import Position
+from src.speculation import Speculator
+
+
+class TestSpeculation(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.speculator = Speculator(self.executor)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    @staticmethod
+    def play_predicted_turn(session):
+        # One move at a time, as the prediction is made again after each one
+        while not session.is_waiting_for_opponent():
+            position = Position.from_board(session.board, Colour.WHITE)
+            point, die_roll = CompareAllMovesSimple().choose_plays([position], [session.get_moves_left()])[0][0]
+            session.move_piece(Position.to_location(point, Colour.WHITE), die_roll)
+
+    def test_reply_is_taken_when_the_human_plays_the_predicted_move(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE, speculator=self.speculator)
+        session.start()
+        self.play_predicted_turn(session)
+
+        request = session.get_opponent_request()
+        reply = session.take_speculated_reply()
+
+        self.assertIsNotNone(reply)
+        self.assertEqual(reply.result(), choose_opponent_moves(*request))
+        self.assertEqual(self.speculator.hits, 1)
+
+    def test_reply_is_not_taken_after_a_different_move(self):
+        random.seed(0)
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE, speculator=self.speculator)
+        session.start()
+        predicted = Position.from_board(session.predict_board_after_turn(), Colour.WHITE)
+        # One checker moved by both dice in one go, so no new prediction is made part way
+        first, second = next(play['moves'] for play in generate_plays(session.board, Colour.WHITE, session.dice_roll)
+                             if play['position'] != predicted and
+                             play['moves'][1]['piece_at'] == play['moves'][0]['piece_at'] + play['moves'][0]['die_roll'])
+        self.assertIsNone(session.move_piece(first['piece_at'], first['die_roll'] + second['die_roll']))
+        session.get_opponent_request()
+
+        self.assertIsNone(session.take_speculated_reply())
+        self.assertEqual(self.speculator.misses, 1)
+
+    def test_pending_speculation_is_bounded(self):
+        speculator = Speculator(self.executor, max_pending=3)
+        release = threading.Event()
+
+        futures = [speculator.submit(release.wait) for _ in range(3)]
+
+        self.assertTrue(all(future is not None for future in futures))
+        self.assertIsNone(speculator.submit(release.wait))
+        release.set()
+        for future in futures:
+            future.result()
+        self.assertIsNotNone(speculator.submit(release.wait))
+
+    def test_replies_are_searched_once_for_both_orders_of_a_roll(self):
+        session = GameSession(CompareAllMovesSimple(), first_player=Colour.WHITE, speculator=self.speculator)
+        session.start()
+        self.play_predicted_turn(session)
+        request = session.get_opponent_request()
+        strategy, board, colour, dice_roll = request
+
+        self.assertEqual(choose_opponent_moves(strategy, board, colour, list(dice_roll)),
+                         choose_opponent_moves(strategy, board, colour, list(reversed(dice_roll))))
+
+
+if __name__ == '__main__':
+    unittest.main()
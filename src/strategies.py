@@ -4,63 +4,70 @@ import random
 from src.piece import Piece
 from src.move_not_possible_exception import MoveNotPossibleException
 from src.colour import Colour
+from src.board_evaluator import BoardEvaluator
+from src.position import Position
 
 
 class Strategy:
+    # Whether the play chosen depends on nothing but the position and dice, so
+    # it can be replayed from a MoveCache
+    position_only = False
+
     def move(self, board, colour, dice_roll, make_move, opponents_activity):
         raise NotImplemented()
 
+    def choose_plays(self, positions, dice):
+        # The plays for a batch of positions (src.position.Position, seen by the
+        # side to move) from many games, as lists of (point, die roll), without
+        # touching any game. By default each is played out by move on a board of
+        # its own; strategies that can score many positions at once override this
+        plays = []
+        for position, dice_roll in zip(positions, dice):
+            plays.append(self.__choose_play(position, dice_roll))
+        return plays
+
+    def __choose_play(self, position, dice_roll):
+        board = position.to_board(Colour.WHITE)
+        dice_left = list(dice_roll)
+        play = []
+
+        def make_move(location, die_roll):
+            piece = board.get_piece_at(location)
+            if die_roll not in dice_left or piece is None or piece.colour != Colour.WHITE or \
+                    not board.is_move_possible(piece, die_roll):
+                raise MoveNotPossibleException("You cannot move that piece %d" % die_roll)
+            board.move_piece(piece, die_roll)
+            dice_left.remove(die_roll)
+            play.append((Position.to_point(location, Colour.WHITE), die_roll))
+            return [die_roll]
+
+        self.move(board, Colour.WHITE, list(dice_roll), make_move, {})
+        return play
+
     def game_over(self, opponents_activity):
         pass
 
+    def config(self):
+        # What the strategy was created with, which is what identifies it in a
+        # ResultStore; strategies that keep state while they play leave it out
+        from src.result_store import get_state
+        return get_state(self)
+
 class MoveFurthestBackStrategy(Strategy):
+    evaluator = BoardEvaluator(BoardEvaluator.WEIGHTING_DISTANCE)
+    position_only = True
 
     @staticmethod
     def get_difficulty():
         return "Medium"
 
     def assess_board(self, colour, myboard):
-        pieces = myboard.get_pieces(colour)
-        pieces_on_board = len(pieces)
-        sum_distances = 0
-        number_of_singles = 0
-        number_occupied_spaces = 0
-        sum_single_distance_away_from_home = 0
-        sum_distances_to_endzone = 0
-
-        for piece in pieces:
-            sum_distances += piece.spaces_to_home()
-            if piece.spaces_to_home() > 6:
-                sum_distances_to_endzone += piece.spaces_to_home() - 6
-
-        for location in range(1, 25):
-            pieces = myboard.pieces_at(location)
-            if len(pieces) != 0 and pieces[0].colour == colour:
-                if len(pieces) == 1:
-                    number_of_singles += 1
-                    sum_single_distance_away_from_home += 25 - pieces[0].spaces_to_home()
-                elif len(pieces) > 1:
-                    number_occupied_spaces += 1
-
-        opponents_taken_pieces = len(myboard.get_taken_pieces(colour.other()))
-        opponent_pieces = myboard.get_pieces(colour.other())
-        sum_distances_opponent = sum(p.spaces_to_home() for p in opponent_pieces)
-
-        return {
-            'number_occupied_spaces': number_occupied_spaces,
-            'opponents_taken_pieces': opponents_taken_pieces,
-            'sum_distances': sum_distances,
-            'sum_distances_opponent': sum_distances_opponent,
-            'number_of_singles': number_of_singles,
-            'sum_single_distance_away_from_home': sum_single_distance_away_from_home,
-            'pieces_on_board': pieces_on_board,
-            'sum_distances_to_endzone': sum_distances_to_endzone,
-        }
+        return self.evaluator.assess_board(colour, myboard)
 
     def is_point_safe(self, board, location, colour):
-        opponent_colour = Colour.BLACK if colour == Colour.WHITE else Colour.WHITE
-        opponent_pieces = board.get_pieces(opponent_colour)
-        return sum(1 for piece in opponent_pieces if piece.location == location) < 2
+        if 0 <= location <= 25:
+            return board.can_land_on(colour, location)
+        return True
 
     def move(self, board, colour, dice_roll, make_move, opponents_activity):
         result = self.move_recursively(board, colour, dice_roll)
@@ -76,7 +83,7 @@ class MoveFurthestBackStrategy(Strategy):
             for move in result['best_moves']:
                 try:
                     make_move(move['piece_at'], move['die_roll'])
-                except:
+                except MoveNotPossibleException:
                     pass
 
     def move_recursively(self, board, colour, dice_rolls):
@@ -124,15 +131,18 @@ class MoveFurthestBackStrategy(Strategy):
         return {'best_value': best_board_value, 'best_moves': best_pieces_to_move}
 
     def evaluate_board(self, myboard, colour):
-        board_stats = self.assess_board(colour, myboard)
-        return board_stats['sum_distances'] - float(board_stats['sum_distances_opponent']) / 3 + \
-               2 * board_stats['number_of_singles'] - \
-               board_stats['number_occupied_spaces'] - board_stats['opponents_taken_pieces']
+        return self.evaluator.evaluate_board(myboard, colour)
 
 
 from src.strategies import MoveFurthestBackStrategy
 
 class LookAheadStrategy(MoveFurthestBackStrategy):
+    # Its play also depends on the opponent's last move
+    position_only = False
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+
     def move(self, board, colour, dice_roll, make_move, opponents_activity):
         next_roll = opponents_activity.get("next_opponent_roll", [])
         opponent_colour = colour.other()
@@ -153,13 +163,16 @@ class LookAheadStrategy(MoveFurthestBackStrategy):
                         stack = board.pieces_at(dest)
                         if len(stack) == 0 or (stack[0].colour == colour and len(stack) > 1):
                             try:
-                                print(f"[{colour}] blocking opponent by moving to {dest} with roll {roll}")
+                                if self.verbose:
+                                    print(f"[{colour}] blocking opponent by moving to {dest} with roll {roll}")
                                 make_move(piece.location, roll)
                                 return
-                            except Exception as e:
-                                print(f"[{colour}] blocking move failed: {e}")
+                            except MoveNotPossibleException as e:
+                                if self.verbose:
+                                    print(f"[{colour}] blocking move failed: {e}")
 
-        print(f"[{colour}] no safe blocking move available — falling back to MoveFurthestBackStrategy")
+        if self.verbose:
+            print(f"[{colour}] no safe blocking move available — falling back to MoveFurthestBackStrategy")
         super().move(board, colour, dice_roll, make_move, opponents_activity)
 
 class HumanStrategy(Strategy):
@@ -219,6 +232,7 @@ class MoveMostlySmart(Strategy):
         from src.strategies import MoveFurthestBackStrategy
         self.base_strategy = base_strategy if base_strategy else MoveFurthestBackStrategy()
         self.random_strategy = MoveRandomPiece()
+        self.random_turn_range = random_turn_range
         self.random_turn_number = random.randint(*random_turn_range)
         self.turn_counter = 0
         self.random_move_done = False
@@ -228,6 +242,10 @@ class MoveMostlySmart(Strategy):
     def get_difficulty():
         return "Medium+Random"
 
+    def config(self):
+        return {'base_strategy': self.base_strategy, 'random_turn_range': self.random_turn_range,
+                'game_index': self.game_index}
+
     def move(self, board, colour, dice_roll, make_move, opponents_activity):
         self.turn_counter += 1
         if not self.random_move_done and self.turn_counter == self.random_turn_number:
@@ -253,5 +271,5 @@ class MoveRandomPiece(Strategy):
                     try:
                         make_move(piece.location, die_roll)
                         break
-                    except:
+                    except MoveNotPossibleException:
                         continue
@@ -1,22 +1,42 @@
-from src.compare_all_moves_strategy import CompareAllMovesSimple
-from src.strategies import MoveFurthestBackStrategy, HumanStrategy, MoveRandomPiece
+import importlib
+
+
+class StrategyEntry:
+    # A strategy known by name; its module is only imported when it is first created
+    def __init__(self, name, module, difficulty):
+        self.name = name
+        self.module = module
+        self.difficulty = difficulty
+
+    def load(self):
+        return getattr(importlib.import_module(self.module), self.name)
+
+    def create(self, *args):
+        return self.load()(*args)
 
 
 class StrategyFactory:
+    __strategies = [
+        StrategyEntry('MoveRandomPiece', 'src.strategies', 'Easy'),
+        StrategyEntry('MoveFurthestBackStrategy', 'src.strategies', 'Medium'),
+        StrategyEntry('CompareAllMovesSimple', 'src.compare_all_moves_strategy', 'Hard'),
+        StrategyEntry('RolloutStrategy', 'src.rollout', 'Very Hard'),
+        StrategyEntry('OpeningBookStrategy', 'src.opening_book', 'Hard'),
+        StrategyEntry('HumanStrategy', 'src.strategies', 'N/A'),
+    ]
+
     @staticmethod
     def create_by_name(strategy_name):
         for strategy in StrategyFactory.get_all():
-            if strategy.__name__ == strategy_name:
-                return strategy()
+            if strategy.name == strategy_name:
+                return strategy.create()
 
         raise Exception("Cannot find strategy %s" % strategy_name)
 
+    @staticmethod
+    def register(name, module, difficulty):
+        StrategyFactory.__strategies.append(StrategyEntry(name, module, difficulty))
+
     @staticmethod
     def get_all():
-        strategies = [
-            MoveRandomPiece,
-            MoveFurthestBackStrategy,
-            CompareAllMovesSimple,
-            HumanStrategy,
-        ]
-        return strategies
+        return list(StrategyFactory.__strategies)
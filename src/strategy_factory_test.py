@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from src.strategy_factory import StrategyFactory
+
+STARTUP_BUDGET = 0.25
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStrategyFactory(unittest.TestCase):
+
+    def test_registry_matches_strategy_classes(self):
+        for strategy in StrategyFactory.get_all():
+            strategy_class = strategy.load()
+            self.assertEqual(strategy_class.__name__, strategy.name)
+            self.assertEqual(strategy_class.get_difficulty(), strategy.difficulty)
+
+    def test_create_by_name(self):
+        self.assertEqual(type(StrategyFactory.create_by_name('MoveFurthestBackStrategy')).__name__,
+                         'MoveFurthestBackStrategy')
+        self.assertRaises(Exception, StrategyFactory.create_by_name, 'NoSuchStrategy')
+
+    def test_startup_is_fast_and_does_not_import_strategies(self):
+        script = ("import sys, time\n"
+                  "start = time.perf_counter()\n"
+                  "import src.experiment, src.strategy_factory\n"
+                  "print(time.perf_counter() - start)\n"
+                  "print(' '.join(sorted(sys.modules)))\n")
+        output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.splitlines()
+
+        self.assertLess(float(output[0]), STARTUP_BUDGET)
+        loaded = output[1].split()
+        for module in ('scipy', 'src.rollout', 'src.opening_book', 'src.compare_all_moves_strategy'):
+            self.assertNotIn(module, loaded)
+
+
+if __name__ == '__main__':
+    unittest.main()